@@ -0,0 +1,24 @@
+"""Cost of the convenience accessors on `WebSearchApiResponse`."""
+from brave.types import WebSearchApiResponse
+
+from .harness import benchmark
+from .harness import timed
+from .payloads import large_payload
+
+
+RESPONSE = WebSearchApiResponse.model_validate(large_payload())
+
+
+@benchmark("accessor.web_results")
+def web_results() -> dict:
+    return timed(lambda: RESPONSE.web_results)
+
+
+@benchmark("accessor.urls")
+def urls() -> dict:
+    return timed(lambda: RESPONSE.urls)
+
+
+@benchmark("accessor.product_prices")
+def product_prices() -> dict:
+    return timed(RESPONSE.product_prices)
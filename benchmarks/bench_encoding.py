@@ -0,0 +1,36 @@
+"""
+Content encodings compared on responses with extra snippets: bytes on the wire and decompression time.
+
+One benchmark per installed encoding, at the levels servers use on the fly (`brave.encoding.LEVELS`).
+"""
+from brave.encoding import PREFERENCE
+from brave.encoding import available
+from brave.encoding import compress
+from brave.encoding import decompress
+
+from .harness import benchmark
+from .harness import timed
+from .payloads import encode
+from .payloads import large_payload
+
+
+BODY = encode(large_payload(results=20, snippets=5))
+
+
+def _register(encoding: str) -> None:
+    @benchmark(f"encoding.{encoding}")
+    def run() -> dict:
+        compressed = compress(BODY, encoding)
+        metrics = timed(lambda: decompress(compressed, encoding))
+        metrics.update(
+            {
+                "compressed_bytes": len(compressed),
+                "ratio": len(BODY) / len(compressed),
+                "compress_us": timed(lambda: compress(BODY, encoding))["median_us"],
+            }
+        )
+        return metrics
+
+
+for _encoding in available(PREFERENCE):
+    _register(_encoding)
@@ -0,0 +1,35 @@
+"""Cost of spatial queries over 10,000 locations, against a scan of every point."""
+import random
+
+from brave.geo import SpatialIndex
+from brave.geo import haversine_km
+
+from .harness import benchmark
+from .harness import timed
+
+
+_RANDOM = random.Random(0)
+POINTS = [(51.5 + _RANDOM.uniform(-0.2, 0.2), -0.1 + _RANDOM.uniform(-0.3, 0.3)) for _ in range(10_000)]
+INDEX = SpatialIndex(cell_km=1.0)
+for _lat, _lon in POINTS:
+    INDEX.add(_lat, _lon)
+
+
+@benchmark("geo.nearest.index")
+def nearest_index() -> dict:
+    return timed(lambda: INDEX.nearest(51.5072, -0.1276, k=10))
+
+
+@benchmark("geo.nearest.scan")
+def nearest_scan() -> dict:
+    return timed(lambda: sorted(haversine_km(51.5072, -0.1276, lat, lon) for lat, lon in POINTS)[:10])
+
+
+@benchmark("geo.within.index")
+def within_index() -> dict:
+    return timed(lambda: INDEX.within(51.5072, -0.1276, 1.0))
+
+
+@benchmark("geo.dedupe.index")
+def dedupe_index() -> dict:
+    return timed(lambda: INDEX.dedupe(radius_km=0.05), repeat=3)
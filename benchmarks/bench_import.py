@@ -0,0 +1,81 @@
+"""
+Cold start cost: importing the package and the first parse, each measured in a fresh interpreter.
+
+Serverless functions and CLI workers pay these on every start, so they are tracked like any other hot path.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from typing import Dict
+
+from .harness import benchmark
+from .payloads import FIXTURES_DIR
+
+
+REPEAT = 7
+
+# Runs in a fresh interpreter: executes SETUP untimed, then prints the seconds taken by STATEMENT.
+_TIMER = """
+import time
+{setup}
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def cold(statement: str, setup: str = "", repeat: int = REPEAT) -> Dict[str, float]:
+    """Time a statement in `repeat` fresh interpreters, in milliseconds."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(setup=setup, statement=statement)],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        samples.append(float(output.split()[-1]))
+    return {"median_ms": statistics.median(samples) * 1e3, "min_ms": min(samples) * 1e3}
+
+
+@benchmark("import.brave")
+def import_brave() -> dict:
+    return cold("import brave")
+
+
+@benchmark("import.client")
+def import_client() -> dict:
+    return cold("from brave import Brave")
+
+
+@benchmark("import.models")
+def import_models() -> dict:
+    return cold("from brave.types import WebSearchApiResponse; from brave.types import ImageSearchApiResponse")
+
+
+@benchmark("import.first_parse")
+def first_parse() -> dict:
+    """The first validation of a response, which builds the deferred model schemas."""
+    path = json.dumps(str(FIXTURES_DIR / "blue_tack_minimal.json"))
+    setup = f"from brave.types import WebSearchApiResponse\nbody = open({path}, 'rb').read()"
+    return cold("WebSearchApiResponse.model_validate_json(body)", setup=setup)
+
+
+@benchmark("import.first_parse_warm")
+def first_parse_warm() -> dict:
+    """The first validation of a response after `brave.warmup()`."""
+    path = json.dumps(str(FIXTURES_DIR / "blue_tack_minimal.json"))
+    setup = (
+        f"import brave\nbrave.warmup()\nfrom brave.types import WebSearchApiResponse\nbody = open({path}, 'rb').read()"
+    )
+    return cold("WebSearchApiResponse.model_validate_json(body)", setup=setup)
+
+
+@benchmark("import.warmup")
+def warmup() -> dict:
+    return cold("brave.warmup()", setup="import brave\nfrom brave.types import adapters")
@@ -0,0 +1,56 @@
+"""Memory retained by a batch of parsed responses, with and without an `ObjectPool`."""
+from brave.types import WebSearchApiResponse
+from brave.types.pooling import ObjectPool
+
+from .harness import allocated
+from .harness import benchmark
+from .harness import timed
+from .payloads import encode
+from .payloads import large_payload
+
+
+RESPONSES = 100
+HOSTS = 50
+
+
+def _bodies() -> list:
+    """Responses with unique results spread over a realistic number of sites, which repeat across responses."""
+    bodies = []
+    for index in range(RESPONSES):
+        payload = large_payload()
+        for position, result in enumerate(payload["web"]["results"]):
+            host = f"site{(index * 7 + position) % HOSTS}.example.com"
+            result["url"] = f"https://{host}/page/{index}/{position}"
+            result["meta_url"]["netloc"] = result["meta_url"]["hostname"] = host
+            result["meta_url"]["favicon"] = f"https://imgs.search.brave.com/favicon/{host}"
+        bodies.append(encode(payload))
+    return bodies
+
+
+BODIES = _bodies()
+BODY = BODIES[0]
+
+
+@benchmark("memory.batch.plain")
+def batch_plain() -> dict:
+    return allocated(lambda: [WebSearchApiResponse.model_validate_json(body) for body in BODIES], RESPONSES)
+
+
+@benchmark("memory.batch.pooled")
+def batch_pooled() -> dict:
+    def parse() -> tuple:
+        pool = ObjectPool()
+        return pool, [pool.share(WebSearchApiResponse.model_validate_json(body)) for body in BODIES]
+
+    return allocated(parse, RESPONSES)
+
+
+@benchmark("memory.share")
+def share() -> dict:
+    pool = ObjectPool()
+    return timed(lambda: pool.share(WebSearchApiResponse.model_validate_json(BODY)))
+
+
+@benchmark("memory.parse")
+def parse() -> dict:
+    return timed(lambda: WebSearchApiResponse.model_validate_json(BODY))
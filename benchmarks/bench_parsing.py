@@ -0,0 +1,76 @@
+"""Response parsing: `model_validate` throughput and memory per parsed response."""
+import json
+import pickle
+
+from brave.types import WebSearchApiResponse
+
+from .harness import allocated
+from .harness import benchmark
+from .harness import timed
+from .payloads import encode
+from .payloads import large_payload
+from .payloads import small_payload
+
+
+SMALL = small_payload()
+LARGE = large_payload()
+SMALL_BODY = encode(SMALL)
+LARGE_BODY = encode(LARGE)
+# What a process pool sends back to the event loop for a large body (see `brave.parsing`).
+LARGE_DECODED = pickle.dumps(json.loads(LARGE_BODY), protocol=pickle.HIGHEST_PROTOCOL)
+LARGE_MODEL = pickle.dumps(WebSearchApiResponse.model_validate_json(LARGE_BODY), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+@benchmark("parse.model_validate.small")
+def model_validate_small() -> dict:
+    return timed(lambda: WebSearchApiResponse.model_validate(SMALL))
+
+
+@benchmark("parse.model_validate.large")
+def model_validate_large() -> dict:
+    return timed(lambda: WebSearchApiResponse.model_validate(LARGE))
+
+
+@benchmark("parse.model_validate_json.small")
+def model_validate_json_small() -> dict:
+    return timed(lambda: WebSearchApiResponse.model_validate_json(SMALL_BODY))
+
+
+@benchmark("parse.model_validate_json.large")
+def model_validate_json_large() -> dict:
+    return timed(lambda: WebSearchApiResponse.model_validate_json(LARGE_BODY))
+
+
+@benchmark("parse.json_loads_model_validate.large")
+def json_loads_model_validate_large() -> dict:
+    return timed(lambda: WebSearchApiResponse.model_validate(json.loads(LARGE_BODY)))
+
+
+@benchmark("parse.loop_cost.json_loads.large")
+def loop_cost_json_loads_large() -> dict:
+    return timed(lambda: json.loads(LARGE_BODY))
+
+
+@benchmark("parse.loop_cost.process_pool_raw.large")
+def loop_cost_process_pool_raw_large() -> dict:
+    return timed(lambda: pickle.loads(LARGE_DECODED))
+
+
+@benchmark("parse.loop_cost.process_pool_model.large")
+def loop_cost_process_pool_model_large() -> dict:
+    return timed(lambda: WebSearchApiResponse.model_validate(pickle.loads(LARGE_DECODED)))
+
+
+@benchmark("parse.loop_cost.unpickle_model.large")
+def loop_cost_unpickle_model_large() -> dict:
+    return timed(lambda: pickle.loads(LARGE_MODEL))
+
+
+@benchmark("memory.parsed_response.small")
+def memory_small() -> dict:
+    return allocated(lambda: [WebSearchApiResponse.model_validate_json(SMALL_BODY) for _ in range(200)], 200)
+
+
+@benchmark("memory.parsed_response.large")
+def memory_large() -> dict:
+    return allocated(lambda: [WebSearchApiResponse.model_validate_json(LARGE_BODY) for _ in range(50)], 50)
@@ -0,0 +1,39 @@
+"""Cost of assembling the context documents of a large parsed response, against per-result model dumps."""
+import html
+import re
+
+from brave.rag import ContextBuilder
+from brave.types import WebSearchApiResponse
+
+from .harness import benchmark
+from .harness import timed
+from .payloads import large_payload
+
+
+RESPONSE = WebSearchApiResponse.model_validate(large_payload())
+
+
+def _naive(response: WebSearchApiResponse) -> list:
+    """The usual glue: dump every result, strip it with regexes, deduplicate snippets and count tokens."""
+    documents, seen = [], set()
+    for result in response.web.results:
+        data = result.model_dump()
+        snippets = []
+        for snippet in [data["description"]] + (data.get("extra_snippets") or []):
+            text = " ".join(html.unescape(re.sub(r"<[^>]+>", "", snippet)).split())
+            if text.lower() not in seen:
+                seen.add(text.lower())
+                snippets.append(text)
+        text = "\n".join(snippets)
+        documents.append({"url": str(data["url"]), "title": data["title"], "text": text, "tokens": len(text) // 4})
+    return documents
+
+
+@benchmark("rag.naive")
+def naive() -> dict:
+    return timed(lambda: _naive(RESPONSE))
+
+
+@benchmark("rag.build")
+def build() -> dict:
+    return timed(lambda: ContextBuilder(budget=100_000).build(RESPONSE))
@@ -0,0 +1,42 @@
+"""Cost of stripping the text decorations of every snippet of a large response, against per-string regexes."""
+import html
+import re
+
+from brave.text import normalize_all
+from brave.text import strip_all
+
+from .harness import benchmark
+from .harness import timed
+from .payloads import large_payload
+
+
+def _snippets() -> list:
+    texts = []
+    for result in large_payload()["web"]["results"]:
+        texts.append(result["title"])
+        texts.append(result["description"])
+        texts.extend(result["extra_snippets"])
+    return texts
+
+
+SNIPPETS = _snippets()
+
+
+def _naive(text: str) -> str:
+    """What every consumer writes: strip the tags, unescape, collapse the whitespace."""
+    return " ".join(html.unescape(re.sub(r"<[^>]+>", "", text)).split())
+
+
+@benchmark("text.strip.naive")
+def strip_naive() -> dict:
+    return timed(lambda: [_naive(text) for text in SNIPPETS])
+
+
+@benchmark("text.strip_all")
+def strip_batch() -> dict:
+    return timed(lambda: strip_all(SNIPPETS))
+
+
+@benchmark("text.normalize_all")
+def normalize_batch() -> dict:
+    return timed(lambda: normalize_all(SNIPPETS))
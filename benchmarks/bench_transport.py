@@ -0,0 +1,112 @@
+"""
+End-to-end client throughput against the local fake server: connection reuse, sync versus async batches, the
+undecoded modes (`raw="bytes"` and passthrough to a sink) against parsing, and DNS lookups with and without a
+`DNSCache`. Warmed connections are not benchmarked: connecting to the local server costs next to nothing.
+"""
+import asyncio
+import socket
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from brave import AsyncBrave
+from brave import Brave
+from brave.dns import DNSCache
+from brave.testing import FakeBraveServer
+from brave.transport import RequestsTransport
+
+from .harness import benchmark
+from .harness import throughput
+from .harness import timed
+from .payloads import encode
+from .payloads import large_payload
+
+
+REQUESTS = 300
+CONCURRENCY = 16
+
+
+def _server() -> FakeBraveServer:
+    return FakeBraveServer(default=encode(large_payload()))
+
+
+def _sync_batch(client: Brave, concurrency: int = 1, **options) -> int:
+    queries = [f"query {n}" for n in range(REQUESTS)]
+    if concurrency == 1:
+        for query in queries:
+            client.search(query, **options)
+    else:
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(client.search, queries))
+    return REQUESTS
+
+
+@benchmark("client.sync.per_request_connection")
+def per_request_connection() -> dict:
+    with _server() as server:
+        client = Brave(api_key="benchmark", transport=RequestsTransport(base_url=server.base_url))
+        return throughput(lambda: _sync_batch(client))
+
+
+@benchmark("client.sync.pooled_session")
+def pooled_session() -> dict:
+    with _server() as server:
+        transport = RequestsTransport(base_url=server.base_url, session=requests.Session())
+        with Brave(api_key="benchmark", transport=transport) as client:
+            return throughput(lambda: _sync_batch(client))
+
+
+@benchmark("client.sync.threaded_batch")
+def threaded_batch() -> dict:
+    with _server() as server:
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=CONCURRENCY)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        transport = RequestsTransport(base_url=server.base_url, session=session)
+        with Brave(api_key="benchmark", transport=transport) as client:
+            return throughput(lambda: _sync_batch(client, CONCURRENCY))
+
+
+@benchmark("client.async.batch")
+def async_batch() -> dict:
+    async def run(base_url: str) -> int:
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        async def search(query: str) -> None:
+            async with semaphore:
+                await client.search(query)
+
+        async with AsyncBrave(api_key="benchmark", base_url=base_url) as client:
+            await asyncio.gather(*(search(f"query {n}") for n in range(REQUESTS)))
+        return REQUESTS
+
+    with _server() as server:
+        return throughput(lambda: asyncio.run(run(server.base_url)))
+
+
+def _pooled(base_url: str) -> Brave:
+    return Brave(api_key="benchmark", transport=RequestsTransport(base_url=base_url, session=requests.Session()))
+
+
+@benchmark("client.sync.raw_bytes")
+def raw_bytes() -> dict:
+    with _server() as server, _pooled(server.base_url) as client:
+        return throughput(lambda: _sync_batch(client, raw="bytes"))
+
+
+@benchmark("client.sync.passthrough")
+def passthrough() -> dict:
+    with _server() as server, _pooled(server.base_url) as client:
+        return throughput(lambda: _sync_batch(client, sink=lambda chunk: None))
+
+
+@benchmark("dns.lookup.system")
+def lookup_system() -> dict:
+    return timed(lambda: socket.getaddrinfo("localhost", 443, 0, socket.SOCK_STREAM))
+
+
+@benchmark("dns.lookup.cached")
+def lookup_cached() -> dict:
+    cache = DNSCache(ttl=3600)
+    return timed(lambda: cache.getaddrinfo("localhost", 443, 0, socket.SOCK_STREAM))
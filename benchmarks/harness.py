@@ -0,0 +1,138 @@
+"""
+Minimal benchmark harness: registration, timing, memory measurement and result files.
+
+Every benchmark is a function registered with `@benchmark`, returning a flat dictionary of metrics. Results are saved
+as JSON, tagged with the commit they were measured on, so two runs can be compared with `compare`.
+"""
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+Metrics = Dict[str, float]
+
+BENCHMARKS: Dict[str, Callable[[], Metrics]] = {}
+
+
+def benchmark(name: str) -> Callable[[Callable[[], Metrics]], Callable[[], Metrics]]:
+    """Register a benchmark function under `name`."""
+
+    def register(function: Callable[[], Metrics]) -> Callable[[], Metrics]:
+        BENCHMARKS[name] = function
+        return function
+
+    return register
+
+
+def timed(function: Callable[[], Any], repeat: int = 5, min_time: float = 0.2) -> Metrics:
+    """
+    Time a function call.
+
+    The number of calls per repetition is calibrated so that each repetition takes at least `min_time` seconds.
+    Returns the per-call median, minimum and standard deviation in microseconds and the median calls per second.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number)
+    median = statistics.median(samples)
+    return {
+        "median_us": median * 1e6,
+        "min_us": min(samples) * 1e6,
+        "stdev_us": statistics.stdev(samples) * 1e6 if len(samples) > 1 else 0.0,
+        "ops_per_sec": 1 / median if median else float("inf"),
+    }
+
+
+def throughput(function: Callable[[], int]) -> Metrics:
+    """Run a function performing a batch of operations, returning how many, and report operations per second."""
+    start = time.perf_counter()
+    operations = function()
+    elapsed = time.perf_counter() - start
+    return {"operations": operations, "seconds": elapsed, "ops_per_sec": operations / elapsed}
+
+
+def allocated(function: Callable[[], Any], count: int) -> Metrics:
+    """Measure the memory retained by the object returned from `function`, which holds `count` items."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        retained = function()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del retained
+    return {"bytes_per_item": (current - baseline) / count, "peak_bytes": peak - baseline}
+
+
+def _commit() -> str:
+    """Return the short hash of the current commit, with a suffix if the tree is dirty."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True
+        )
+        return commit.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save(results: Dict[str, Metrics], path: Optional[Path] = None) -> Path:
+    """Save results with run metadata and return the file path."""
+    commit = _commit()
+    if path is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}-{commit}.json"
+    document = {
+        "commit": commit,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    path.write_text(json.dumps(document, indent=2, sort_keys=True))
+    return path
+
+
+def load(path: Path) -> Dict[str, Metrics]:
+    """Load the results of a saved run."""
+    return json.loads(Path(path).read_text())["results"]
+
+
+def compare(baseline: Dict[str, Metrics], candidate: Dict[str, Metrics]) -> str:
+    """Return a table of the relative change of every metric present in both runs."""
+    lines = [f"{'benchmark':<40} {'metric':<16} {'baseline':>14} {'candidate':>14} {'change':>9}"]
+    for name in sorted(baseline.keys() & candidate.keys()):
+        for metric in sorted(baseline[name].keys() & candidate[name].keys()):
+            before, after = baseline[name][metric], candidate[name][metric]
+            change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+            lines.append(f"{name:<40} {metric:<16} {before:>14.2f} {after:>14.2f} {change:>9}")
+    return "\n".join(lines)
@@ -0,0 +1,50 @@
+"""Payloads used by the benchmarks, built from the recorded fixtures in `tests/test_responses`."""
+import copy
+import json
+
+from pathlib import Path
+from typing import Any
+from typing import Dict
+
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "test_responses"
+
+
+def small_payload() -> Dict[str, Any]:
+    """The recorded "Blue tack" response: one web result and two videos."""
+    return json.loads((FIXTURES_DIR / "blue_tack_minimal.json").read_text())
+
+
+def large_payload(results: int = 20, snippets: int = 5) -> Dict[str, Any]:
+    """
+    A full-size response: `results` web results with `extra_snippets`, products and ratings, and as many videos.
+
+    Results are derived from the recorded ones with unique URLs, so nothing can be deduplicated by accident.
+    """
+    payload = small_payload()
+    template = payload["web"]["results"][0]
+    video = payload["videos"]["results"][0]
+    payload["web"]["results"] = []
+    payload["videos"]["results"] = []
+    for index in range(results):
+        result = copy.deepcopy(template)
+        result["url"] = f"{template['url']}_{index}"
+        result["title"] = f"{template['title']} ({index})"
+        result["extra_snippets"] = [f"{template['description']} Snippet {n}." for n in range(snippets)]
+        if index % 2:
+            result["subtype"] = "product"
+            result["product"] = {
+                "name": f"Blu Tack {index}",
+                "price": f"{4.99 + index:.2f}",
+                "rating": {"ratingValue": 4.5, "bestRating": 5},
+            }
+        payload["web"]["results"].append(result)
+        clip = copy.deepcopy(video)
+        clip["url"] = f"{video['url']}&i={index}"
+        payload["videos"]["results"].append(clip)
+    return payload
+
+
+def encode(payload: Dict[str, Any]) -> bytes:
+    """Encode a payload the way the API does."""
+    return json.dumps(payload).encode("utf-8")
@@ -0,0 +1,57 @@
+"""
+Run the benchmark suite.
+
+Usage::
+
+    python -m benchmarks.run                      # run everything and print the results
+    python -m benchmarks.run -k parse --save      # run matching benchmarks and save them to benchmarks/results/
+    python -m benchmarks.run --compare OLD NEW    # compare two saved runs
+"""
+import argparse
+import importlib
+import json
+import pkgutil
+import sys
+
+from pathlib import Path
+
+from .harness import BENCHMARKS
+from .harness import compare
+from .harness import load
+from .harness import save
+
+
+def discover() -> None:
+    """Import every `bench_*` module so its benchmarks are registered."""
+    package = Path(__file__).parent
+    for module in pkgutil.iter_modules([str(package)]):
+        if module.name.startswith("bench_"):
+            importlib.import_module(f"{__package__}.{module.name}")
+
+
+def main() -> None:
+    """Entry point of `python -m benchmarks.run`."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--filter", default="", help="Only run benchmarks whose name contains this string.")
+    parser.add_argument("--save", action="store_true", help="Save the results to benchmarks/results/.")
+    parser.add_argument("--output", type=Path, help="Save the results to this file.")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"), type=Path)
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.stdout.write(compare(load(args.compare[0]), load(args.compare[1])) + "\n")
+        return
+
+    discover()
+    results = {}
+    for name in sorted(BENCHMARKS):
+        if args.filter in name:
+            results[name] = BENCHMARKS[name]()
+            sys.stdout.write(f"{name:<40} {json.dumps({k: round(v, 2) for k, v in results[name].items()})}\n")
+            sys.stdout.flush()
+    if args.save or args.output:
+        sys.stdout.write(f"Saved to {save(results, args.output)}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,39 @@
-# isort:skip_file
-from .sync import Brave
-from .async_brave import AsyncBrave
+"""
+Python client for the Brave Search API.
+
+The clients are imported lazily (PEP 562), so `import brave` does not pay for `requests`, `httpx`, `tenacity` or the
+response models until they are used.
+"""
+import importlib
+
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import List
+
+
+if TYPE_CHECKING:
+    from brave.async_brave import AsyncBrave
+    from brave.sync import Brave
+    from brave.types.adapters import warmup
+
+__all__ = ["AsyncBrave", "Brave", "warmup"]
+
+# Public attribute -> module defining it.
+_LAZY_ATTRIBUTES = {
+    "AsyncBrave": "brave.async_brave",
+    "Brave": "brave.sync",
+    "warmup": "brave.types.adapters",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
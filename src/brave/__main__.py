@@ -0,0 +1,6 @@
+import sys
+
+from brave.cli import main
+
+
+sys.exit(main())
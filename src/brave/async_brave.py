@@ -1,38 +1,156 @@
+import asyncio
+import time
+
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING
+from typing import Any
 from typing import Dict
+from typing import Mapping
 from typing import Optional
-
-import httpx
+from typing import Sequence
+from typing import Union
 
 from tenacity import AsyncRetrying
-from tenacity import stop_after_attempt
-from tenacity import wait_fixed
 
 from brave.client import BraveAPIClient
-from brave.exceptions import BraveError
-from brave.types import WebSearchApiResponse
+from brave.keys import KeyPool
+from brave.metrics import NULL_METRICS
+from brave.transport import AsyncBaseTransport
+from brave.transport import AsyncHTTPXTransport
+from brave.transport import Request
+
+
+if TYPE_CHECKING:
+    from brave.types import ImageSearchApiResponse
+    from brave.types import WebSearchApiResponse
 
 
 class AsyncBrave(BraveAPIClient):
-    """Asynchronous client for interacting with the Brave Search API."""
+    """
+    Asynchronous client for interacting with the Brave Search API.
+
+    Takes the parameters of `BraveAPIClient`, plus:
+
+    transport:
+        The `AsyncBaseTransport` used to send requests (default: an `AsyncHTTPXTransport` for `base_url`).
+    parse_executor:
+        A thread pool to parse responses in, off the event loop, e.g. `brave.parsing.default_executor()`, or a process
+        pool, which only decodes raw responses (see `brave.parsing`); the client does not shut it down (default: none).
+    """
+
+    def __init__(
+        self,
+        api_key: Union[str, Sequence[str], Mapping[str, float], KeyPool, None] = None,
+        endpoint: str = "web",
+        transport: Optional[AsyncBaseTransport] = None,
+        parse_executor: Optional[Executor] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(api_key=api_key, endpoint=endpoint, **kwargs)
+        self.parse_executor = parse_executor
+        if transport is None:
+            transport = AsyncHTTPXTransport(base_url=self.base_url, metrics=self.metrics)
+        elif transport.metrics is NULL_METRICS:
+            transport.metrics = self.metrics
+        self._install_middleware(transport)
+        self._negotiate(transport)
+        self.transport = transport
+        self.base_url = self.transport.base_url
+
+    async def __aenter__(self) -> "AsyncBrave":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def awarm(self, connections: int = 1) -> int:
+        """
+        Open `connections` pooled connections to the API ahead of the first requests, so they do not pay for DNS,
+        TCP and TLS, and return how many answered; see `AsyncBaseTransport.awarm`. Call `brave.warmup()` too to build
+        the response models.
+        """
+        return await self.transport.awarm(connections, timeout=self.timeout)
 
-    def __init__(self, api_key: Optional[str] = None, endpoint: str = "web") -> None:
-        super().__init__(api_key=api_key, endpoint=endpoint)
+    async def aclose(self) -> None:
+        """Release the connections held by the transport."""
+        await self.transport.aclose()
 
-    async def _get(self, params: Dict = None) -> httpx.Response:
+    async def _get(
+        self,
+        params: Optional[Dict] = None,
+        endpoint: Optional[str] = None,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+        sink: Optional[Any] = None,
+        budget: Optional[str] = None,
+    ) -> Any:
         """
         Perform an asynchronous GET request to the specified endpoint with optional parameters.
 
-        Includes retry logic using tenacity.
+        Includes retry logic using tenacity. Attempts are cancelled when the deadline of the call passes.
         """
-        url = self.base_url + self.endpoint + "/search"
-        headers = self._prepare_headers()
+        request = self._request(params=params, endpoint=endpoint, tag=tag, sink=sink, budget=budget)
+        deadline = self._deadline(timeout)
 
-        async for attempt in AsyncRetrying(stop=stop_after_attempt(3), wait=wait_fixed(2)):
+        async for attempt in AsyncRetrying(**self._retry_policy(deadline)):
             with attempt:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(url, headers=headers, params=params)
-                    response.raise_for_status()  # Raises HTTPError for bad requests
-                    return response
+                request.timeout = self._time_left(deadline, request)
+                if request.timeout is None:
+                    response = await self._send(request, priority)
+                else:
+                    try:
+                        response = await asyncio.wait_for(self._send(request, priority), request.timeout)
+                    except asyncio.TimeoutError:
+                        raise self._timed_out(request)
+                response.raise_for_status()  # Raises HTTPError for bad requests
+                return response
+
+    async def _send(self, request: Request, priority: Optional[str] = None) -> Any:
+        """Send one attempt, hedging it with a duplicate if it is slow to answer."""
+        delay = self._hedge_delay(request)
+        if delay is None:
+            return await self._timed_send(request, priority)
+        first = asyncio.ensure_future(self._timed_send(request, priority))
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return first.result()
+            second = asyncio.ensure_future(self._timed_send(self._duplicate(request), priority))
+            tasks.append(second)
+            pending, error = set(tasks), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self._count_hedge(won=task is second)
+                        return task.result()
+                    error = error or task.exception()
+            self._count_hedge(won=False)
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _timed_send(self, request: Request, priority: Optional[str] = None) -> Any:
+        """Send a request once the scheduler, if any, admits it, and record its latency for the hedging policy."""
+        if self.scheduler is None:
+            return await self._measured_send(request)
+        await self.scheduler.aacquire(priority)
+        try:
+            return await self._measured_send(request)
+        finally:
+            self.scheduler.release()
+
+    async def _measured_send(self, request: Request) -> Any:
+        """Send a request, recording its latency for the hedging policy."""
+        if self.hedge is None:
+            return await self.transport.send(request)
+        start = time.perf_counter()
+        response = await self.transport.send(request)
+        self.hedge.record(time.perf_counter() - start)
+        return response
 
     async def search(
         self,
@@ -50,73 +168,72 @@ class AsyncBrave(BraveAPIClient):
         goggles_id: Optional[str] = None,
         units: Optional[str] = None,
         extra_snippets: Optional[bool] = False,
-    ) -> WebSearchApiResponse:
+        raw: Union[bool, str] = False,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+        sink: Optional[Any] = None,
+    ) -> "WebSearchApiResponse":
         """
         Perform a search using the Brave Search API.
 
-        Parameters:
-        -----------
-        q: str
-            The search query (required).
-        country: str
-            The 2-character country code (default: 'US').
-        search_lang: str
-            The search language preference.
-        ui_lang: str
-            User interface language preference (default: 'en_US').
-        count: int
-            The number of results to return (default: 20, max: 20).
-        offset: int
-            Offset for pagination (default: 0, max: 9).
-        safesearch: str
-            Filter for adult content ('off', 'moderate', 'strict').
-        freshness: str
-            Filters results by discovery time.
-        text_decorations: bool
-            Include decoration markers in display strings (default: True).
-        spellcheck: bool
-            Spellcheck the query (default: True).
-        result_filter: str
-            Types of results to include.
-        goggles_id: str
-            The goggle URL to rerank search results.
-        units: str
-            Measurement units (metric or imperial).
-        extra_snippets: bool
-            Enable extra alternate snippets (default: False).
+        Takes the same parameters as `BraveAPIClient.search`.
+        """
+        return await self._arun(
+            self._search_call(
+                q=q,
+                country=country,
+                search_lang=search_lang,
+                ui_lang=ui_lang,
+                count=count,
+                offset=offset,
+                safesearch=safesearch,
+                freshness=freshness,
+                text_decorations=text_decorations,
+                spellcheck=spellcheck,
+                result_filter=result_filter,
+                goggles_id=goggles_id,
+                units=units,
+                extra_snippets=extra_snippets,
+                raw=raw,
+                timeout=timeout,
+                priority=priority,
+                tag=tag,
+                sink=sink,
+            )
+        )
+
+    async def image(
+        self,
+        q: str,
+        country: Optional[str] = None,
+        search_lang: Optional[str] = None,
+        count: Optional[int] = 20,
+        safesearch: Optional[str] = "moderate",
+        spellcheck: Optional[bool] = True,
+        raw: Union[bool, str] = False,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+        sink: Optional[Any] = None,
+    ) -> "ImageSearchApiResponse":
         """
+        Perform an image search using the Brave Search API.
 
-        # Parameter validation and query parameter construction
-        if not q or len(q) > 400 or len(q.split()) > 50:
-            raise ValueError("Invalid query parameter 'q'")
-
-        params = {
-            "q": q,
-            "country": country,
-            "search_lang": search_lang,
-            "ui_lang": ui_lang,
-            "count": min(count, 20),
-            "offset": min(offset, 9),
-            "safesearch": safesearch,
-            "freshness": freshness,
-            "text_decorations": text_decorations,
-            "spellcheck": spellcheck,
-            "result_filter": result_filter,
-            "goggles_id": goggles_id,
-            "units": units,
-            "extra_snippets": extra_snippets,
-        }
-
-        # Filter out None values
-        params = {k: v for k, v in params.items() if v is not None}
-
-        # API request and response handling
-        response = await self._get(params=params)  # _make_request to be implemented based on sync/async client
-
-        # Error handling and data parsing
-        if response.status_code != 200:
-            # Handle errors (e.g., log them, raise exceptions)
-            raise BraveError(f"API Error: {response.status_code} - {response.text}")
-
-        # return response.json()
-        return WebSearchApiResponse.model_validate(response.json())
+        Takes the same parameters as `BraveAPIClient.image`.
+        """
+        return await self._arun(
+            self._image_call(
+                q=q,
+                country=country,
+                search_lang=search_lang,
+                count=count,
+                safesearch=safesearch,
+                spellcheck=spellcheck,
+                raw=raw,
+                timeout=timeout,
+                priority=priority,
+                tag=tag,
+                sink=sink,
+            )
+        )
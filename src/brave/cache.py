@@ -0,0 +1,69 @@
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from typing import Tuple
+
+
+class ResponseCache:
+    """
+    Thread-safe in-memory LRU cache of response bodies with a time-to-live.
+
+    Bodies are stored as the raw bytes returned by the API, so a cached entry can be parsed into a model or returned
+    raw. Keys are built from the canonical query parameters (see `brave.validation`), so equivalent requests share an
+    entry.
+
+    Parameters:
+    -----------
+    maxsize: int
+        The maximum number of responses to keep (default: 1024).
+    ttl: float
+        The number of seconds an entry stays valid (default: 3600).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(endpoint: str, params: Dict) -> Hashable:
+        """Build the cache key for a request."""
+        return (endpoint, tuple(sorted(params.items())))
+
+    def get(self, key: Hashable, stale: bool = False) -> Optional[bytes]:
+        """
+        Return the cached body for `key`, or None if it is missing or expired.
+
+        Expired entries are kept until they are evicted or replaced, and returned with `stale`, e.g. when the quota
+        is used up.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, body = entry
+            if expires < time.monotonic() and not stale:
+                return None
+            self._entries.move_to_end(key)
+            return body
+
+    def set(self, key: Hashable, body: bytes) -> None:
+        """Store a response body, evicting the least recently used entries when full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,206 @@
+"""
+Record and replay Brave Search API traffic.
+
+A `Cassette` is transport middleware backed by an append-only local archive. In record mode every request that
+reaches the network and succeeds is appended to the archive together with its response; in replay mode requests are
+answered from the archive without any network I/O, so parsing and downstream stages can be benchmarked on production
+traffic without spending quota or adding network variance.
+
+The archive is a directory holding two append-only files:
+
+- `bodies.bin`: the gzip compressed response bodies, concatenated.
+- `index.jsonl`: one JSON line per recorded request with its path, canonical parameters, status, headers and the
+  offset and length of its body in `bodies.bin`.
+
+Only the index is loaded in memory; bodies are read from disk on replay.
+"""
+import gzip
+import json
+import os
+import threading
+import time
+
+from typing import Any
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Union
+
+from brave.exceptions import BraveCassetteMiss
+from brave.exceptions import BraveError
+from brave.transport import Middleware
+from brave.transport import Passthrough
+from brave.transport import Request
+from brave.transport import Response
+
+
+REPLAY = "replay"
+RECORD = "record"
+RECORD_NEW = "record_new"
+
+EXACT = "exact"
+FUZZY = "fuzzy"
+
+# Response headers that describe the transfer rather than the body and are not recorded.
+_TRANSFER_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+
+
+def _request_key(path: str, params: Dict[str, Any]) -> str:
+    """Return the exact match key of a request."""
+    return path + "?" + json.dumps(params, sort_keys=True, default=str)
+
+
+def _terms(query: Any) -> FrozenSet[str]:
+    """Return the set of lower-case terms of a query, for fuzzy matching."""
+    return frozenset(str(query).lower().split())
+
+
+class ReplayedResponse(Response):
+    """A response served from a cassette."""
+
+    pass
+
+
+class Cassette(Middleware):
+    """
+    Append-only, indexed archive of API traffic used as transport middleware.
+
+    Parameters:
+    -----------
+    path: str
+        Directory of the archive; created if missing.
+    mode: str
+        "replay" answers only from the archive and raises `BraveCassetteMiss` on a miss, "record" sends every
+        request and appends it, and "record_new" replays hits and records misses (default: "replay"). Only 200
+        responses are recorded, so a transient 429 or 500 is never replayed.
+    match: str
+        "exact" matches the endpoint and all canonical parameters; "fuzzy" falls back to the recorded request on the
+        same endpoint whose query shares the most terms, ignoring the other parameters (default: "exact").
+    min_similarity: float
+        The minimum Jaccard similarity between query terms accepted by fuzzy matching (default: 0.5).
+    ignore_params: Iterable[str]
+        Parameters left out of exact matching, e.g. ("offset",) (default: none).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        mode: str = REPLAY,
+        match: str = EXACT,
+        min_similarity: float = 0.5,
+        ignore_params: Iterable[str] = (),
+    ) -> None:
+        if mode not in (REPLAY, RECORD, RECORD_NEW):
+            raise BraveError(f"Invalid cassette mode: {mode!r}")
+        if match not in (EXACT, FUZZY):
+            raise BraveError(f"Invalid cassette match: {match!r}")
+        self.path = os.fspath(path)
+        self.mode = mode
+        self.match = match
+        self.min_similarity = min_similarity
+        self.ignore_params = frozenset(ignore_params)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._by_term: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        os.makedirs(self.path, exist_ok=True)
+        self._bodies_path = os.path.join(self.path, "bodies.bin")
+        self._index_path = os.path.join(self.path, "index.jsonl")
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _key(self, path: str, params: Dict[str, Any]) -> str:
+        """Return the exact match key of a request, leaving out ignored parameters."""
+        return _request_key(path, {name: value for name, value in params.items() if name not in self.ignore_params})
+
+    def _load(self) -> None:
+        """Load the index of an existing archive."""
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, "r", encoding="utf-8") as index:
+            for line in index:
+                if line.strip():
+                    self._add(json.loads(line))
+
+    def _add(self, entry: Dict[str, Any]) -> None:
+        """Add an index entry to the in-memory lookup tables; later entries win."""
+        self._entries[self._key(entry["path"], entry["params"])] = entry
+        by_term = self._by_term.setdefault(entry["path"], {})
+        for term in _terms(entry["params"].get("q", "")):
+            by_term.setdefault(term, []).append(entry)
+
+    def lookup(self, path: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the index entry matching a request, or None."""
+        entry = self._entries.get(self._key(path, params))
+        if entry is not None or self.match == EXACT:
+            return entry
+        terms = _terms(params.get("q", ""))
+        by_term = self._by_term.get(path, {})
+        best, best_score = None, 0.0
+        for term in terms:
+            for candidate in by_term.get(term, ()):
+                candidate_terms = _terms(candidate["params"].get("q", ""))
+                score = len(terms & candidate_terms) / len(terms | candidate_terms)
+                if score > best_score:
+                    best, best_score = candidate, score
+        return best if best_score >= self.min_similarity else None
+
+    def _read_body(self, entry: Dict[str, Any]) -> bytes:
+        """Read and decompress the body of an entry."""
+        with open(self._bodies_path, "rb") as bodies:
+            bodies.seek(entry["offset"])
+            return gzip.decompress(bodies.read(entry["length"]))
+
+    def record(self, path: str, params: Dict[str, Any], response: Any) -> None:
+        """Append a request and its response to the archive."""
+        body = gzip.compress(response.content)
+        headers = {
+            name: value for name, value in dict(response.headers).items() if name.lower() not in _TRANSFER_HEADERS
+        }
+        with self._lock:
+            with open(self._bodies_path, "ab") as bodies:
+                offset = bodies.seek(0, os.SEEK_END)
+                bodies.write(body)
+            entry = {
+                "path": path,
+                "params": params,
+                "status": response.status_code,
+                "headers": headers,
+                "offset": offset,
+                "length": len(body),
+                "recorded_at": time.time(),
+            }
+            with open(self._index_path, "a", encoding="utf-8") as index:
+                index.write(json.dumps(entry, default=str) + "\n")
+            self._add(entry)
+
+    def before_request(self, request: Request) -> Optional[Response]:
+        """Answer the request from the archive unless recording."""
+        if self.mode == RECORD:
+            return None
+        entry = self.lookup(request.path, request.params)
+        if entry is None:
+            self.misses += 1
+            if self.mode == REPLAY:
+                raise BraveCassetteMiss(f"No recorded response for {request.path} with {request.params}")
+            return None
+        self.hits += 1
+        return ReplayedResponse(entry["status"], self._read_body(entry), entry["headers"])
+
+    def after_response(self, request: Request, response: Any) -> Any:
+        """
+        Record successful responses that came from the network, except passthrough ones, whose bodies were never
+        read.
+        """
+        if (
+            self.mode != REPLAY
+            and response.status_code == 200
+            and not isinstance(response, (ReplayedResponse, Passthrough))
+        ):
+            self.record(request.path, request.params, response)
+        return response
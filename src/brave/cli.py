@@ -0,0 +1,376 @@
+"""
+Command line interface: run large batches of queries through the Brave Search API.
+
+    brave queries.txt -o results.jsonl --concurrency 16 --rate 20 --checkpoint run.ckpt
+    cat queries.jsonl | brave - --format csv > results.csv
+
+Queries are read from a file or stdin, one per line, as plain text or as JSONL objects holding the `q` and any other
+parameter of the call, plus an optional `id` copied to the output; blank lines are skipped. They are read lazily and
+sent by a fixed number of workers behind a bounded queue, so memory stays flat whatever the size of the input, and
+results are written as they complete, in completion order:
+
+- JSONL: one object per query with its line number, query, id, and the decoded response or the error.
+- CSV and Parquet: one row per result (title, URL, description), or a single row holding the error. Parquet output
+  is a directory of part files, a new one at every checkpoint so each is complete on disk, and needs
+  `pip install brave-search[parquet]`.
+
+With `--checkpoint`, the line numbers of completed queries are saved periodically, after the output is flushed, as a
+watermark below which every line is done plus the few done lines above it. Rerunning the same command skips them and
+appends to the output, so an interrupted run continues where it stopped; queries completed after the last checkpoint
+are sent and written again. Failed queries are not completed, whether they timed out, were rate limited or were
+refused by a used up `--quota`, so a rerun sends them again and writes a new record after their error; only lines
+that can never succeed, such as malformed JSON or rejected parameters, are completed with their error.
+"""
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+
+from typing import IO
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from brave.exceptions import BraveError
+from brave.exceptions import BraveValidationError
+
+
+if TYPE_CHECKING:
+    from brave.async_brave import AsyncBrave
+
+JSONL = "jsonl"
+CSV = "csv"
+PARQUET = "parquet"
+TEXT = "text"
+AUTO = "auto"
+
+COLUMNS = ["line", "id", "query", "rank", "title", "url", "description", "error"]
+
+_READ_BATCH = 1000  # lines read from the input per executor call
+
+_RESERVED = ("raw", "sink")  # call parameters set by the run itself
+_INVALID = (ValueError, TypeError)  # errors of a line rejected before any request, which a rerun would repeat
+
+
+def parse_query(line: str, input_format: str = AUTO) -> Dict[str, Any]:
+    """
+    Return the call parameters of an input line.
+
+    Text lines are the query itself; JSONL lines are objects holding `q` and other parameters, or a JSON string. With
+    "auto", lines starting with `{` are read as JSON, and cannot set the parameters set by the run (`raw`, `sink`).
+    """
+    line = line.strip()
+    if input_format == JSONL or (input_format == AUTO and line.startswith("{")):
+        value = json.loads(line)
+        if not isinstance(value, dict):
+            return {"q": value}
+        reserved = [key for key in _RESERVED if key in value]
+        if reserved:
+            raise BraveValidationError(f"Query lines cannot set {', '.join(map(repr, reserved))}")
+        return dict(value)
+    return {"q": line}
+
+
+def result_rows(record: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Flatten an output record into one row per result, or a single row without result."""
+    base = {"line": record["line"], "id": record.get("id"), "query": record["query"], "error": record.get("error")}
+    response = record.get("response") or {}
+    results = response.get("web", {}).get("results") if "web" in response else response.get("results")
+    if not results:
+        yield dict(base, rank=None, title=None, url=None, description=None)
+        return
+    for rank, result in enumerate(results, 1):
+        yield dict(
+            base, rank=rank, title=result.get("title"), url=result.get("url"), description=result.get("description")
+        )
+
+
+class JSONLWriter:
+    """Write one JSON line per record."""
+
+    def __init__(self, stream: IO[str]) -> None:
+        self.stream = stream
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Write a record."""
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def flush(self) -> None:
+        """Flush the written records to the stream."""
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Flush, and close the stream unless it is stdout."""
+        self.flush()
+        if self.stream is not sys.stdout:
+            self.stream.close()
+
+
+class CSVWriter(JSONLWriter):
+    """Write one CSV row per result, with a header unless appending to a non-empty file."""
+
+    def __init__(self, stream: IO[str], header: bool = True) -> None:
+        super().__init__(stream)
+        self._writer = csv.DictWriter(stream, COLUMNS)
+        if header:
+            self._writer.writeheader()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Write the rows of a record."""
+        self._writer.writerows(result_rows(record))
+
+
+class ParquetWriter:
+    """
+    Write one row per result to the part files of a Parquet dataset directory.
+
+    Rows are buffered and written as a new, complete part file on every flush, or once `rows_per_file` are buffered,
+    so an interrupted run never leaves a truncated file behind.
+    """
+
+    def __init__(self, directory: str, rows_per_file: int = 100_000) -> None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow: pip install brave-search[parquet]") from None
+        self._pyarrow = pyarrow
+        self.directory = directory
+        self.rows_per_file = rows_per_file
+        os.makedirs(directory, exist_ok=True)
+        self._part = sum(1 for name in os.listdir(directory) if name.endswith(".parquet"))
+        self._schema = pyarrow.schema(
+            [
+                ("line", pyarrow.int64()),
+                ("id", pyarrow.string()),
+                ("query", pyarrow.string()),
+                ("rank", pyarrow.int32()),
+                ("title", pyarrow.string()),
+                ("url", pyarrow.string()),
+                ("description", pyarrow.string()),
+                ("error", pyarrow.string()),
+            ]
+        )
+        self._rows: List[Dict[str, Any]] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Buffer the rows of a record, writing a part file when the buffer is full."""
+        for row in result_rows(record):
+            row["id"] = str(row["id"]) if row["id"] is not None else None
+            self._rows.append(row)
+        if len(self._rows) >= self.rows_per_file:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows as a new part file."""
+        if not self._rows:
+            return
+        path = os.path.join(self.directory, f"part-{self._part:05d}.parquet")
+        table = self._pyarrow.Table.from_pylist(self._rows, schema=self._schema)
+        self._pyarrow.parquet.write_table(table, path + ".tmp")
+        os.replace(path + ".tmp", path)
+        self._part += 1
+        self._rows = []
+
+    def close(self) -> None:
+        """Write the buffered rows."""
+        self.flush()
+
+
+class Checkpoint:
+    """
+    The completed lines of a run, saved atomically to a JSON file.
+
+    Lines complete out of order, so they are kept as a watermark, every line below which is done, plus the set of
+    done lines above it, which stays as small as the number of queries in flight and failed queries.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.below = 1
+        self.done: Set[int] = set()
+        if path is not None and os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                state = json.load(file)
+            self.below = state["below"]
+            self.done = set(state["done"])
+
+    @property
+    def started(self) -> bool:
+        """Whether any line was completed by a previous run."""
+        return self.below > 1 or bool(self.done)
+
+    def __contains__(self, line: int) -> bool:
+        return line < self.below or line in self.done
+
+    def mark(self, line: int) -> None:
+        """Record a completed line."""
+        self.done.add(line)
+        while self.below in self.done:
+            self.done.remove(self.below)
+            self.below += 1
+
+    def save(self) -> None:
+        """Write the checkpoint file, replacing the previous one atomically."""
+        if self.path is None:
+            return
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump({"below": self.below, "done": sorted(self.done)}, file)
+        os.replace(temporary, self.path)
+
+
+def _open_writer(args: argparse.Namespace, append: bool) -> Any:
+    """Open the writer of the output format."""
+    if args.format == PARQUET:
+        if args.output == "-":
+            raise SystemExit("Parquet output needs an output directory (-o)")
+        return ParquetWriter(args.output)
+    if args.output == "-":
+        stream, header = sys.stdout, True
+    else:
+        header = not (append and os.path.exists(args.output) and os.path.getsize(args.output) > 0)
+        stream = open(args.output, "a" if append else "w", encoding="utf-8", newline="")
+    return CSVWriter(stream, header) if args.format == CSV else JSONLWriter(stream)
+
+
+def _client(args: argparse.Namespace) -> "AsyncBrave":
+    """Build the client of a run from the command line options."""
+    from brave.async_brave import AsyncBrave
+    from brave.cache import ResponseCache
+    from brave.quota import QuotaLedger
+    from brave.scheduler import BATCH
+    from brave.scheduler import Scheduler
+
+    return AsyncBrave(
+        api_key=args.api_key,
+        base_url=args.base_url,
+        cache=ResponseCache(maxsize=args.cache_size, ttl=args.cache_ttl) if args.cache_size else None,
+        timeout=args.timeout,
+        scheduler=Scheduler(weights={BATCH: 1}, rate=args.rate, burst=args.burst) if args.rate else None,
+        quota=QuotaLedger(args.quota) if args.quota else None,
+    )
+
+
+async def run(args: argparse.Namespace) -> Dict[str, int]:
+    """Run every query of the input and write the results; return the number of queries sent, failed and skipped."""
+    client = _client(args)
+    checkpoint = Checkpoint(args.checkpoint)
+    stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    writer = _open_writer(args, append=checkpoint.started)
+    call = client.image if args.images else client.search
+    queue: "asyncio.Queue[Optional[Tuple[int, str]]]" = asyncio.Queue(maxsize=2 * args.concurrency)
+    counts = {"sent": 0, "failed": 0, "skipped": 0}
+    saved = time.monotonic()
+
+    async def produce() -> None:
+        loop = asyncio.get_running_loop()
+        lines = enumerate(stream, 1)
+        while True:
+            batch = await loop.run_in_executor(None, list, itertools.islice(lines, _READ_BATCH))
+            if not batch:
+                break
+            for line, text in batch:
+                if line in checkpoint:
+                    counts["skipped"] += 1
+                elif not text.strip():
+                    checkpoint.mark(line)
+                else:
+                    await queue.put((line, text))
+        for _ in range(args.concurrency):
+            await queue.put(None)
+
+    async def work() -> None:
+        nonlocal saved
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            line, text = item
+            record: Dict[str, Any] = {"line": line, "id": None, "query": text.strip()}
+            completed = True
+            try:
+                params = parse_query(text, args.input_format)
+                record.update(id=params.pop("id", None), query=params.get("q"))
+                record["response"] = await call(**params, raw=True)
+            except Exception as error:  # one failed query must not stop the run
+                record["error"] = f"{type(error).__name__}: {error}"
+                counts["failed"] += 1
+                completed = isinstance(error, _INVALID)  # others may succeed when the run is resumed
+            counts["sent"] += 1
+            writer.write(record)
+            if completed:
+                checkpoint.mark(line)
+            if counts["sent"] % args.checkpoint_every == 0 or time.monotonic() - saved > 10:
+                writer.flush()
+                checkpoint.save()
+                saved = time.monotonic()
+
+    try:
+        await asyncio.gather(produce(), *(work() for _ in range(args.concurrency)))
+    finally:
+        writer.flush()
+        checkpoint.save()
+        writer.close()
+        await client.aclose()
+        if client.quota is not None:
+            client.quota.close()
+        if stream is not sys.stdin:
+            stream.close()
+    return counts
+
+
+def parser() -> argparse.ArgumentParser:
+    """Build the argument parser of the `brave` command."""
+    parser = argparse.ArgumentParser(prog="brave", description="Run a batch of queries through the Brave Search API.")
+    parser.add_argument("input", help="file of queries, one per line, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file, or directory for Parquet (default: stdout)")
+    parser.add_argument("-f", "--format", choices=[JSONL, CSV, PARQUET], help="output format (default: from -o)")
+    parser.add_argument("--input-format", choices=[AUTO, TEXT, JSONL], default=AUTO, help="default: auto")
+    parser.add_argument("--images", action="store_true", help="run image searches instead of web searches")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="queries in flight (default: 8)")
+    parser.add_argument("--rate", type=float, help="requests per second (default: unlimited)")
+    parser.add_argument("--burst", type=int, default=1, help="requests sent at once after an idle period")
+    parser.add_argument("--cache-size", type=int, default=0, help="responses cached to skip repeated queries")
+    parser.add_argument("--cache-ttl", type=float, default=3600.0, help="seconds a cached response stays fresh")
+    parser.add_argument("--timeout", type=float, help="time limit of each query in seconds, retries included")
+    parser.add_argument("--quota", help="QuotaLedger database to account the requests of the run in")
+    parser.add_argument("--checkpoint", help="checkpoint file, to resume an interrupted run")
+    parser.add_argument("--checkpoint-every", type=int, default=1000, help="queries between checkpoints")
+    parser.add_argument("--api-key", help="API key, or comma separated keys (default: BRAVE_API_KEY)")
+    parser.add_argument("--base-url", help="URL of the API, e.g. of a proxy (default: the Brave Search API)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the `brave` command; returns 1 if any query failed."""
+    args = parser().parse_args(argv)
+    if args.format is None:
+        extension = os.path.splitext(args.output)[1].lstrip(".").lower()
+        args.format = extension if extension in (CSV, PARQUET) else JSONL
+    args.concurrency = max(1, args.concurrency)
+    args.checkpoint_every = max(1, args.checkpoint_every)
+    start = time.monotonic()
+    try:
+        counts = asyncio.run(run(args))
+    except BraveError as error:
+        sys.stderr.write(f"brave: {error}\n")
+        return 2
+    except KeyboardInterrupt:
+        sys.stderr.write("Interrupted; rerun the same command to resume from the checkpoint\n")
+        return 130
+    elapsed = time.monotonic() - start
+    sys.stderr.write(
+        f"{counts['sent']} queries sent, {counts['failed']} failed, {counts['skipped']} skipped in {elapsed:.1f}s "
+        f"({counts['sent'] / max(elapsed, 1e-9):.1f}/s)\n"
+    )
+    return 1 if counts["failed"] else 0
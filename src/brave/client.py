@@ -1,27 +1,164 @@
+import dataclasses
+import json
+import logging
 import os
+import time
 
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING
+from typing import Any
 from typing import Dict
+from typing import Generator
+from typing import Mapping
 from typing import Optional
+from typing import Sequence
+from typing import Type
+from typing import Union
 
+from tenacity import before_sleep_log
+from tenacity import retry_if_exception
+from tenacity import stop_after_attempt
+
+from brave.cache import ResponseCache
+from brave.cassette import Cassette
+from brave.encoding import accept_encoding
 from brave.exceptions import BraveError
-from brave.types import ImageSearchApiResponse
-from brave.types import WebSearchApiResponse
+from brave.exceptions import BraveHTTPError
+from brave.exceptions import BraveQuotaExceeded
+from brave.exceptions import BraveTimeout
+from brave.hedging import Hedge
+from brave.keys import KeyPool
+from brave.metrics import CACHE_HITS
+from brave.metrics import CACHE_MISSES
+from brave.metrics import HEDGED_REQUESTS
+from brave.metrics import JSON_DECODE_SECONDS
+from brave.metrics import NULL_METRICS
+from brave.metrics import PARSE_SECONDS
+from brave.metrics import REJECTED_REQUESTS
+from brave.metrics import RETRIES
+from brave.metrics import TIMEOUTS
+from brave.metrics import Metrics
+from brave.quota import CACHE_ONLY
+from brave.quota import NORMAL
+from brave.quota import QuotaLedger
+from brave.resilience import AdaptiveLimiter
+from brave.resilience import CircuitBreaker
+from brave.scheduler import Scheduler
+from brave.transport import DEFAULT_BASE_URL
+from brave.transport import Passthrough
+from brave.transport import Request
+from brave.transport import writer
+from brave.validation import IMAGE_SEARCH_PARAMS
+from brave.validation import WEB_SEARCH_PARAMS
+from brave.validation import Normalizer
+from brave.validation import normalize_params
+
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+    from brave.types import ImageSearchApiResponse
+    from brave.types import WebSearchApiResponse
+    from brave.types.pooling import ObjectPool
+
+logger = logging.getLogger(__name__)
+
+RETRY_ATTEMPTS = 3
+RETRY_WAIT_SECONDS = 2
+
+# Values of `raw` returning the decompressed body itself, without decoding it.
+RAW_BODIES = ("bytes", "memoryview")
+
+# A sans-I/O call: yields the (endpoint, params, options) of the request to send, receives the response and returns
+# the result. The options are keyword arguments of `_get`, such as the timeout of the call. With a parse executor, it
+# also yields a `Parse` and receives the parsed body.
+Call = Generator[Any, Any, Any]
+
+
+@dataclasses.dataclass(frozen=True)
+class Parse:
+    """A body for the driver of a call to parse into `model`, or to decode when `raw` is set."""
+
+    body: bytes
+    model: Type["BaseModel"]
+    raw: bool
+
+
+def is_retryable(exception: BaseException) -> bool:
+    """
+    Return whether a failed request should be retried.
+
+    Errors raised by the client itself (`BraveError` other than `BraveHTTPError`), such as validation errors or
+    cassette misses, are deterministic and never retried.
+    """
+    return not isinstance(exception, BraveError) or isinstance(exception, BraveHTTPError)
 
 
 class BraveAPIClient:
     """
     Base client class for interacting with the Brave Search API.
 
+    The client is split into a sans-I/O core, which builds requests and parses responses, and a transport (`_get`)
+    provided by the synchronous and asynchronous subclasses. Every call is a generator produced by `_call` which is
+    driven by `_run` (synchronous) or `_arun` (asynchronous), so both clients share exactly the same behaviour.
+
     Parameters:
     -----------
     api_key:
-        The API key to be used for authentication.
-        If not provided, it will be retrieved from the BRAVE_API_KEY environment variable.
+        The API key to be used for authentication, or several keys to spread requests across: a list of keys, a
+        mapping of keys to weights or a `KeyPool`. If not provided, it will be retrieved from the BRAVE_API_KEY
+        environment variable, which may hold several comma separated keys.
     endpoint:
         The endpoint to be used for API requests (default: "web").
+    cache:
+        An optional `ResponseCache` used to serve repeated requests without network I/O.
+    base_url:
+        The URL of the API (default: "https://api.search.brave.com/res/v1/"). Ignored when a transport is given.
+    metrics:
+        A `Metrics` sink receiving timings, sizes, retries and cache hits (default: none).
+    timeout:
+        Default time limit of a call in seconds, retries included (default: none).
+    hedge:
+        A `Hedge` policy: send a duplicate request when an attempt is slower than most, and use the first response
+        (default: none).
+    breaker:
+        A `CircuitBreaker` refusing requests while the API is failing (default: none).
+    limiter:
+        An `AdaptiveLimiter` capping the requests in flight, shedding the excess as the API slows down (default: none).
+    scheduler:
+        A `Scheduler` admitting requests by priority class under a rate limit and concurrency cap (default: none).
+    quota:
+        A `QuotaLedger` counting the requests of the month and enforcing budgets: past them the client serves expired
+        cache entries, then only cached responses (default: none).
+    pool:
+        An `ObjectPool` sharing the repeated values and sub-objects of parsed responses (hostnames, favicons,
+        `MetaUrl`, `Profile`...) across responses, to save memory when many are kept (default: none).
+    encodings:
+        Content encodings to offer the API, most preferred first, e.g. `["gzip"]` (default: every installed one of
+        "zstd", "br" and "gzip"; see `brave.encoding`).
     """
 
-    def __init__(self, api_key: Optional[str] = None, endpoint: str = "web") -> None:
+    image_endpoint = "images"
+    retry_attempts = RETRY_ATTEMPTS
+    retry_wait = RETRY_WAIT_SECONDS
+    parse_executor: Optional[Executor] = None
+
+    def __init__(
+        self,
+        api_key: Union[str, Sequence[str], Mapping[str, float], KeyPool, None] = None,
+        endpoint: str = "web",
+        cache: Optional[ResponseCache] = None,
+        base_url: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+        timeout: Optional[float] = None,
+        hedge: Optional[Hedge] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        scheduler: Optional[Scheduler] = None,
+        quota: Optional[QuotaLedger] = None,
+        pool: Optional["ObjectPool"] = None,
+        encodings: Optional[Sequence[str]] = None,
+    ) -> None:
         if api_key is None:
             api_key = os.environ.get("BRAVE_API_KEY")
         if api_key is None:
@@ -29,15 +166,150 @@ class BraveAPIClient:
                 "The api_key client option must be set either by passing api_key \
                     to the client or by setting the BRAVE_API_KEY environment variable"
             )
+        if isinstance(api_key, str) and "," in api_key:
+            api_key = [key.strip() for key in api_key.split(",") if key.strip()]
+        if isinstance(api_key, str):
+            self.keys: Optional[KeyPool] = None
+        else:
+            self.keys = api_key if isinstance(api_key, KeyPool) else KeyPool(api_key)
+            api_key = self.keys.keys[0]
         self.api_key = api_key
         self.endpoint = endpoint
-        self.base_url = "https://api.search.brave.com/res/v1/"
+        self.cache = cache
+        self.base_url = base_url or DEFAULT_BASE_URL
+        self.metrics = metrics or NULL_METRICS
+        self.timeout = timeout
+        self.hedge = hedge
+        self.breaker = breaker
+        self.limiter = limiter
+        self.scheduler = scheduler
+        self.quota = quota
+        self.pool = pool
+        self.encodings = encodings
+        self.accept_encoding = accept_encoding(encodings)
+        if scheduler is not None and scheduler.metrics is NULL_METRICS:
+            scheduler.metrics = self.metrics
 
     def _prepare_headers(self) -> Dict:
         """Prepare the common headers required for the API requests."""
-        return {"Accept": "application/json", "Accept-Encoding": "gzip", "X-Subscription-Token": self.api_key}
+        return {
+            "Accept": "application/json",
+            "Accept-Encoding": self.accept_encoding,
+            "X-Subscription-Token": self.api_key,
+        }
+
+    def _negotiate(self, transport: Any) -> None:
+        """Offer the content encodings that both the transport and `brave.encoding` decode."""
+        self.accept_encoding = accept_encoding(self.encodings, transport.encodings)
+
+    def _install_middleware(self, transport: Any) -> None:
+        """
+        Put the circuit breaker, the concurrency limiter, the key pool and the quota ledger, those set, first in the
+        middleware of a transport, so refused requests never lease a key and the ledger sees the key of each request.
+
+        Cassettes stay ahead of them: a replayed request never reaches the network, so it must not be refused, lease a
+        key or be counted against the quota.
+        """
+        guards = [guard for guard in (self.breaker, self.limiter, self.keys, self.quota) if guard is not None]
+        for guard in guards:
+            if getattr(guard, "metrics", None) is NULL_METRICS:
+                guard.metrics = self.metrics
+        chain = transport.middleware
+        position = max(
+            (index + 1 for index, middleware in enumerate(chain) if isinstance(middleware, Cassette)), default=0
+        )
+        chain[position:position] = [guard for guard in guards if guard not in chain]
+
+    def _request(
+        self,
+        params: Optional[Dict] = None,
+        endpoint: Optional[str] = None,
+        tag: Optional[str] = None,
+        sink: Optional[Any] = None,
+        budget: Optional[str] = None,
+    ) -> Request:
+        """Build the transport request for an endpoint (default: the client endpoint)."""
+        return Request(
+            path=(endpoint or self.endpoint) + "/search",
+            params=params or {},
+            headers=self._prepare_headers(),
+            tag=tag,
+            budget=budget,
+            sink=sink,
+        )
+
+    def _retry_policy(self, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Return the tenacity retry arguments shared by the synchronous and asynchronous transports.
 
-    def _get(self, params: Optional[Dict] = None) -> Dict:
+        Waits are cut short at the `deadline` of the call, so the next attempt raises `BraveTimeout` on time.
+        """
+
+        def wait(retry_state: Any) -> float:
+            if deadline is None:
+                return self.retry_wait
+            return max(0.0, min(self.retry_wait, deadline - time.monotonic()))
+
+        return {
+            "stop": stop_after_attempt(self.retry_attempts),
+            "wait": wait,
+            "retry": retry_if_exception(is_retryable),
+            "before_sleep": self._before_retry,
+        }
+
+    def _before_retry(self, retry_state: Any) -> None:
+        """Log and count a retry."""
+        before_sleep_log(logger, logging.WARNING)(retry_state)
+        self.metrics.increment(RETRIES)
+
+    def _deadline(self, timeout: Optional[float]) -> Optional[float]:
+        """Return the monotonic deadline of a call with a timeout (default: the client timeout)."""
+        timeout = timeout if timeout is not None else self.timeout
+        return time.monotonic() + timeout if timeout is not None else None
+
+    def _time_left(self, deadline: Optional[float], request: Request) -> Optional[float]:
+        """Return the seconds left before the deadline, raising `BraveTimeout` when there are none."""
+        if deadline is None:
+            return None
+        left = deadline - time.monotonic()
+        if left <= 0:
+            raise self._timed_out(request)
+        return left
+
+    def _timed_out(self, request: Request) -> BraveTimeout:
+        """Count a timed out call and return the exception to raise."""
+        self.metrics.increment(TIMEOUTS, endpoint=request.path.split("/", 1)[0])
+        return BraveTimeout(f"Request to {request.path} timed out")
+
+    def _hedge_delay(self, request: Request) -> Optional[float]:
+        """Return how long to wait before hedging an attempt, or None to send it alone, as passthrough ones are."""
+        if self.hedge is None or request.sink is not None:
+            return None
+        delay = self.hedge.delay()
+        if delay is None or (request.timeout is not None and delay >= request.timeout):
+            return None
+        return delay
+
+    @staticmethod
+    def _duplicate(request: Request) -> Request:
+        """Return a copy of a request, with its own headers, to send as a hedge."""
+        return dataclasses.replace(request, headers=dict(request.headers))
+
+    def _count_hedge(self, won: bool) -> None:
+        """Count a hedged request, and whether the duplicate answered first."""
+        self.hedge.count(won)
+        self.metrics.increment(HEDGED_REQUESTS, won=str(won).lower())
+
+    def _get(
+        self,
+        params: Optional[Dict] = None,
+        endpoint: Optional[str] = None,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+        sink: Optional[Any] = None,
+        budget: Optional[str] = None,
+    ) -> Any:
         """
         GET request method placeholder.
 
@@ -45,6 +317,208 @@ class BraveAPIClient:
         """
         pass
 
+    def _call(
+        self,
+        endpoint: str,
+        rules: Mapping[str, Normalizer],
+        model: Type["BaseModel"],
+        raw: Union[bool, str],
+        params: Dict,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Call:
+        """
+        Sans-I/O core of every API call.
+
+        Validates the parameters, serves the request from the cache when possible, otherwise yields the request for
+        the driver to send, with the `options` to send it with, and parses the response it sends back. With a `sink`
+        option, the body goes to the sink instead and a `Passthrough` is returned.
+        """
+        options = options or {}
+        if isinstance(raw, str) and raw not in RAW_BODIES:
+            raise BraveError(f"Invalid raw mode {raw!r}, expected a boolean or one of {list(RAW_BODIES)}")
+        params = normalize_params(params, rules)
+        key = ResponseCache.key(endpoint, params) if self.cache is not None else None
+        body = self.cache.get(key) if key is not None else None
+        if key is not None:
+            self.metrics.increment(CACHE_HITS if body is not None else CACHE_MISSES, endpoint=endpoint)
+        if body is None and self.quota is not None:
+            mode = self.quota.mode(options.get("tag"))
+            body = self._over_budget(key, mode)
+            options = dict(options, budget=mode)  # so the ledger does not compute it again
+        if body is None:
+            response = yield endpoint, params, options
+            if isinstance(response, Passthrough):
+                return response
+            body = self._check_response(response)
+            if key is not None:
+                self.cache.set(key, body)
+        if options.get("sink") is not None:  # a cached body, or a response of a transport that does not stream
+            writer(options["sink"])(body)
+            return Passthrough(200, {"Content-Type": "application/json", "Content-Length": str(len(body))}, len(body))
+        if raw in RAW_BODIES:
+            return body if raw == "bytes" else memoryview(body)
+        if self.parse_executor is not None:
+            start = time.perf_counter()
+            result = yield Parse(body, model, raw)
+        elif not self.metrics.enabled and self.pool is None:
+            return self._parse_body(body, model, raw)
+        else:
+            start = time.perf_counter()
+            result = self._parse_body(body, model, raw)
+        if self.pool is not None and not raw:
+            result = self.pool.share(result)
+        if not self.metrics.enabled:
+            return result
+        self.metrics.observe(
+            JSON_DECODE_SECONDS if raw else PARSE_SECONDS, time.perf_counter() - start, endpoint=endpoint
+        )
+        return result
+
+    def _over_budget(self, key: Any, mode: str) -> Optional[bytes]:
+        """
+        Return an expired cached body to serve instead of sending a request once past the soft budget, or None to
+        send it; past the hard budget, raise `BraveQuotaExceeded` when nothing is cached.
+        """
+        if mode == NORMAL:
+            return None
+        body = self.cache.get(key, stale=True) if key is not None else None
+        if body is None and mode == CACHE_ONLY:
+            self.quota.metrics.increment(REJECTED_REQUESTS, reason="quota")
+            raise BraveQuotaExceeded("The request budget is used up and the response is not cached")
+        return body
+
+    @staticmethod
+    def _check_response(response: Any) -> bytes:
+        """Raise a `BraveError` for unsuccessful responses and return the body."""
+        if response.status_code != 200:
+            raise BraveError(f"API Error: {response.status_code} - {response.text}")
+        return response.content
+
+    @staticmethod
+    def _parse_body(body: bytes, model: Type["BaseModel"], raw: bool) -> Union["BaseModel", Dict]:
+        """Parse a response body into `model`, or decode it to a dictionary when `raw` is set."""
+        if raw:
+            return json.loads(body)
+        return model.model_validate_json(body)
+
+    def _run(self, call: Call) -> Any:
+        """Drive a sans-I/O call to completion with the synchronous transport."""
+        try:
+            effect = next(call)
+            while True:
+                if isinstance(effect, Parse):
+                    effect = call.send(self._parse_body(effect.body, effect.model, effect.raw))
+                else:
+                    endpoint, params, options = effect
+                    effect = call.send(self._get(params=params, endpoint=endpoint, **options))
+        except StopIteration as stop:
+            return stop.value
+
+    async def _arun(self, call: Call) -> Any:
+        """Drive a sans-I/O call to completion with the asynchronous transport."""
+        try:
+            effect = next(call)
+            while True:
+                if isinstance(effect, Parse):
+                    effect = call.send(await self._aparse(effect))
+                else:
+                    endpoint, params, options = effect
+                    effect = call.send(await self._get(params=params, endpoint=endpoint, **options))
+        except StopIteration as stop:
+            return stop.value
+
+    async def _aparse(self, parse: Parse) -> Any:
+        """
+        Parse a body in the parse executor: wholly in a thread pool; in any other pool, such as a process pool, only
+        raw bodies are decoded there, and models are validated here (see `brave.parsing`).
+        """
+        import asyncio
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        from brave.parsing import decode
+
+        loop = asyncio.get_running_loop()
+        if isinstance(self.parse_executor, ThreadPoolExecutor):
+            return await loop.run_in_executor(
+                self.parse_executor, self._parse_body, parse.body, parse.model, parse.raw
+            )
+        if parse.raw:
+            return await loop.run_in_executor(self.parse_executor, decode, parse.body)
+        return self._parse_body(parse.body, parse.model, parse.raw)
+
+    def _search_call(
+        self,
+        q: str,
+        country: Optional[str] = None,
+        search_lang: Optional[str] = None,
+        ui_lang: Optional[str] = None,
+        count: Optional[int] = 20,
+        offset: Optional[int] = 0,
+        safesearch: Optional[str] = "moderate",
+        freshness: Optional[str] = None,
+        text_decorations: Optional[bool] = True,
+        spellcheck: Optional[bool] = True,
+        result_filter: Optional[str] = None,
+        goggles_id: Optional[str] = None,
+        units: Optional[str] = None,
+        extra_snippets: Optional[bool] = False,
+        raw: Union[bool, str] = False,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+        sink: Optional[Any] = None,
+    ) -> Call:
+        """Build the sans-I/O call for a web search; see `search` for the parameters."""
+        from brave.types import WebSearchApiResponse
+
+        params = {
+            "q": q,
+            "country": country,
+            "search_lang": search_lang,
+            "ui_lang": ui_lang,
+            "count": count,
+            "offset": offset,
+            "safesearch": safesearch,
+            "freshness": freshness,
+            "text_decorations": text_decorations,
+            "spellcheck": spellcheck,
+            "result_filter": result_filter,
+            "goggles_id": goggles_id,
+            "units": units,
+            "extra_snippets": extra_snippets,
+        }
+        options = {"timeout": timeout, "priority": priority, "tag": tag, "sink": sink}
+        return self._call(self.endpoint, WEB_SEARCH_PARAMS, WebSearchApiResponse, raw, params, options)
+
+    def _image_call(
+        self,
+        q: str,
+        country: Optional[str] = None,
+        search_lang: Optional[str] = None,
+        count: Optional[int] = 20,
+        safesearch: Optional[str] = "moderate",
+        spellcheck: Optional[bool] = True,
+        raw: Union[bool, str] = False,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+        sink: Optional[Any] = None,
+    ) -> Call:
+        """Build the sans-I/O call for an image search; see `image` for the parameters."""
+        from brave.types import ImageSearchApiResponse
+
+        params = {
+            "q": q,
+            "country": country,
+            "search_lang": search_lang,
+            "count": count,
+            "safesearch": safesearch,
+            "spellcheck": spellcheck,
+        }
+        options = {"timeout": timeout, "priority": priority, "tag": tag, "sink": sink}
+        return self._call(self.image_endpoint, IMAGE_SEARCH_PARAMS, ImageSearchApiResponse, raw, params, options)
+
     def search(
         self,
         q: str,
@@ -61,8 +535,12 @@ class BraveAPIClient:
         goggles_id: Optional[str] = None,
         units: Optional[str] = None,
         extra_snippets: Optional[bool] = False,
-        raw: Optional[bool] = False,
-    ) -> WebSearchApiResponse:
+        raw: Union[bool, str] = False,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+        sink: Optional[Any] = None,
+    ) -> "WebSearchApiResponse":
         """
         Perform a search using the Brave Search API.
 
@@ -96,43 +574,45 @@ class BraveAPIClient:
             Measurement units (metric or imperial).
         extra_snippets: bool
             Enable extra alternate snippets (default: False).
+        raw: Union[bool, str]
+            Return the decoded JSON instead of a validated model, or with "bytes" or "memoryview" the decompressed
+            body itself, without decoding it (default: False).
+        timeout: float
+            Time limit of the call in seconds, retries included; raises `BraveTimeout` (default: the client timeout).
+        priority: str
+            Priority class of the call in the client `Scheduler`, e.g. "interactive" or "batch" (default: the
+            scheduler default).
+        tag: str
+            Caller tag the call is accounted under in the client `QuotaLedger`, e.g. the feature making it (default:
+            none).
+        sink: Any
+            A socket, binary file or callable to copy the body to as it arrives, still compressed, instead of parsing
+            it; the call then returns a `Passthrough` whose headers give the `Content-Encoding`. Such responses are
+            not cached, and cached ones are written decompressed (default: none).
         """
-
-        # Parameter validation and query parameter construction
-        if not q or len(q) > 400 or len(q.split()) > 50:
-            raise ValueError("Invalid query parameter 'q'")
-
-        params = {
-            "q": q,
-            "country": country,
-            "search_lang": search_lang,
-            "ui_lang": ui_lang,
-            "count": min(count, 20),
-            "offset": min(offset, 9),
-            "safesearch": safesearch,
-            "freshness": freshness,
-            "text_decorations": text_decorations,
-            "spellcheck": spellcheck,
-            "result_filter": result_filter,
-            "goggles_id": goggles_id,
-            "units": units,
-            "extra_snippets": extra_snippets,
-        }
-
-        # Filter out None values
-        params = {k: v for k, v in params.items() if v is not None}
-
-        # API request and response handling
-        response = self._get(params=params)  # _make_request to be implemented based on sync/async client
-
-        # Error handling and data parsing
-        if response.status_code != 200:
-            # Handle errors (e.g., log them, raise exceptions)
-            raise BraveError(f"API Error: {response.status_code} - {response.text}")
-
-        if raw:
-            return response.json()
-        return WebSearchApiResponse.model_validate(response.json())
+        return self._run(
+            self._search_call(
+                q=q,
+                country=country,
+                search_lang=search_lang,
+                ui_lang=ui_lang,
+                count=count,
+                offset=offset,
+                safesearch=safesearch,
+                freshness=freshness,
+                text_decorations=text_decorations,
+                spellcheck=spellcheck,
+                result_filter=result_filter,
+                goggles_id=goggles_id,
+                units=units,
+                extra_snippets=extra_snippets,
+                raw=raw,
+                timeout=timeout,
+                priority=priority,
+                tag=tag,
+                sink=sink,
+            )
+        )
 
     def image(
         self,
@@ -142,7 +622,12 @@ class BraveAPIClient:
         count: Optional[int] = 20,
         safesearch: Optional[str] = "moderate",
         spellcheck: Optional[bool] = True,
-    ) -> ImageSearchApiResponse:
+        raw: Union[bool, str] = False,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+        sink: Optional[Any] = None,
+    ) -> "ImageSearchApiResponse":
         """
         Perform an image search using the Brave Search API.
 
@@ -157,28 +642,37 @@ class BraveAPIClient:
         count: int
             The number of results to return (default: 20, max: 20).
         safesearch: str
-            Filter for adult content ('off', 'moderate', 'strict').
+            Filter for adult content ('off', 'strict'; 'moderate' is sent as 'strict').
         spellcheck: bool
             Spellcheck the query (default: True).
+        raw: Union[bool, str]
+            Return the decoded JSON instead of a validated model, or with "bytes" or "memoryview" the decompressed
+            body itself, without decoding it (default: False).
+        timeout: float
+            Time limit of the call in seconds, retries included; raises `BraveTimeout` (default: the client timeout).
+        priority: str
+            Priority class of the call in the client `Scheduler`, e.g. "interactive" or "batch" (default: the
+            scheduler default).
+        tag: str
+            Caller tag the call is accounted under in the client `QuotaLedger`, e.g. the feature making it (default:
+            none).
+        sink: Any
+            A socket, binary file or callable to copy the body to as it arrives, still compressed, instead of parsing
+            it; the call then returns a `Passthrough` whose headers give the `Content-Encoding`. Such responses are
+            not cached, and cached ones are written decompressed (default: none).
         """
-
-        # Parameter validation and query parameter construction
-        if not q or len(q) > 400 or len(q.split()) > 50:
-            raise ValueError("Invalid query parameter 'q'")
-
-        params = {
-            "q": q,
-            "country": country,
-            "search_lang": search_lang,
-            "count": min(count, 20),
-            "safesearch": safesearch,
-            "spellcheck": spellcheck,
-        }
-
-        # Filter out None values
-        params = {k: v for k, v in params.items() if v is not None}
-
-        # API request and response handling
-        response = self._get(params=params)
-
-        return ImageSearchApiResponse.model_validate(response.json())
+        return self._run(
+            self._image_call(
+                q=q,
+                country=country,
+                search_lang=search_lang,
+                count=count,
+                safesearch=safesearch,
+                spellcheck=spellcheck,
+                raw=raw,
+                timeout=timeout,
+                priority=priority,
+                tag=tag,
+                sink=sink,
+            )
+        )
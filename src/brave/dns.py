@@ -0,0 +1,112 @@
+"""
+In-process cache of DNS resolutions.
+
+Every new connection resolves the API host again: `requests` (urllib3) and `httpx`, synchronous or asynchronous, all
+go through `socket.getaddrinfo`, which asks the system resolver each time. A `DNSCache` installed with `install()`
+wraps `socket.getaddrinfo` for the whole process and answers repeated lookups from memory for `ttl` seconds. When a
+lookup fails after its entry expired, the expired addresses are served instead of failing, for up to `stale`
+seconds, so a resolver outage does not take the workers down with it.
+
+`getaddrinfo` does not report the TTLs of the records, so entries live for a fixed `ttl`: keep it below the TTL of
+the records, and pair it with the `max_age` of the transports so pooled connections follow address changes.
+"""
+import socket
+import threading
+import time
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from brave.exceptions import BraveError
+
+
+class DNSCache:
+    """
+    Thread-safe cache of `socket.getaddrinfo` results.
+
+    Parameters:
+    -----------
+    ttl: float
+        Seconds a resolution is served from the cache (default: 60).
+    stale: float
+        Seconds past its TTL an expired resolution is served when the resolver fails (default: 3600; 0 to never).
+    hosts: Sequence[str]
+        Host names to cache, e.g. `["api.search.brave.com"]` (default: every host).
+    """
+
+    def __init__(self, ttl: float = 60.0, stale: float = 3600.0, hosts: Optional[Sequence[str]] = None) -> None:
+        self.ttl = ttl
+        self.stale = stale
+        self.hosts = frozenset(host.lower() for host in hosts) if hosts is not None else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Hashable, Tuple[float, List[Any]]] = {}
+        self._lock = threading.Lock()
+        self._original: Optional[Callable[..., List[Any]]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __enter__(self) -> "DNSCache":
+        return self.install()
+
+    def __exit__(self, *exc_info) -> None:
+        self.uninstall()
+
+    def install(self) -> "DNSCache":
+        """Answer the `socket.getaddrinfo` calls of the process from the cache, and return the cache."""
+        if self._original is not None:
+            return self
+        if isinstance(getattr(socket.getaddrinfo, "__self__", None), DNSCache):
+            raise BraveError("Another DNSCache is already installed")
+        self._original = socket.getaddrinfo
+        socket.getaddrinfo = self.getaddrinfo
+        return self
+
+    def uninstall(self) -> None:
+        """Restore the `socket.getaddrinfo` the cache replaced."""
+        if self._original is None:
+            return
+        if socket.getaddrinfo == self.getaddrinfo:
+            socket.getaddrinfo = self._original
+        self._original = None
+
+    def clear(self) -> None:
+        """Forget every resolution."""
+        with self._lock:
+            self._entries.clear()
+
+    def getaddrinfo(
+        self, host: Any, port: Any, family: int = 0, type: int = 0, proto: int = 0, flags: int = 0  # noqa: A002
+    ) -> List[Any]:
+        """Drop-in replacement of `socket.getaddrinfo`, answering from the cache."""
+        resolve = self._original or socket.getaddrinfo
+        if not isinstance(host, str) or (self.hosts is not None and host.lower() not in self.hosts):
+            return resolve(host, port, family, type, proto, flags)
+        key = (host.lower(), port, family, type, proto, flags)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now < entry[0]:
+            self.hits += 1
+            return list(entry[1])
+        self.misses += 1
+        try:
+            addresses = resolve(host, port, family, type, proto, flags)
+        except OSError:
+            if entry is not None and now < entry[0] + self.stale:
+                return list(entry[1])
+            raise
+        with self._lock:
+            self._entries[key] = (now + self.ttl, addresses)
+        return list(addresses)
+
+    def resolve(self, host: str, port: int = 443) -> List[str]:
+        """Resolve a host ahead of its first connection, e.g. at startup, and return its addresses."""
+        infos = self.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        return list(dict.fromkeys(info[4][0] for info in infos))
@@ -0,0 +1,125 @@
+"""
+Content encodings of the API responses.
+
+The clients offer the API the encodings that both their transport and this module can decode, in the
+`Accept-Encoding` header of each request, most preferred first:
+
+- `zstd`: decompresses several times faster than gzip, to similar sizes.
+- `br` (brotli): the smallest bodies on the wire, decompressed about as fast as gzip.
+- `gzip`, always.
+
+The HTTP libraries decode them with different packages: `requests` (urllib3 2) with `backports.zstd` or the
+`compression.zstd` module of Python 3.14, `httpx` with `zstandard`, and both with `brotli` or `brotlicffi`; each
+transport reports what its library decodes (`encodings`), and this module uses whichever of them is installed.
+`pip install brave-search[compression]` installs the packages `httpx` and this module need. With
+`extra_snippets=True` responses are large enough for both the bytes on the wire and the decompression time to
+matter: the `encoding.*` benchmarks compare the encodings on payloads built from the recorded responses.
+
+With metrics enabled, transports read bodies undecoded and decompress them with `decompress`, to report the time it
+takes (`decompress_seconds`) and the compression ratio (`compression_ratio`).
+"""
+import functools
+import gzip
+import importlib
+import zlib
+
+from typing import Any
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from brave.exceptions import BraveError
+
+
+ZSTD = "zstd"
+BROTLI = "br"
+GZIP = "gzip"
+DEFLATE = "deflate"
+IDENTITY = "identity"
+
+# Encodings offered, most preferred first.
+PREFERENCE = (ZSTD, BROTLI, GZIP)
+
+# Compression levels typical of servers compressing responses on the fly.
+LEVELS = {ZSTD: 3, BROTLI: 5, GZIP: 6, DEFLATE: 6}
+
+
+@functools.lru_cache(maxsize=None)
+def _module(encoding: str) -> Any:
+    """Return the module implementing an encoding, or None if it is not installed."""
+    if encoding in (GZIP, DEFLATE):
+        return zlib
+    names = {ZSTD: ("compression.zstd", "backports.zstd", "zstandard"), BROTLI: ("brotli", "brotlicffi")}
+    for name in names.get(encoding, ()):
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            continue
+    return None
+
+
+def available(encodings: Sequence[str] = PREFERENCE) -> Tuple[str, ...]:
+    """Return the encodings, among `encodings`, whose decoder is installed, in the same order."""
+    return tuple(encoding for encoding in encodings if _module(encoding) is not None)
+
+
+def accept_encoding(encodings: Optional[Sequence[str]] = None, supported: Optional[Sequence[str]] = None) -> str:
+    """
+    Return the `Accept-Encoding` header offering the encodings, among `encodings` (default: `PREFERENCE`), that are
+    installed and, if given, `supported` by the HTTP library; raise `BraveError` if any of those asked for explicitly
+    cannot be decoded.
+    """
+    offered = [
+        encoding
+        for encoding in (encodings if encodings is not None else PREFERENCE)
+        if _module(encoding) is not None and (supported is None or encoding in supported)
+    ]
+    if encodings is not None and len(offered) < len(encodings):
+        missing = [encoding for encoding in encodings if encoding not in offered]
+        raise BraveError(f"Cannot decode {missing} with this transport; offer some of {offered or [GZIP]}")
+    return ", ".join(offered) or IDENTITY
+
+
+def split(header: str) -> Tuple[str, ...]:
+    """Return the encodings listed in an `Accept-Encoding` header, without their weights."""
+    encodings = (encoding.split(";", 1)[0].strip().lower() for encoding in header.split(","))
+    return tuple(encoding for encoding in encodings if encoding)
+
+
+def _codings(encoding: Optional[str]) -> Tuple[str, ...]:
+    """Return the codings of a `Content-Encoding` header, in the order they were applied."""
+    codings = (coding.strip().lower() for coding in (encoding or "").split(","))
+    return tuple(coding for coding in codings if coding and coding != IDENTITY)
+
+
+def decompress(body: bytes, encoding: Optional[str]) -> bytes:
+    """Return a body decoded from its `Content-Encoding`, raising `BraveError` for encodings that cannot be decoded."""
+    for coding in reversed(_codings(encoding)):
+        module = _module(coding)
+        if module is None:
+            raise BraveError(f"Cannot decode a {coding!r} encoded body")
+        if coding == GZIP:
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        elif coding == DEFLATE:
+            body = zlib.decompress(body)
+        elif coding == ZSTD and module.__name__ == "zstandard":
+            # Streamed responses do not record their size in the frame, which `ZstdDecompressor.decompress` needs.
+            body = module.ZstdDecompressor().decompressobj().decompress(body)
+        else:
+            body = module.decompress(body)
+    return body
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Return a body compressed with an encoding, at the level of `LEVELS` by default."""
+    module = _module(encoding)
+    if module is None:
+        raise BraveError(f"Cannot encode a body with {encoding!r}")
+    level = LEVELS.get(encoding) if level is None else level
+    if encoding == GZIP:
+        return gzip.compress(body, level, mtime=0)
+    if encoding == DEFLATE:
+        return zlib.compress(body, level)
+    if encoding == ZSTD:
+        return module.compress(body, level=level)
+    return module.compress(body, quality=level)
@@ -5,3 +5,61 @@ class BraveError(Exception):
     """Base exception class for all Brave Search API errors."""
 
     pass
+
+
+class BraveValidationError(BraveError, ValueError):
+    """Raised when a request parameter is rejected locally, before any network I/O."""
+
+    pass
+
+
+class BraveHTTPError(BraveError):
+    """Raised for an unsuccessful HTTP response that was not produced by `requests` or `httpx`."""
+
+    def __init__(self, message: str, status_code: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class BraveCassetteMiss(BraveError):
+    """Raised in replay mode when a request has no recorded response."""
+
+    pass
+
+
+class BraveKeysExhausted(BraveHTTPError):
+    """
+    Raised by a `KeyPool` when every API key is out of rotation.
+
+    It carries status code 429 so the clients retry it like a rate limited response.
+    """
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message, status_code=429)
+        self.retry_after = retry_after
+
+
+class BraveTimeout(BraveError, TimeoutError):
+    """Raised when a call does not complete within its timeout, retries included."""
+
+    pass
+
+
+class BraveCircuitOpen(BraveError):
+    """Raised without sending the request while a circuit breaker is open."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class BraveOverloaded(BraveError):
+    """Raised without sending the request when the adaptive concurrency limit is reached."""
+
+    pass
+
+
+class BraveQuotaExceeded(BraveError):
+    """Raised without sending the request when a hard budget of a `QuotaLedger` is used up."""
+
+    pass
@@ -0,0 +1,301 @@
+"""
+Spatial index over the locations returned by local searches.
+
+`LocationResult.coordinates`, `InfoboxWithLocation.coordinates` and `Query.lat`/`long` are plain lists and strings.
+A `SpatialIndex` gathers the locations of many responses, parsed or raw, into a uniform grid of cells of about
+`cell_km` kilometres, so queries only look at the points of nearby cells:
+
+- `within(lat, lon, radius_km)`: points in a circle, nearest first.
+- `nearest(lat, lon, k)`: the k nearest points, searching rings of cells outwards until no closer point can remain.
+- `bbox(south, west, north, east)`: points in a bounding box.
+- `dedupe(radius_km)`: one point per POI, merging points with the same name within a small radius, e.g. the same
+  business returned by the queries of neighbouring cells of a city grid.
+
+Distances are great-circle (haversine) distances in kilometres, computed for all candidates of a query at once with
+numpy when it is installed (`pip install brave-search[geo]`), and in pure Python otherwise.
+"""
+import functools
+import math
+
+from array import array
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+
+from brave.types.access import get_field
+
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+Cell = Tuple[int, int]
+
+# Below this many candidates, calling into numpy costs more than it saves.
+_VECTOR_MIN = 32
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy() -> Any:
+    """Return the numpy module, or None if it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def distances_km(lat: float, lon: float, lats: Sequence[float], lons: Sequence[float]) -> Sequence[float]:
+    """
+    Return the haversine distances in kilometres from a point to many points.
+
+    Returns a numpy array when numpy is installed, a list otherwise.
+    """
+    numpy = _numpy()
+    if numpy is not None:
+        lat1, lon1 = math.radians(lat), math.radians(lon)
+        lat2 = numpy.radians(numpy.asarray(lats, dtype=float))
+        lon2 = numpy.radians(numpy.asarray(lons, dtype=float))
+        a = numpy.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * numpy.cos(lat2) * numpy.sin((lon2 - lon1) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * numpy.arcsin(numpy.sqrt(numpy.minimum(a, 1.0)))
+    return [haversine_km(lat, lon, other_lat, other_lon) for other_lat, other_lon in zip(lats, lons)]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def locations_of(response: Any) -> Iterator[Tuple[float, float, Any]]:
+    """
+    Yield the latitude, longitude and result of every location of a web search response, parsed or raw: the
+    location results, and the infoboxes with a location.
+    """
+    locations = get_field(response, "locations")
+    infobox = get_field(response, "infobox")
+    infoboxes = (get_field(infobox, "results") or [infobox]) if infobox is not None else []
+    for result in list(get_field(locations, "results") or []) + list(infoboxes):
+        coordinates = get_field(result, "coordinates")
+        if coordinates and len(coordinates) >= 2:
+            yield float(coordinates[0]), float(coordinates[1]), result
+
+
+def query_location(response: Any) -> Optional[Tuple[float, float]]:
+    """Return the latitude and longitude the API located a query at, or None."""
+    query = get_field(response, "query")
+    lat, lon = get_field(query, "lat"), get_field(query, "long")
+    try:
+        return float(lat), float(lon)
+    except (TypeError, ValueError):
+        return None
+
+
+def _name(item: Any) -> str:
+    """Return the normalised name of a location, to tell POIs apart."""
+    return " ".join(str(get_field(item, "title") or "").lower().split())
+
+
+class SpatialIndex:
+    """
+    Uniform grid index of points, each carrying an item such as a `LocationResult`.
+
+    Coordinates are kept in flat arrays, so distance computations run over contiguous memory.
+
+    Parameters:
+    -----------
+    cell_km: float
+        Approximate size of the grid cells in kilometres; about the radius of typical queries (default: 1).
+    """
+
+    def __init__(self, cell_km: float = 1.0) -> None:
+        self.cell = cell_km / KM_PER_DEGREE  # in degrees
+        # Columns tile the 360° of longitude exactly, so that the antimeridian falls on a column boundary.
+        self.columns = max(1, round(360.0 / self.cell))
+        self.width = 360.0 / self.columns  # in degrees
+        self.lats = array("d")
+        self.lons = array("d")
+        self.items: List[Any] = []
+        self._cells: Dict[Cell, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _cell(self, lat: float, lon: float) -> Cell:
+        column = min(int(math.floor((lon + 180.0) / self.width)), self.columns - 1)  # 180° is the last column
+        return int(math.floor(lat / self.cell)), column % self.columns
+
+    def _columns(self, column: int, span: int) -> List[range]:
+        """Return the ranges of columns within `span` columns of a column, wrapped across the antimeridian."""
+        columns = self.columns
+        west, east = column - span, column + span
+        if east - west + 1 >= columns:
+            return [range(columns)]
+        if west < 0:  # the westernmost columns reach past -180°, onto the easternmost ones
+            return [range(east + 1), range(west + columns, columns)]
+        if east >= columns:
+            return [range(west, columns), range(east - columns + 1)]
+        return [range(west, east + 1)]
+
+    def add(self, lat: float, lon: float, item: Any = None) -> int:
+        """Add a point and return its position."""
+        position = len(self.items)
+        self.lats.append(lat)
+        self.lons.append(lon)
+        self.items.append(item)
+        self._cells.setdefault(self._cell(lat, lon), []).append(position)
+        return position
+
+    def add_response(self, response: Any) -> int:
+        """Add every location of a web search response, parsed or raw, and return how many were added."""
+        added = 0
+        for lat, lon, result in locations_of(response):
+            self.add(lat, lon, result)
+            added += 1
+        return added
+
+    @classmethod
+    def from_responses(cls, responses: Iterable[Any], cell_km: float = 1.0) -> "SpatialIndex":
+        """Build an index of the locations of many web search responses."""
+        index = cls(cell_km)
+        for response in responses:
+            index.add_response(response)
+        return index
+
+    def _candidates(self, rows: range, columns: range) -> List[int]:
+        """Return the positions of the points in a range of cells."""
+        cells = self._cells
+        if len(rows) * len(columns) > len(cells):
+            return [
+                position
+                for (row, column), positions in cells.items()
+                if row in rows and column in columns
+                for position in positions
+            ]
+        candidates: List[int] = []
+        for row in rows:
+            for column in columns:
+                candidates.extend(cells.get((row, column), ()))
+        return candidates
+
+    def _measure(self, lat: float, lon: float, positions: List[int]) -> List[Tuple[float, int]]:
+        """Return the distance to every candidate point, with its position."""
+        numpy = _numpy() if len(positions) >= _VECTOR_MIN else None
+        if numpy is not None:
+            index = numpy.fromiter(positions, dtype=numpy.intp, count=len(positions))
+            # Gathered straight from the arrays; the temporary views release their buffers at once.
+            lats = numpy.frombuffer(self.lats, dtype=numpy.float64)[index]
+            lons = numpy.frombuffer(self.lons, dtype=numpy.float64)[index]
+            return list(zip(distances_km(lat, lon, lats, lons).tolist(), positions))
+        lats, lons = self.lats, self.lons
+        return [(haversine_km(lat, lon, lats[i], lons[i]), i) for i in positions]
+
+    def distances(self, lat: float, lon: float) -> Sequence[float]:
+        """Return the distance in kilometres from a point to every point of the index, in insertion order."""
+        return distances_km(lat, lon, self.lats, self.lons)
+
+    def _span(self, lat: float, radius_km: float) -> Tuple[int, int]:
+        """Return how many cells a radius spans, in latitude and in longitude, around a latitude."""
+        degrees = radius_km / KM_PER_DEGREE
+        shrink = math.cos(math.radians(min(89.0, abs(lat) + degrees)))
+        return int(math.ceil(degrees / self.cell)), int(math.ceil(degrees / shrink / self.width))
+
+    def within(self, lat: float, lon: float, radius_km: float) -> List[Tuple[float, Any]]:
+        """Return the distance and item of every point within `radius_km` of a point, nearest first."""
+        row, column = self._cell(lat, lon)
+        rows, columns = self._span(lat, radius_km)
+        rows_range = range(row - rows, row + rows + 1)
+        first, *wrapped = self._columns(column, columns)
+        positions = self._candidates(rows_range, first)
+        for span in wrapped:
+            positions.extend(self._candidates(rows_range, span))
+        found = sorted(found for found in self._measure(lat, lon, positions) if found[0] <= radius_km)
+        return [(distance, self.items[position]) for distance, position in found]
+
+    def _ring(self, row: int, column: int, ring: int) -> Iterator[Cell]:
+        """Yield the cells on the border of the square of cells `ring` cells around a cell."""
+        if ring == 0:
+            yield row, column
+            return
+        for offset in range(-ring, ring + 1):
+            yield row - ring, column + offset
+            yield row + ring, column + offset
+        for offset in range(-ring + 1, ring):
+            yield row + offset, column - ring
+            yield row + offset, column + ring
+
+    def nearest(self, lat: float, lon: float, k: int = 1, max_km: Optional[float] = None) -> List[Tuple[float, Any]]:
+        """Return the distance and item of the `k` points nearest to a point, within `max_km` if set."""
+        if not self.items or k <= 0:
+            return []
+        row, column = self._cell(lat, lon)
+        found: List[Tuple[float, int]] = []
+        visited: Set[Cell] = set()  # wrapped rings can overlap rings searched already
+        seen = ring = 0
+        while True:
+            if 8 * ring > len(self._cells):  # sparse surroundings: measuring every point is cheaper
+                found = sorted(self._measure(lat, lon, list(range(len(self.items)))))[:k]
+                break
+            if 0 <= column - ring and column + ring < self.columns:
+                cells = self._ring(row, column, ring)
+            else:
+                cells = (
+                    (ring_row, ring_column % self.columns) for ring_row, ring_column in self._ring(row, column, ring)
+                )
+            positions = []
+            for cell in cells:
+                if cell not in visited:
+                    visited.add(cell)
+                    positions.extend(self._cells.get(cell, ()))
+            seen += len(positions)
+            found.extend(self._measure(lat, lon, positions))
+            found.sort()
+            del found[k:]
+            # Points outside the rings searched so far are at least this far away, whatever the direction.
+            step = min(self.cell, self.width)
+            reach = ring * step * KM_PER_DEGREE * math.cos(math.radians(min(89.0, abs(lat) + ring * self.cell)))
+            if (len(found) == k and found[-1][0] <= reach) or seen == len(self.items):
+                break
+            if max_km is not None and reach >= max_km:
+                break
+            ring += 1
+        return [
+            (distance, self.items[position]) for distance, position in found if max_km is None or distance <= max_km
+        ]
+
+    def bbox(self, south: float, west: float, north: float, east: float) -> List[Any]:
+        """Return the items of the points in a bounding box (`west` > `east` crosses the antimeridian)."""
+        rows = range(self._cell(south, 0)[0], self._cell(north, 0)[0] + 1)
+        if west <= east:
+            spans = [(west, east)]
+        else:
+            spans = [(west, 180.0), (-180.0, east)]
+        lats, lons, items = self.lats, self.lons, self.items
+        inside = []
+        for low, high in spans:
+            columns = range(self._cell(0, low)[1], self._cell(0, high)[1] + 1)
+            for position in self._candidates(rows, columns):
+                if south <= lats[position] <= north and low <= lons[position] <= high:
+                    inside.append(items[position])
+        return inside
+
+    def dedupe(self, radius_km: float = 0.05, key: Any = _name) -> "SpatialIndex":
+        """
+        Return an index with a single point per POI: points within `radius_km` of an earlier point with the same key
+        (by default the normalised title) are dropped.
+        """
+        unique = SpatialIndex(self.cell * KM_PER_DEGREE)
+        for lat, lon, item in zip(self.lats, self.lons, self.items):
+            name = key(item)
+            if not any(key(other) == name for _, other in unique.within(lat, lon, radius_km)):
+                unique.add(lat, lon, item)
+        return unique
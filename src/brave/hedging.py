@@ -0,0 +1,68 @@
+"""
+Hedged requests: cut tail latency by racing a duplicate request against a slow one.
+
+When an attempt has not answered after a high percentile of the latencies observed so far, a `Hedge` lets the client
+send a duplicate and use whichever response arrives first. Only the slowest few percent of requests are duplicated,
+so the extra load and quota stay small while the latency of those requests drops to that of a typical one.
+"""
+import bisect
+import threading
+
+from collections import deque
+from typing import Deque
+from typing import List
+from typing import Optional
+
+from brave.exceptions import BraveError
+
+
+class Hedge:
+    """
+    Hedging policy and the latency window it is based on.
+
+    Parameters:
+    -----------
+    percentile: float
+        Send a duplicate once an attempt has been pending for this percentile of the observed latencies (default: 95).
+    min_samples: int
+        Latencies to observe before hedging starts (default: 20).
+    window: int
+        Number of most recent latencies the percentile is computed from (default: 500).
+    min_delay: float
+        Never hedge sooner than this many seconds (default: 0).
+    """
+
+    def __init__(self, percentile: float = 95.0, min_samples: int = 20, window: int = 500, min_delay: float = 0.0):
+        if not 0 < percentile < 100:
+            raise BraveError(f"The hedging percentile must be between 0 and 100, got {percentile}")
+        self.percentile = percentile
+        self.min_samples = max(1, min_samples)
+        self.min_delay = min_delay
+        self._lock = threading.Lock()
+        self._recent: Deque[float] = deque(maxlen=window)
+        self._sorted: List[float] = []
+        self.hedged = 0
+        self.won = 0
+
+    def record(self, seconds: float) -> None:
+        """Record the latency of a completed attempt."""
+        with self._lock:
+            if len(self._recent) == self._recent.maxlen:
+                oldest = self._recent[0]
+                del self._sorted[bisect.bisect_left(self._sorted, oldest)]
+            self._recent.append(seconds)
+            bisect.insort(self._sorted, seconds)
+
+    def delay(self) -> Optional[float]:
+        """Return how long to wait for an attempt before hedging it, or None until enough latencies are known."""
+        with self._lock:
+            if len(self._sorted) < self.min_samples:
+                return None
+            index = min(len(self._sorted) - 1, int(len(self._sorted) * self.percentile / 100))
+            return max(self._sorted[index], self.min_delay)
+
+    def count(self, won: bool) -> None:
+        """Count a duplicate request, and whether it answered first."""
+        with self._lock:
+            self.hedged += 1
+            self.won += won
@@ -0,0 +1,223 @@
+"""
+Spread requests across several Brave Search API subscription keys.
+
+A `KeyPool` is transport middleware that sets the `X-Subscription-Token` of every HTTP attempt to one of its keys,
+chosen by smooth weighted round-robin or by the fewest requests in flight per unit of weight. It reads the rate limit
+headers of every response and skips a key while one of its rate limit windows is used up, and it takes keys answered
+with a 401 or 429 out of rotation until their reset.
+
+The Brave API reports one value per rate limit window, per second first and per month second, e.g.
+`X-RateLimit-Remaining: 0, 14999` and `X-RateLimit-Reset: 1, 2591999` (seconds until each window resets).
+
+A pool is safe to share between threads, and between the tasks of an event loop: its lock is never held across I/O.
+"""
+import logging
+import threading
+import time
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from brave.exceptions import BraveError
+from brave.exceptions import BraveKeysExhausted
+from brave.transport import Middleware
+from brave.transport import Request
+
+
+logger = logging.getLogger(__name__)
+
+ROUND_ROBIN = "round_robin"
+LEAST_LOADED = "least_loaded"
+
+TOKEN_HEADER = "X-Subscription-Token"
+
+
+def _header(headers: Any, name: str) -> Optional[str]:
+    """Return a response header by case-insensitive name, whatever the type of the headers mapping."""
+    value = headers.get(name)
+    if value is not None:
+        return value
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _windows(value: Optional[str]) -> Tuple[float, ...]:
+    """Parse a comma separated rate limit header, e.g. "1, 15000"; malformed values are ignored."""
+    if not value:
+        return ()
+    try:
+        return tuple(float(part) for part in value.split(","))
+    except ValueError:
+        return ()
+
+
+class KeyState:
+    """The rate limit state of one key in a `KeyPool`."""
+
+    def __init__(self, key: str, weight: float = 1.0) -> None:
+        if weight <= 0:
+            raise BraveError(f"Key weights must be positive, got {weight}")
+        self.key = key
+        self.weight = weight
+        self.in_flight = 0
+        self.requests = 0
+        self.remaining: Tuple[float, ...] = ()  # per window, as last reported
+        self.resets_at: Tuple[float, ...] = ()  # monotonic deadline of each window
+        self.disabled_until = 0.0
+        self.current_weight = 0.0  # smooth weighted round-robin state
+
+    def available_at(self, now: float) -> float:
+        """Return when the key can be used again: `now` if it is usable now."""
+        available = max(now, self.disabled_until)
+        for remaining, reset in zip(self.remaining, self.resets_at):
+            if remaining <= 0 and reset > available:
+                available = reset
+        return available
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        """Return the state of the key, with the key itself masked."""
+        return {
+            "key": self.key[:4] + "...",
+            "weight": self.weight,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "remaining": list(self.remaining),
+            "available_in": self.available_at(now) - now,
+        }
+
+
+class KeyPool(Middleware):
+    """
+    Load balancer over several API keys, used as transport middleware.
+
+    Pass it, or a list of keys, as the `api_key` of a client; the client puts it first in its transport's middleware.
+
+    Parameters:
+    -----------
+    keys: Sequence[str] or Mapping[str, float]
+        The API keys, optionally mapped to their weight, e.g. the relative size of their plans (default weight: 1).
+    strategy: str
+        "round_robin" for smooth weighted round-robin, or "least_loaded" for the key with the fewest requests in
+        flight per unit of weight (default: "round_robin").
+    unauthorized_cooldown: float
+        Seconds a key answered with a 401 stays out of rotation (default: 3600).
+    rate_limited_cooldown: float
+        Seconds a key answered with a 429 stays out of rotation when the response has no reset header (default: 1).
+    """
+
+    def __init__(
+        self,
+        keys: Union[Sequence[str], Mapping[str, float]],
+        strategy: str = ROUND_ROBIN,
+        unauthorized_cooldown: float = 3600.0,
+        rate_limited_cooldown: float = 1.0,
+    ) -> None:
+        if strategy not in (ROUND_ROBIN, LEAST_LOADED):
+            raise BraveError(f"Invalid key pool strategy: {strategy!r}")
+        weights = dict(keys) if isinstance(keys, Mapping) else dict.fromkeys(keys, 1.0)
+        if not weights:
+            raise BraveError("A KeyPool needs at least one API key")
+        self.states = [KeyState(key, weight) for key, weight in weights.items()]
+        self.strategy = strategy
+        self.unauthorized_cooldown = unauthorized_cooldown
+        self.rate_limited_cooldown = rate_limited_cooldown
+        self._lock = threading.Lock()
+        self._leases: Dict[int, KeyState] = {}
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    @property
+    def keys(self) -> List[str]:
+        """The keys of the pool."""
+        return [state.key for state in self.states]
+
+    def _select(self, now: float) -> KeyState:
+        """Pick the key for the next request; must be called with the lock held."""
+        usable = [state for state in self.states if state.available_at(now) <= now]
+        if not usable:
+            retry_after = min(state.available_at(now) for state in self.states) - now
+            raise BraveKeysExhausted(f"All {len(self.states)} API keys are rate limited", retry_after=retry_after)
+        if self.strategy == LEAST_LOADED:
+            return min(usable, key=lambda state: (state.in_flight / state.weight, state.requests / state.weight))
+        total = 0.0
+        for state in usable:
+            state.current_weight += state.weight
+            total += state.weight
+        chosen = max(usable, key=lambda state: state.current_weight)
+        chosen.current_weight -= total
+        return chosen
+
+    def acquire(self) -> str:
+        """Lease a key for one request; every lease must be returned with `release`."""
+        return self._acquire().key
+
+    def _acquire(self) -> KeyState:
+        with self._lock:
+            state = self._select(time.monotonic())
+            state.in_flight += 1
+            state.requests += 1
+            return state
+
+    def release(self, key: str, status_code: Optional[int] = None, headers: Optional[Any] = None) -> None:
+        """Return a leased key, updating its state from the response status and headers, if any."""
+        for state in self.states:
+            if state.key == key:
+                self._release(state, status_code, headers)
+                return
+        raise BraveError("Unknown API key")
+
+    def _release(self, state: KeyState, status_code: Optional[int], headers: Optional[Any]) -> None:
+        now = time.monotonic()
+        remaining = _windows(_header(headers, "X-RateLimit-Remaining")) if headers is not None else ()
+        resets = _windows(_header(headers, "X-RateLimit-Reset")) if headers is not None else ()
+        with self._lock:
+            state.in_flight -= 1
+            if remaining and len(remaining) == len(resets):
+                state.remaining = remaining
+                state.resets_at = tuple(now + reset for reset in resets)
+            if status_code == 401:
+                state.disabled_until = now + self.unauthorized_cooldown
+                logger.warning("API key %s... was rejected with a 401, out of rotation", state.key[:4])
+            elif status_code == 429:
+                retry_after = _windows(_header(headers, "Retry-After")) if headers is not None else ()
+                cooldown = retry_after[0] if retry_after else self.rate_limited_cooldown
+                state.disabled_until = max(state.available_at(now), now + cooldown)
+
+    def before_request(self, request: Request) -> None:
+        """Lease a key and set it as the subscription token of the request."""
+        state = self._acquire()
+        with self._lock:
+            self._leases[id(request)] = state
+        request.headers[TOKEN_HEADER] = state.key
+        return None
+
+    def after_response(self, request: Request, response: Any) -> Any:
+        """Return the key of the request with the rate limit state reported by the response."""
+        with self._lock:
+            state = self._leases.pop(id(request), None)
+        if state is not None:
+            self._release(state, response.status_code, response.headers)
+        return response
+
+    def on_error(self, request: Request, exception: BaseException) -> None:
+        """Return the key of a request that failed without a response."""
+        with self._lock:
+            state = self._leases.pop(id(request), None)
+        if state is not None:
+            self._release(state, None, None)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return the state of every key, with the keys masked."""
+        now = time.monotonic()
+        with self._lock:
+            return [state.snapshot(now) for state in self.states]
@@ -0,0 +1,325 @@
+"""
+Instrumentation hooks for the Brave Search API clients.
+
+Clients and transports report to a `Metrics` sink through three calls: `observe` for distributions (durations in
+seconds, sizes in bytes), `increment` for counters and `gauge` for current values. The default sink does nothing and
+is skipped on the hot path; `InMemoryMetrics` aggregates histograms in process, and `PrometheusMetrics` and
+`OpenTelemetryMetrics` export to the respective libraries, which are optional dependencies.
+
+Reported metrics, tagged with the `endpoint` where it applies:
+
+- `request_seconds`: duration of one HTTP attempt, from sending the request to reading the whole body.
+- `connect_seconds`: DNS resolution, TCP connect and TLS handshake of a new connection (httpx transports only).
+- `ttfb_seconds`: time to the first byte of the response headers.
+- `download_seconds`: time spent reading the response body.
+- `parse_seconds`: JSON decoding and model validation (`model_validate_json` does both in a single pass).
+- `json_decode_seconds`: JSON decoding alone, for raw responses.
+- `response_bytes`: size of the decompressed response body.
+- `response_compressed_bytes`: size of the response body on the wire.
+- `decompress_seconds`: decompression of the response body, tagged with its `encoding`.
+- `compression_ratio`: decompressed size over size on the wire of an encoded body, tagged with its `encoding`.
+- `requests`: HTTP attempts, tagged with `status`.
+- `retries`: retried attempts.
+- `timeouts`: calls that ran out of time.
+- `hedged_requests`: duplicate requests sent by hedging, tagged with `won` when the duplicate answered first.
+- `rejected_requests`: attempts refused without network I/O, tagged with `reason` ("circuit_open", "overloaded" or
+  "quota").
+- `circuit_state` (gauge): state of a circuit breaker, 0 closed, 1 half-open and 2 open.
+- `concurrency_limit` and `in_flight` (gauges): the adaptive concurrency limit and the attempts it currently admits.
+- `queue_wait_seconds`: time a request waited in the scheduler queue, tagged with `priority`.
+- `rate_limit_wait_seconds`: the part of that wait spent at the head of the queue on the rate limit.
+- `queue_depth` (gauge): requests waiting in the scheduler queue, tagged with `priority`.
+- `quota_used` (gauge): requests used this month according to a `QuotaLedger`.
+- `cache_hits` and `cache_misses`: `ResponseCache` lookups.
+- `store_bytes` (gauge): compressed bytes of the cold tier of a `ResponseStore`, tagged with `tier`.
+"""
+import math
+import threading
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from brave.exceptions import BraveError
+
+
+REQUEST_SECONDS = "request_seconds"
+CONNECT_SECONDS = "connect_seconds"
+TTFB_SECONDS = "ttfb_seconds"
+DOWNLOAD_SECONDS = "download_seconds"
+PARSE_SECONDS = "parse_seconds"
+JSON_DECODE_SECONDS = "json_decode_seconds"
+RESPONSE_BYTES = "response_bytes"
+RESPONSE_COMPRESSED_BYTES = "response_compressed_bytes"
+DECOMPRESS_SECONDS = "decompress_seconds"
+COMPRESSION_RATIO = "compression_ratio"
+REQUESTS = "requests"
+RETRIES = "retries"
+TIMEOUTS = "timeouts"
+HEDGED_REQUESTS = "hedged_requests"
+REJECTED_REQUESTS = "rejected_requests"
+CIRCUIT_STATE = "circuit_state"
+CONCURRENCY_LIMIT = "concurrency_limit"
+IN_FLIGHT = "in_flight"
+QUEUE_WAIT_SECONDS = "queue_wait_seconds"
+RATE_LIMIT_WAIT_SECONDS = "rate_limit_wait_seconds"
+QUEUE_DEPTH = "queue_depth"
+QUOTA_USED = "quota_used"
+CACHE_HITS = "cache_hits"
+CACHE_MISSES = "cache_misses"
+STORE_BYTES = "store_bytes"
+
+
+class Metrics:
+    """
+    Metrics sink. The base class discards everything; subclass it and set `enabled` to record.
+
+    Instrumented code checks `enabled` before taking measurements, so the default sink costs nothing.
+    """
+
+    enabled = False
+
+    def observe(self, name: str, value: float, **tags: str) -> None:
+        """Record one value of a distribution, e.g. a duration in seconds or a size in bytes."""
+        pass
+
+    def increment(self, name: str, value: float = 1, **tags: str) -> None:
+        """Increase a counter."""
+        pass
+
+    def gauge(self, name: str, value: float, **tags: str) -> None:
+        """Set the current value of a gauge."""
+        pass
+
+
+NULL_METRICS = Metrics()
+
+
+class Histogram:
+    """
+    Fixed-memory histogram with exponential buckets.
+
+    Each bucket spans a factor of `2 ** (1 / 8)`, so percentiles are estimated within about 5% whatever the scale;
+    count, sum, minimum and maximum are exact.
+    """
+
+    _BUCKETS_PER_DOUBLING = 8
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buckets: Dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        """Add a value."""
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        bucket = math.floor(math.log2(value) * self._BUCKETS_PER_DOUBLING) if value > 0 else -(2**31)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+
+    def percentile(self, percent: float) -> float:
+        """Estimate a percentile (0-100) as the geometric centre of the bucket holding it."""
+        if not self.count:
+            return math.nan
+        rank = percent / 100 * self.count
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                if bucket == -(2**31):
+                    return 0.0
+                estimate = 2 ** ((bucket + 0.5) / self._BUCKETS_PER_DOUBLING)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Return count, sum, mean, min, max and the 50th, 90th, 99th percentiles."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else math.nan,
+            "min": self.min if self.count else math.nan,
+            "max": self.max if self.count else math.nan,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+def _series(name: str, tags: Dict[str, str]) -> str:
+    """Return the series name of a metric and its tags, e.g. `requests{endpoint=web,status=200}`."""
+    if not tags:
+        return name
+    return name + "{" + ",".join(f"{key}={tags[key]}" for key in sorted(tags)) + "}"
+
+
+class InMemoryMetrics(Metrics):
+    """Thread-safe in-process aggregator of histograms and counters, one series per metric name and tag set."""
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+
+    def observe(self, name: str, value: float, **tags: str) -> None:
+        """Record one value of a distribution."""
+        series = _series(name, tags)
+        with self._lock:
+            histogram = self.histograms.get(series)
+            if histogram is None:
+                histogram = self.histograms[series] = Histogram()
+            histogram.add(value)
+
+    def increment(self, name: str, value: float = 1, **tags: str) -> None:
+        """Increase a counter."""
+        series = _series(name, tags)
+        with self._lock:
+            self.counters[series] = self.counters.get(series, 0) + value
+
+    def gauge(self, name: str, value: float, **tags: str) -> None:
+        """Set the current value of a gauge."""
+        series = _series(name, tags)
+        with self._lock:
+            self.gauges[series] = value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the summaries of every histogram and the value of every counter and gauge."""
+        with self._lock:
+            return {
+                "histograms": {series: histogram.summary() for series, histogram in self.histograms.items()},
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+            }
+
+    def reset(self) -> None:
+        """Discard everything recorded so far."""
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.gauges.clear()
+
+
+class PrometheusMetrics(Metrics):
+    """
+    Export to `prometheus_client` (install with `pip install brave-search[prometheus]`).
+
+    Each metric becomes a `Histogram`, `Counter` or `Gauge` named `<namespace>_<name>`, labelled by its tags. The label
+    names of a metric are fixed by its first use.
+
+    Parameters:
+    -----------
+    namespace: str
+        Prefix of the metric names (default: "brave").
+    registry:
+        The `CollectorRegistry` to register with (default: the global registry).
+    """
+
+    enabled = True
+
+    def __init__(self, namespace: str = "brave", registry: Optional[Any] = None) -> None:
+        try:
+            import prometheus_client
+        except ImportError:
+            raise BraveError("PrometheusMetrics requires prometheus_client: pip install brave-search[prometheus]")
+        self._prometheus = prometheus_client
+        self.namespace = namespace
+        self.registry = registry if registry is not None else prometheus_client.REGISTRY
+        self._lock = threading.Lock()
+        self._metrics: Dict[Tuple[str, str], Any] = {}
+
+    def _metric(self, kind: str, name: str, labels: List[str]) -> Any:
+        """Return the collector for a metric, creating it on first use."""
+        with self._lock:
+            metric = self._metrics.get((kind, name))
+            if metric is None:
+                factory = {
+                    "histogram": self._prometheus.Histogram,
+                    "counter": self._prometheus.Counter,
+                    "gauge": self._prometheus.Gauge,
+                }[kind]
+                metric = factory(
+                    name, name.replace("_", " "), labels, namespace=self.namespace, registry=self.registry
+                )
+                self._metrics[(kind, name)] = metric
+            return metric
+
+    def observe(self, name: str, value: float, **tags: str) -> None:
+        """Observe a value of the `<namespace>_<name>` histogram."""
+        metric = self._metric("histogram", name, sorted(tags))
+        (metric.labels(**tags) if tags else metric).observe(value)
+
+    def increment(self, name: str, value: float = 1, **tags: str) -> None:
+        """Increase the `<namespace>_<name>` counter."""
+        metric = self._metric("counter", name, sorted(tags))
+        (metric.labels(**tags) if tags else metric).inc(value)
+
+    def gauge(self, name: str, value: float, **tags: str) -> None:
+        """Set the `<namespace>_<name>` gauge."""
+        metric = self._metric("gauge", name, sorted(tags))
+        (metric.labels(**tags) if tags else metric).set(value)
+
+
+class OpenTelemetryMetrics(Metrics):
+    """
+    Export to the OpenTelemetry metrics API (install with `pip install brave-search[opentelemetry]`).
+
+    Gauges need a version of the API providing synchronous gauges (`Meter.create_gauge`) and are dropped otherwise.
+
+    Parameters:
+    -----------
+    meter:
+        The `Meter` to create instruments with (default: the "brave" meter of the global meter provider).
+    """
+
+    enabled = True
+
+    def __init__(self, meter: Optional[Any] = None) -> None:
+        if meter is None:
+            try:
+                from opentelemetry import metrics
+            except ImportError:
+                raise BraveError(
+                    "OpenTelemetryMetrics requires opentelemetry-api: pip install brave-search[opentelemetry]"
+                )
+            meter = metrics.get_meter("brave")
+        self.meter = meter
+        self._lock = threading.Lock()
+        self._instruments: Dict[Tuple[str, str], Any] = {}
+
+    def _instrument(self, kind: str, name: str) -> Any:
+        """Return the instrument for a metric, creating it on first use."""
+        with self._lock:
+            instrument = self._instruments.get((kind, name))
+            if instrument is None:
+                factory = {
+                    "histogram": self.meter.create_histogram,
+                    "counter": self.meter.create_counter,
+                    "gauge": getattr(self.meter, "create_gauge", None),
+                }[kind]
+                if factory is None:
+                    return None
+                instrument = self._instruments[(kind, name)] = factory(f"brave.{name}")
+            return instrument
+
+    def observe(self, name: str, value: float, **tags: str) -> None:
+        """Record a value of the `brave.<name>` histogram."""
+        self._instrument("histogram", name).record(value, attributes=tags)
+
+    def increment(self, name: str, value: float = 1, **tags: str) -> None:
+        """Add to the `brave.<name>` counter."""
+        self._instrument("counter", name).add(value, attributes=tags)
+
+    def gauge(self, name: str, value: float, **tags: str) -> None:
+        """Set the `brave.<name>` gauge, if the API supports gauges."""
+        instrument = self._instrument("gauge", name)
+        if instrument is not None:
+            instrument.set(value, attributes=tags)
@@ -0,0 +1,51 @@
+"""
+Offload the parsing of response bodies from the event loop of `AsyncBrave`.
+
+Parsed on the event loop thread, responses cap a busy asynchronous client at one core whatever the network could
+deliver. With a `parse_executor`, the client moves the parsing to a pool where it pays off:
+
+- In a thread pool, the whole parse runs in a worker thread and the model is returned as is, without any copy. On
+  free-threaded builds (PEP 703) the workers parse in parallel; with the GIL they only keep long parses from stalling
+  the loop.
+- In a process pool, workers only decode raw bodies (`raw=True`) and send back plain dictionaries, which unpickle on
+  the loop in about half the time `json.loads` takes (`parse.loop_cost.*` benchmarks). Models are not parsed there:
+  whatever form a validated model is sent back in, rebuilding it on the loop costs more than validating the body
+  (`parse.loop_cost.unpickle_model.large`), so they are validated on the loop and a process pool only suits raw
+  workloads.
+
+`default_executor` returns the pool that parses models, a thread pool.
+"""
+import concurrent.futures
+import json
+import os
+import sys
+
+from typing import Any
+from typing import Optional
+
+
+def free_threaded() -> bool:
+    """Return whether the interpreter runs without the GIL, so threads parse in parallel."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def default_executor(workers: Optional[int] = None) -> concurrent.futures.Executor:
+    """
+    Return a thread pool to parse responses in, in parallel on free-threaded builds.
+
+    Pass a `ProcessPoolExecutor` instead to decode raw responses in parallel with the GIL; models are still validated
+    on the event loop then (see above).
+
+    Parameters:
+    -----------
+    workers: int
+        Number of workers (default: the number of CPUs, less one left to the event loop).
+    """
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+    return concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix="brave-parse")
+
+
+def decode(body: bytes) -> Any:
+    """Decode a JSON body; run in the workers of a process pool."""
+    return json.loads(body)
@@ -0,0 +1,246 @@
+"""
+Streaming pipelines over `AsyncBrave`: queries -> search -> stages -> sink.
+
+A `Pipeline` reads queries from a sync or async iterable, searches them with bounded concurrency, passes each response
+through user stages (plain or async functions, e.g. extraction, de-duplication or PDF download) each with its own
+workers, and yields the results in input order or as they complete.
+
+Every stage is fed by a queue, and a window caps the items between the source and the output: once `window` items
+are in flight, the source is not read until one leaves the pipeline. A slow stage or a slow consumer therefore slows
+down the source instead of piling up responses in memory, unlike `asyncio.gather` over every query.
+"""
+import asyncio
+import inspect
+import logging
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import AsyncIterable
+from typing import AsyncIterator
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Union
+
+from brave.exceptions import BraveError
+
+
+if TYPE_CHECKING:
+    from brave.async_brave import AsyncBrave
+
+logger = logging.getLogger(__name__)
+
+RAISE = "raise"
+SKIP = "skip"
+
+Query = Union[str, Dict[str, Any]]
+Source = Union[Iterable[Query], AsyncIterable[Query]]
+
+_END = object()  # end of a stage queue
+
+
+@dataclass
+class Searched:
+    """A query of a pipeline and its search response, the input of the first stage."""
+
+    query: str
+    response: Any
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+class _Dropped:
+    """An item filtered out by a stage, or skipped after an error, kept in the flow so ordering knows it is done."""
+
+    __slots__ = ()
+
+
+_DROPPED = _Dropped()
+
+
+class _Failed:
+    """An exception raised for an item, carried to the output to be raised there."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+class _Stage:
+    """A function of a pipeline and the number of workers running it."""
+
+    def __init__(self, func: Callable[[Any], Any], workers: int, blocking: bool) -> None:
+        self.func = func
+        self.workers = max(1, workers)
+        self.blocking = blocking
+
+    async def __call__(self, item: Any) -> Any:
+        if self.blocking:
+            return await asyncio.get_running_loop().run_in_executor(None, self.func, item)
+        result = self.func(item)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+
+class Pipeline:
+    """
+    Search a stream of queries and process the responses in stages, with bounded concurrency and memory.
+
+    Add stages with `stage`, then iterate over `run(source)` or send the results to a sink with `into`.
+
+    Parameters:
+    -----------
+    client: AsyncBrave
+        The client running the searches.
+    concurrency: int
+        Searches in flight at once (default: 8).
+    ordered: bool
+        Yield results in the order of the source rather than as they complete (default: False).
+    window: int
+        Items allowed between the source and the output, which also bounds the results held back for ordering
+        (default: four times the concurrency).
+    errors: str
+        "raise" to stop the pipeline on the first exception, or "skip" to log it and drop the item (default: "raise").
+    images: bool
+        Run image searches instead of web searches (default: False).
+    **params:
+        Parameters of every search, e.g. `count=5` or `raw=True`; those of a query given as a dictionary take
+        precedence.
+    """
+
+    def __init__(
+        self,
+        client: "AsyncBrave",
+        concurrency: int = 8,
+        ordered: bool = False,
+        window: Optional[int] = None,
+        errors: str = RAISE,
+        images: bool = False,
+        **params,
+    ) -> None:
+        if errors not in (RAISE, SKIP):
+            raise BraveError(f"Invalid error handling: {errors!r}, expected 'raise' or 'skip'")
+        self.client = client
+        self.ordered = ordered
+        self.window = window or 4 * max(1, concurrency)
+        self.errors = errors
+        self.params = params
+        self._call = client.image if images else client.search
+        self._stages: List[_Stage] = [_Stage(self._search, concurrency, blocking=False)]
+
+    def stage(self, func: Callable[[Any], Any], concurrency: int = 1, blocking: bool = False) -> "Pipeline":
+        """
+        Add a processing stage and return the pipeline.
+
+        Parameters:
+        -----------
+        func: Callable
+            Called with every item, a `Searched` for the first stage; returns the item for the next stage, or None
+            to drop it. It may be a coroutine function.
+        concurrency: int
+            Items processed at once by this stage (default: 1).
+        blocking: bool
+            Run a plain function in the default thread pool, for blocking I/O (default: False).
+        """
+        self._stages.append(_Stage(func, concurrency, blocking))
+        return self
+
+    async def _search(self, query: Query) -> Searched:
+        params = dict(self.params, **query) if isinstance(query, dict) else dict(self.params, q=query)
+        return Searched(query=params["q"], response=await self._call(**params), params=params)
+
+    async def run(self, source: Source) -> AsyncIterator[Any]:
+        """Yield the output of the last stage for every query of `source` that was not dropped."""
+        queues: List[asyncio.Queue] = [asyncio.Queue() for _ in range(len(self._stages) + 1)]
+        window = asyncio.Semaphore(self.window)
+        remaining = [stage.workers for stage in self._stages]
+
+        async def feed() -> None:
+            index = 0
+            try:
+                if isinstance(source, AsyncIterable):
+                    async for query in source:
+                        await window.acquire()
+                        queues[0].put_nowait((index, query))
+                        index += 1
+                else:
+                    for query in source:
+                        await window.acquire()
+                        queues[0].put_nowait((index, query))
+                        index += 1
+            except Exception as error:
+                queues[-1].put_nowait((index, _Failed(error)))
+            for _ in range(self._stages[0].workers):
+                queues[0].put_nowait(_END)
+
+        async def work(position: int) -> None:
+            stage, inbox, outbox = self._stages[position], queues[position], queues[position + 1]
+            while True:
+                entry = await inbox.get()
+                if entry is _END:
+                    remaining[position] -= 1
+                    if remaining[position] == 0:
+                        following = self._stages[position + 1].workers if position + 1 < len(self._stages) else 1
+                        for _ in range(following):
+                            outbox.put_nowait(_END)
+                    return
+                index, item = entry
+                if not isinstance(item, (_Dropped, _Failed)):
+                    item = await self._apply(stage, item)
+                outbox.put_nowait((index, item))
+
+        tasks = [asyncio.ensure_future(feed())]
+        for position, stage in enumerate(self._stages):
+            tasks.extend(asyncio.ensure_future(work(position)) for _ in range(stage.workers))
+        held: Dict[int, Any] = {}  # results completed ahead of their turn, when ordered
+        following = 0
+        try:
+            while True:
+                entry = await queues[-1].get()
+                if entry is _END:
+                    break
+                index, item = entry
+                if isinstance(item, _Failed):
+                    raise item.error
+                if not self.ordered:
+                    window.release()
+                    if item is not _DROPPED:
+                        yield item
+                    continue
+                held[index] = item
+                while following in held:
+                    item = held.pop(following)
+                    following += 1
+                    window.release()
+                    if item is not _DROPPED:
+                        yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _apply(self, stage: _Stage, item: Any) -> Any:
+        """Run a stage on an item, turning None and skipped errors into drops."""
+        try:
+            result = await stage(item)
+        except Exception as error:
+            if self.errors == RAISE:
+                return _Failed(error)
+            logger.warning("Pipeline item dropped after %s: %s", type(error).__name__, error)
+            return _DROPPED
+        return _DROPPED if result is None else result
+
+    async def into(self, source: Source, sink: Callable[[Any], Any]) -> int:
+        """Send every result for `source` to `sink`, a plain or coroutine function, and return how many were sent."""
+        sent = 0
+        async for item in self.run(source):
+            result = sink(item)
+            if inspect.isawaitable(result):
+                await result
+            sent += 1
+        return sent
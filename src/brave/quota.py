@@ -0,0 +1,342 @@
+"""
+Monthly quota accounting and budgets for Brave Search API subscriptions.
+
+A `QuotaLedger` is transport middleware that counts the requests of every month per API key, endpoint and caller tag
+in an SQLite database, so the count survives restarts and is shared by every process using the same file. Each
+response also reports what the API itself counts, the remaining requests of the monthly window in the last value of
+`X-RateLimit-Remaining`; the ledger reconciles both by taking, for every key, the larger of its own count and the
+limit minus the reported remaining, so requests sent by other tools are accounted too.
+
+Counts are kept in memory, so checking a budget never queries the database: the ledger writes the requests it
+counted to the database in one transaction at most every `sync_interval` seconds, and reloads then the counts of the
+other processes.
+
+Budgets turn the count into a mode for the clients:
+
+- "normal": requests are sent as usual.
+- "degraded", past the soft budget: cached responses are served even once expired, and only cache misses are sent.
+- "cache_only", past the hard budget, a tag budget, or once the API reports no requests left: only cached responses
+  are served, and anything else raises `BraveQuotaExceeded` without network I/O.
+
+Keys are stored as a hash, never in clear. Months are calendar months in UTC.
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from brave.exceptions import BraveQuotaExceeded
+from brave.keys import TOKEN_HEADER
+from brave.keys import _header
+from brave.keys import _windows
+from brave.metrics import NULL_METRICS
+from brave.metrics import QUOTA_USED
+from brave.metrics import REJECTED_REQUESTS
+from brave.metrics import Metrics
+from brave.transport import Middleware
+from brave.transport import Request
+
+
+logger = logging.getLogger(__name__)
+
+NORMAL = "normal"
+DEGRADED = "degraded"
+CACHE_ONLY = "cache_only"
+
+# Rejected attempts the API does not serve, and presumably does not bill.
+_UNCOUNTED_STATUSES = (401, 429)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    month TEXT NOT NULL,
+    key TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    requests INTEGER NOT NULL,
+    PRIMARY KEY (month, key, endpoint, tag)
+);
+CREATE TABLE IF NOT EXISTS reported (
+    key TEXT PRIMARY KEY,
+    remaining INTEGER NOT NULL,
+    quota INTEGER,
+    resets_at REAL NOT NULL,
+    reported_at REAL NOT NULL
+);
+"""
+
+
+def _month(now: Optional[float] = None) -> str:
+    """Return the UTC month of a timestamp, e.g. "2024-05"."""
+    return time.strftime("%Y-%m", time.gmtime(now))
+
+
+def key_id(key: str) -> str:
+    """Return the identifier of an API key in the ledger: a short hash, so keys are never stored."""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+
+
+class QuotaLedger(Middleware):
+    """
+    Persistent monthly usage ledger enforcing request budgets, used as transport middleware.
+
+    Pass it as the `quota` of a client; the client puts it in its transport's middleware, after the key pool if any,
+    and checks its mode before every call that misses the cache.
+
+    Parameters:
+    -----------
+    path: str
+        The SQLite database of the ledger, shared by every process using it (default: in memory, for this process).
+    soft_limit: int
+        Requests per month after which the clients degrade to serving expired cache entries (default: none).
+    hard_limit: int
+        Requests per month after which the clients only serve cached responses (default: none).
+    tag_limits: Mapping[str, int]
+        Requests per month allowed to each caller tag, after which its calls only serve cached responses (default:
+        none).
+    metrics: Metrics
+        Sink for the monthly usage and refused attempts (default: the metrics of the client).
+    sync_interval: float
+        Seconds between writes of the counts to the database, which also reload the counts of other processes; a
+        budget shared by several processes may be overrun by the requests they send in between (default: 1).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        soft_limit: Optional[int] = None,
+        hard_limit: Optional[int] = None,
+        tag_limits: Optional[Mapping[str, int]] = None,
+        metrics: Optional[Metrics] = None,
+        sync_interval: float = 1.0,
+    ) -> None:
+        self.path = path or ":memory:"
+        self.soft_limit = soft_limit
+        self.hard_limit = hard_limit
+        self.tag_limits = dict(tag_limits or {})
+        self.metrics = metrics or NULL_METRICS
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._warned: Optional[str] = None  # month the soft budget was reported as exceeded
+        self._admitted: Set[int] = set()  # attempts admitted and not answered yet
+        # This month's requests per key and per tag, and the last report of every key, as of the last sync plus the
+        # requests counted since; the requests and reports not written yet are pending.
+        self._month = _month()
+        self._keys: Dict[str, int] = {}
+        self._tags: Dict[str, int] = {}
+        self._reports: Dict[str, Tuple[int, Optional[int], float, float]] = {}
+        self._pending: Dict[Tuple[str, str, str, str], int] = {}
+        self._pending_reports: Dict[str, Tuple[int, Optional[int], float, float]] = {}
+        self._synced_at = 0.0
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        """Write the pending counts and close the database."""
+        with self._lock:
+            self._write()
+            self._db.close()
+
+    def flush(self) -> None:
+        """Write the pending counts to the database and reload the counts of every process."""
+        with self._lock:
+            self._sync()
+
+    def _write(self) -> None:
+        """Write the pending counts and reports in one transaction; must be called with the lock held."""
+        if not self._pending and not self._pending_reports:
+            return
+        self._db.execute("BEGIN")
+        try:
+            self._db.executemany(
+                "INSERT INTO usage VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (month, key, endpoint, tag) DO UPDATE SET requests = requests + excluded.requests",
+                [(*row, requests) for row, requests in self._pending.items()],
+            )
+            self._db.executemany(
+                "INSERT INTO reported VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "remaining = excluded.remaining, quota = COALESCE(excluded.quota, quota), "
+                "resets_at = excluded.resets_at, reported_at = excluded.reported_at "
+                "WHERE excluded.reported_at >= reported.reported_at",
+                [(key, *report) for key, report in self._pending_reports.items()],
+            )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._pending.clear()
+        self._pending_reports.clear()
+
+    def _sync(self) -> None:
+        """Write the pending counts, then reload this month's counts of every process; call with the lock held."""
+        self._write()
+        self._month = _month()
+        keys: Dict[str, int] = {}
+        tags: Dict[str, int] = {}
+        rows = self._db.execute(
+            "SELECT key, tag, SUM(requests) FROM usage WHERE month = ? GROUP BY key, tag", (self._month,)
+        )
+        for key, tag, requests in rows:
+            keys[key] = keys.get(key, 0) + requests
+            tags[tag] = tags.get(tag, 0) + requests
+        self._keys, self._tags = keys, tags
+        rows = self._db.execute("SELECT key, remaining, quota, resets_at, reported_at FROM reported")
+        self._reports = {key: tuple(report) for key, *report in rows}
+        self._synced_at = time.monotonic()
+
+    def _refresh(self) -> None:
+        """Sync once `sync_interval` has passed or the month has changed; must be called with the lock held."""
+        if time.monotonic() - self._synced_at >= self.sync_interval or _month() != self._month:
+            self._sync()
+
+    def record(self, key: str, endpoint: str, tag: Optional[str] = None, headers: Optional[Any] = None) -> None:
+        """Count one request sent with an API key, and reconcile with the rate limit headers of its response."""
+        now = time.time()
+        month = _month(now)
+        identifier = key_id(key)
+        remaining = _windows(_header(headers, "X-RateLimit-Remaining")) if headers is not None else ()
+        resets = _windows(_header(headers, "X-RateLimit-Reset")) if headers is not None else ()
+        limits = _windows(_header(headers, "X-RateLimit-Limit")) if headers is not None else ()
+        with self._lock:
+            if month != self._month:
+                self._sync()
+            row = (month, identifier, endpoint, tag or "")
+            self._pending[row] = self._pending.get(row, 0) + 1
+            self._keys[identifier] = self._keys.get(identifier, 0) + 1
+            self._tags[tag or ""] = self._tags.get(tag or "", 0) + 1
+            if remaining and len(remaining) == len(resets):
+                previous = self._reports.get(identifier)
+                if previous is None or now >= previous[3]:
+                    quota = int(limits[-1]) if len(limits) == len(remaining) else None
+                    if quota is None and previous is not None:
+                        quota = previous[1]
+                    report = (int(remaining[-1]), quota, now + resets[-1], now)
+                    self._reports[identifier] = self._pending_reports[identifier] = report
+            self._refresh()
+            used = self._used() if self.metrics.enabled else 0
+        if self.metrics.enabled:
+            self.metrics.gauge(QUOTA_USED, used)
+
+    def used(self, tag: Optional[str] = None) -> int:
+        """
+        Return the requests used this month, reconciled with the usage reported by the API, or those counted for a
+        caller tag.
+        """
+        with self._lock:
+            self._refresh()
+            return self._tags.get(tag, 0) if tag is not None else self._used()
+
+    def _used(self, reported: Optional[Dict[str, tuple]] = None) -> int:
+        """Return the requests used this month by every key; must be called with the lock held."""
+        counted = dict(self._keys)
+        for key, (remaining, quota) in (self._reported() if reported is None else reported).items():
+            if quota is not None:
+                counted[key] = max(counted.get(key, 0), quota - remaining)
+        return sum(counted.values())
+
+    def remaining(self, key: str) -> Optional[int]:
+        """Return the requests left this month to an API key as last reported by the API, or None if unknown."""
+        with self._lock:
+            self._refresh()
+            reported = self._reported().get(key_id(key))
+        return reported[0] if reported is not None else None
+
+    def _reported(self) -> Dict[str, tuple]:
+        """Return the current monthly window reported for every key; must be called with the lock held."""
+        now = time.time()
+        return {
+            key: (remaining, quota)
+            for key, (remaining, quota, resets_at, _) in self._reports.items()
+            if resets_at > now
+        }
+
+    def mode(self, tag: Optional[str] = None) -> str:
+        """Return the mode the clients run in for calls of a caller tag: "normal", "degraded" or "cache_only"."""
+        limit = self.tag_limits.get(tag) if tag is not None else None
+        with self._lock:
+            self._refresh()
+            if limit is not None and self._tags.get(tag, 0) >= limit:
+                return CACHE_ONLY
+            reported = self._reported()
+            if reported and all(remaining <= 0 for remaining, _ in reported.values()):
+                return CACHE_ONLY
+            if self.hard_limit is None and self.soft_limit is None:
+                return NORMAL
+            used = self._used(reported)
+        if self.hard_limit is not None and used >= self.hard_limit:
+            return CACHE_ONLY
+        if self.soft_limit is not None and used >= self.soft_limit:
+            if self._warned != _month():
+                self._warned = _month()
+                logger.warning("%d requests used this month, past the soft budget of %d", used, self.soft_limit)
+            return DEGRADED
+        return NORMAL
+
+    def check(self, tag: Optional[str] = None) -> str:
+        """Return the mode for a caller tag, raising `BraveQuotaExceeded` if requests may not be sent."""
+        mode = self.mode(tag)
+        if mode == CACHE_ONLY:
+            self.metrics.increment(REJECTED_REQUESTS, reason="quota")
+            scope = f"for tag {tag!r}" if tag in self.tag_limits else "this month"
+            raise BraveQuotaExceeded(f"The request budget {scope} is used up")
+        return mode
+
+    def usage(self, month: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the requests counted in a month (default: this month) per key, endpoint and tag."""
+        with self._lock:
+            self._sync()
+            rows = self._db.execute(
+                "SELECT key, endpoint, tag, requests FROM usage WHERE month = ? ORDER BY key, endpoint, tag",
+                (month or _month(),),
+            ).fetchall()
+        return [
+            {"key": key, "endpoint": endpoint, "tag": tag or None, "requests": requests}
+            for key, endpoint, tag, requests in rows
+        ]
+
+    def before_request(self, request: Request) -> None:
+        """
+        Refuse the attempt with `BraveQuotaExceeded` once the budget of its tag is used up. The first attempt of a call
+        whose client already checked the budget (`request.budget`) is not checked again; retries and hedges are.
+        """
+        if request.budget is None:
+            self.check(request.tag)
+        request.budget = None
+        with self._lock:
+            self._admitted.add(id(request))
+        return None
+
+    def after_response(self, request: Request, response: Any) -> Any:
+        """
+        Count the attempt, unless the API rejected it or it was not admitted by this ledger, e.g. it was answered by a
+        cassette ahead of it.
+        """
+        with self._lock:
+            admitted = id(request) in self._admitted
+            self._admitted.discard(id(request))
+        if admitted and response.status_code not in _UNCOUNTED_STATUSES:
+            self.record(
+                request.headers.get(TOKEN_HEADER, ""),
+                request.path.split("/", 1)[0],
+                request.tag,
+                response.headers,
+            )
+        return response
+
+    def on_error(self, request: Request, exception: BaseException) -> None:
+        """Forget an attempt that failed without a response."""
+        with self._lock:
+            self._admitted.discard(id(request))
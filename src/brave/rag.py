@@ -0,0 +1,272 @@
+"""
+Turn search responses into deduplicated, token-budgeted context documents for retrieval-augmented generation.
+
+A `ContextBuilder` reads the text of a web search response, parsed or raw, straight from its fields, without dumping
+any model to a dictionary:
+
+- web results: the description and extra snippets of each result,
+- FAQ: each question with its answer,
+- discussions: the question and top comment of each forum post,
+- infobox: the long description of the entity.
+
+Text decorations are stripped (`brave.text`), snippets repeated within a document are dropped, and documents whose
+URL and source, or whose text, were already seen are skipped, across every response the builder is fed. Each
+`Document` has a stable ID, a hash of its source, URL and question, so the same passage keeps its ID across
+queries and runs, and carries its title and URL for attribution.
+
+`build` fits the documents of a response into a token budget, truncating the last one at a sentence or word boundary,
+and `stream` and `astream` do so lazily over streams of responses. Tokens are estimated at four characters each,
+which is close for English text with the usual BPE tokenizers and costs nothing; pass `estimate` to count with a real
+tokenizer.
+"""
+import hashlib
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import AsyncIterable
+from typing import AsyncIterator
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+
+from brave.exceptions import BraveError
+from brave.text import strip
+from brave.types.access import get_field
+
+
+WEB = "web"
+FAQ = "faq"
+DISCUSSIONS = "discussions"
+INFOBOX = "infobox"
+
+SOURCES = (INFOBOX, WEB, FAQ, DISCUSSIONS)
+
+
+def estimate_tokens(text: str) -> int:
+    """Return an estimate of the number of tokens of a text: one per four characters."""
+    return (len(text) + 3) // 4
+
+
+def _results(value: Any) -> List[Any]:
+    """Return the results of a section of a response, or an empty list."""
+    return (get_field(value, "results") or []) if value is not None else []
+
+
+def _key(text: str) -> str:
+    """Return the form of a stripped text under which duplicates are detected."""
+    return text.lower()
+
+
+@dataclass
+class Document:
+    """A passage of a response, ready to be put in a prompt, with its source for attribution."""
+
+    id: str
+    source: str
+    title: str
+    url: str
+    text: str
+    query: Optional[str] = None
+    tokens: int = 0
+
+    def render(self, number: Optional[int] = None) -> str:
+        """Return the document as a block of a prompt, headed by its number, title and URL."""
+        heading = f"[{number}] {self.title}" if number is not None else self.title
+        return f"{heading} ({self.url})\n{self.text}"
+
+
+@dataclass
+class Context:
+    """The documents of a query that fit a token budget."""
+
+    query: Optional[str]
+    documents: List[Document] = field(default_factory=list)
+    tokens: int = 0
+
+    def render(self, separator: str = "\n\n") -> str:
+        """Return the documents as the context of a prompt, numbered for citations."""
+        return separator.join(document.render(number) for number, document in enumerate(self.documents, 1))
+
+    def sources(self) -> List[str]:
+        """Return the URLs of the documents, in the order of their numbers."""
+        return [document.url for document in self.documents]
+
+
+class ContextBuilder:
+    """
+    Assemble context documents from search responses, deduplicated across everything it was fed.
+
+    Parameters:
+    -----------
+    budget: int
+        Tokens of the context of a response (default: 2000).
+    document_budget: int
+        Tokens a single document is truncated to (default: no limit other than the budget).
+    sources: Sequence[str]
+        Parts of the responses to read, in the order their documents are added (default: infobox, web, FAQ and
+        discussions).
+    estimate: Callable[[str], int]
+        Returns the number of tokens of a text (default: `estimate_tokens`).
+    min_tokens: int
+        Fewest tokens a document is truncated to; shorter fragments are left out (default: 16).
+    """
+
+    def __init__(
+        self,
+        budget: int = 2000,
+        document_budget: Optional[int] = None,
+        sources: Sequence[str] = SOURCES,
+        estimate: Callable[[str], int] = estimate_tokens,
+        min_tokens: int = 16,
+    ) -> None:
+        unknown = set(sources) - set(_EXTRACTORS)
+        if unknown:
+            raise BraveError(f"Unknown sources: {sorted(unknown)}, expected some of {list(SOURCES)}")
+        self.budget = budget
+        self.document_budget = document_budget
+        self.sources = tuple(sources)
+        self.estimate = estimate
+        self.min_tokens = min_tokens
+        self._ids: Set[str] = set()
+        self._texts: Set[str] = set()
+
+    def reset(self) -> None:
+        """Forget the documents seen so far."""
+        self._ids.clear()
+        self._texts.clear()
+
+    def documents(self, response: Any) -> Iterator[Document]:
+        """Yield the documents of a response that were not seen before, without any budget."""
+        for document, key in self._candidates(response):
+            self._ids.add(document.id)
+            self._texts.add(key)
+            yield document
+
+    def _candidates(self, response: Any) -> Iterator[Tuple[Document, str]]:
+        """Yield the documents of a response that were not seen before, and the keys of their texts."""
+        query = get_field(get_field(response, "query"), "original")
+        for source in self.sources:
+            for title, url, parts, discriminator in _EXTRACTORS[source](response):
+                candidate = self._document(source, title, url, parts, discriminator, query)
+                if candidate is not None:
+                    yield candidate
+
+    def _document(
+        self, source: str, title: Any, url: Any, parts: Iterable[Any], discriminator: str, query: Optional[str]
+    ) -> Optional[Tuple[Document, str]]:
+        url = str(url or "")
+        identifier = hashlib.blake2b(f"{source}\0{url}\0{discriminator}".encode("utf-8"), digest_size=8).hexdigest()
+        if identifier in self._ids:
+            return None
+        snippets: List[str] = []
+        keys: Dict[str, None] = {}  # ordered
+        for part in parts:
+            if not part:
+                continue
+            text = strip(part)
+            key = _key(text)
+            if key and key not in keys:
+                keys[key] = None
+                snippets.append(text)
+        key = " ".join(keys)  # the key of the whole text
+        if not key or key in self._texts:
+            return None
+        text = "\n".join(snippets)
+        return Document(identifier, source, strip(str(title or "")), url, text, query, self.estimate(text)), key
+
+    def build(self, response: Any) -> Context:
+        """Return the context of a response: its new documents, in order, within the budget."""
+        context = Context(get_field(get_field(response, "query"), "original"))
+        for document, key in self._candidates(response):
+            remaining = self.budget - context.tokens
+            limit = remaining if self.document_budget is None else min(remaining, self.document_budget)
+            if document.tokens > limit:
+                document = self._truncate(document, limit)
+                if document is None:
+                    if limit < remaining:  # only this document is too long to cut
+                        continue
+                    break
+            self._ids.add(document.id)
+            self._texts.add(key)
+            context.documents.append(document)
+            context.tokens += document.tokens
+            if context.tokens >= self.budget:
+                break
+        return context
+
+    def stream(self, responses: Iterable[Any]) -> Iterator[Context]:
+        """Yield the context of every response of a stream, as they come."""
+        for response in responses:
+            yield self.build(response)
+
+    async def astream(self, responses: AsyncIterable[Any]) -> AsyncIterator[Context]:
+        """Yield the context of every response of an asynchronous stream, e.g. the output of a `Pipeline`."""
+        async for response in responses:
+            yield self.build(response)
+
+    def _truncate(self, document: Document, tokens: int) -> Optional[Document]:
+        """Return a document cut at a sentence or word boundary to fit a number of tokens, or None if none fits."""
+        if tokens < max(1, self.min_tokens):
+            return None
+        text = document.text
+        end = int(len(text) * tokens / max(1, document.tokens))
+        while end > 0:
+            cut = _boundary(text, end)
+            if cut <= 0:
+                return None
+            truncated = text[:cut].rstrip() + "…"
+            count = self.estimate(truncated)
+            if count <= tokens:
+                return Document(
+                    document.id, document.source, document.title, document.url, truncated, document.query, count
+                )
+            end = cut - 1
+        return None
+
+
+def _boundary(text: str, end: int) -> int:
+    """Return where to cut a text at or before `end`: after a sentence if one ends in its second half, else a word."""
+    sentence = max(text.rfind(". ", 0, end), text.rfind("\n", 0, end))
+    if sentence >= end // 2:
+        return sentence + 1
+    return text.rfind(" ", 0, end)
+
+
+def _web(response: Any) -> Iterator[tuple]:
+    for result in _results(get_field(response, "web")):
+        parts = [get_field(result, "description")]
+        parts.extend(get_field(result, "extra_snippets") or ())
+        yield get_field(result, "title"), get_field(result, "url"), parts, ""
+
+
+def _faq(response: Any) -> Iterator[tuple]:
+    for qa in _results(get_field(response, "faq")):
+        question = get_field(qa, "question") or ""
+        yield get_field(qa, "title") or question, get_field(qa, "url"), [question, get_field(qa, "answer")], _key(
+            question
+        )
+
+
+def _discussions(response: Any) -> Iterator[tuple]:
+    for result in _results(get_field(response, "discussions")):
+        data = get_field(result, "data")
+        parts = [get_field(data, "question"), get_field(data, "top_comment")] if data is not None else []
+        yield get_field(result, "title"), get_field(result, "url"), parts or [get_field(result, "description")], ""
+
+
+def _infobox(response: Any) -> Iterator[tuple]:
+    infobox = get_field(response, "infobox")
+    if infobox is None:
+        return
+    for result in _results(infobox) or [infobox]:
+        yield get_field(result, "title"), get_field(result, "url"), [get_field(result, "long_desc")], ""
+
+
+_EXTRACTORS = {WEB: _web, FAQ: _faq, DISCUSSIONS: _discussions, INFOBOX: _infobox}
@@ -0,0 +1,261 @@
+"""
+Fail fast and shed load when the Brave Search API degrades.
+
+Both guards are transport middleware, installed by the clients ahead of any other middleware:
+
+- `CircuitBreaker` stops sending requests once the failure rate over the most recent attempts crosses a threshold,
+  and lets a few trial requests through after a cool-down to detect recovery.
+- `AdaptiveLimiter` caps the attempts in flight with an AIMD limit: the limit grows by one per window of successful
+  attempts and shrinks by a constant factor on errors, rate limiting or latency well above the observed baseline.
+
+Refused attempts raise `BraveCircuitOpen` or `BraveOverloaded` immediately, which are not retried. Failures are server
+errors (5xx) and exceptions raised while sending, such as connection errors and HTTP timeouts; client errors (4xx)
+show that the service is up and count as successes for the breaker.
+"""
+import logging
+import threading
+import time
+
+from collections import deque
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import Optional
+
+from brave.exceptions import BraveCircuitOpen
+from brave.exceptions import BraveError
+from brave.exceptions import BraveOverloaded
+from brave.metrics import CIRCUIT_STATE
+from brave.metrics import CONCURRENCY_LIMIT
+from brave.metrics import IN_FLIGHT
+from brave.metrics import NULL_METRICS
+from brave.metrics import REJECTED_REQUESTS
+from brave.metrics import Metrics
+from brave.transport import Middleware
+from brave.transport import Request
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+def _failed(exception: BaseException) -> Optional[bool]:
+    """
+    Return whether an exception raised while sending is a failure of the service, or None if it says nothing.
+
+    Errors raised by the client itself, e.g. by other middleware, and cancellations, e.g. of the slower of two hedged
+    requests, are not failures.
+    """
+    if isinstance(exception, BraveError) or not isinstance(exception, Exception):
+        return None
+    return True
+
+
+class CircuitBreaker(Middleware):
+    """
+    Circuit breaker over a sliding window of the most recent attempts.
+
+    Closed, it lets every attempt through and opens when at least `min_calls` of the last `window` attempts are known
+    and `failure_rate` of them failed. Open, it refuses every attempt for `reset_timeout` seconds, then turns half-open
+    and lets up to `half_open_calls` trial attempts through: a success closes it, a failure opens it again.
+
+    Parameters:
+    -----------
+    failure_rate: float
+        Fraction of failed attempts in the window that opens the circuit (default: 0.5).
+    window: int
+        Number of most recent attempts the failure rate is computed over (default: 20).
+    min_calls: int
+        Attempts needed in the window before the circuit can open (default: 10).
+    reset_timeout: float
+        Seconds the circuit stays open before trial attempts are let through (default: 30).
+    half_open_calls: int
+        Trial attempts allowed at the same time while half-open (default: 1).
+    name: str
+        Tag of the metrics of this breaker (default: "brave").
+    metrics: Metrics
+        Sink for the circuit state and refused attempts (default: the metrics of the client).
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+        name: str = "brave",
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        if not 0 < failure_rate <= 1:
+            raise BraveError(f"The failure rate must be in (0, 1], got {failure_rate}")
+        self.failure_rate = failure_rate
+        self.min_calls = min(max(1, min_calls), window)
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = max(1, half_open_calls)
+        self.name = name
+        self.metrics = metrics or NULL_METRICS
+        self.state = CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=window)  # True for failures
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._leases: Dict[int, str] = {}  # id of the request -> state it was admitted in
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str) -> None:
+        """Change state; must be called with the lock held."""
+        logger.warning("Circuit breaker %s: %s -> %s", self.name, self.state, state)
+        self.state = state
+        self._outcomes.clear()
+        self._failures = 0
+        self._trials = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        self.metrics.gauge(CIRCUIT_STATE, _STATE_VALUES[state], breaker=self.name)
+
+    def before_request(self, request: Request) -> None:
+        """Admit the attempt, or raise `BraveCircuitOpen`."""
+        with self._lock:
+            if self.state == OPEN:
+                retry_after = self._opened_at + self.reset_timeout - time.monotonic()
+                if retry_after > 0:
+                    self.metrics.increment(REJECTED_REQUESTS, reason="circuit_open")
+                    raise BraveCircuitOpen(f"Circuit breaker {self.name} is open", retry_after=retry_after)
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._trials >= self.half_open_calls:
+                    self.metrics.increment(REJECTED_REQUESTS, reason="circuit_open")
+                    raise BraveCircuitOpen(f"Circuit breaker {self.name} is half-open", retry_after=0.0)
+                self._trials += 1
+            self._leases[id(request)] = self.state
+        return None
+
+    def after_response(self, request: Request, response: Any) -> Any:
+        """Record the outcome of the attempt from its status."""
+        self._record(request, response.status_code >= 500)
+        return response
+
+    def on_error(self, request: Request, exception: BaseException) -> None:
+        """Record an attempt that raised."""
+        self._record(request, _failed(exception))
+
+    def _record(self, request: Request, failed: Optional[bool]) -> None:
+        with self._lock:
+            admitted = self._leases.pop(id(request), None)
+            if admitted is None or admitted != self.state:
+                return  # not admitted by this breaker, or admitted before the last state change
+            if self.state == HALF_OPEN:
+                self._trials -= 1
+                if failed is not None:
+                    self._transition(OPEN if failed else CLOSED)
+                return
+            if failed is None:
+                return
+            if len(self._outcomes) == self._outcomes.maxlen:
+                self._failures -= self._outcomes[0]
+            self._outcomes.append(failed)
+            self._failures += failed
+            if len(self._outcomes) >= self.min_calls and self._failures >= self.failure_rate * len(self._outcomes):
+                self._transition(OPEN)
+
+
+class AdaptiveLimiter(Middleware):
+    """
+    Adaptive limit on the attempts in flight, by additive increase and multiplicative decrease (AIMD).
+
+    Every successful attempt raises the limit by `1 / limit`, i.e. by one per window of successes. A failure, a 429 or
+    an attempt slower than `latency_tolerance` times the baseline latency, the fastest of the last `window` attempts,
+    multiplies it by `backoff`. Attempts beyond the limit are refused with `BraveOverloaded`.
+
+    Parameters:
+    -----------
+    initial: float
+        The starting limit (default: 10).
+    min_limit: float
+        The limit never drops below this (default: 1).
+    max_limit: float
+        The limit never grows beyond this (default: 100).
+    backoff: float
+        Factor applied to the limit on congestion (default: 0.9).
+    latency_tolerance: float
+        Attempts slower than this multiple of the baseline latency count as congestion (default: 2).
+    window: int
+        Number of recent latencies the baseline is taken from (default: 100).
+    name: str
+        Tag of the metrics of this limiter (default: "brave").
+    metrics: Metrics
+        Sink for the limit, the attempts in flight and refused attempts (default: the metrics of the client).
+    """
+
+    def __init__(
+        self,
+        initial: float = 10,
+        min_limit: float = 1,
+        max_limit: float = 100,
+        backoff: float = 0.9,
+        latency_tolerance: float = 2.0,
+        window: int = 100,
+        name: str = "brave",
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        if not 0 < backoff < 1:
+            raise BraveError(f"The backoff factor must be in (0, 1), got {backoff}")
+        self.min_limit = max(1.0, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.name = name
+        self.metrics = metrics or NULL_METRICS
+        self.in_flight = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._started: Dict[int, float] = {}  # id of the request -> start time
+        self._lock = threading.Lock()
+
+    def before_request(self, request: Request) -> None:
+        """Admit the attempt, or raise `BraveOverloaded` when the limit is reached."""
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                self.metrics.increment(REJECTED_REQUESTS, reason="overloaded")
+                raise BraveOverloaded(f"Concurrency limit of {int(self.limit)} requests reached")
+            self.in_flight += 1
+            self._started[id(request)] = time.perf_counter()
+            self.metrics.gauge(IN_FLIGHT, self.in_flight, limiter=self.name)
+        return None
+
+    def after_response(self, request: Request, response: Any) -> Any:
+        """Adjust the limit from the status and latency of the attempt."""
+        self._release(request, response.status_code >= 500 or response.status_code == 429)
+        return response
+
+    def on_error(self, request: Request, exception: BaseException) -> None:
+        """Adjust the limit for an attempt that raised."""
+        self._release(request, _failed(exception))
+
+    def _release(self, request: Request, failed: Optional[bool]) -> None:
+        with self._lock:
+            start = self._started.pop(id(request), None)
+            if start is None:
+                return
+            self.in_flight -= 1
+            self.metrics.gauge(IN_FLIGHT, self.in_flight, limiter=self.name)
+            if failed is None:
+                return
+            latency = time.perf_counter() - start
+            congested = failed or (
+                len(self._latencies) == self._latencies.maxlen
+                and latency > self.latency_tolerance * min(self._latencies)
+            )
+            if not failed:
+                self._latencies.append(latency)
+            if congested:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.metrics.gauge(CONCURRENCY_LIMIT, self.limit, limiter=self.name)
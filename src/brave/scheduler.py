@@ -0,0 +1,242 @@
+"""
+Priority-aware scheduling of the requests of a client.
+
+A `Scheduler` admits every HTTP request of a client under a shared rate limit and concurrency cap. Requests waiting
+for admission are queued per priority class, and the queues are served by smooth weighted round-robin, so with the
+default weights interactive requests get four turns for every batch request whatever the length of the batch queue.
+A request waiting longer than `max_wait` is served first, so no class starves.
+
+The scheduler works with threads (`acquire`) and with asyncio tasks (`aacquire`), and a single instance can be shared
+by several clients, e.g. every client using the same subscription.
+"""
+import asyncio
+import threading
+import time
+
+from collections import deque
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import Mapping
+from typing import Optional
+
+from brave.exceptions import BraveError
+from brave.exceptions import BraveOverloaded
+from brave.metrics import NULL_METRICS
+from brave.metrics import QUEUE_DEPTH
+from brave.metrics import QUEUE_WAIT_SECONDS
+from brave.metrics import RATE_LIMIT_WAIT_SECONDS
+from brave.metrics import Metrics
+
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+
+class _Waiter:
+    """A request waiting for admission."""
+
+    __slots__ = ("priority", "enqueued", "rate_limited_since", "granted", "wake")
+
+    def __init__(self, priority: str, wake: Callable[[], None]) -> None:
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.rate_limited_since: Optional[float] = None
+        self.granted = False
+        self.wake = wake
+
+
+def _set_result(future: "asyncio.Future") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class Scheduler:
+    """
+    Weighted priority queues in front of a rate limit and a concurrency cap.
+
+    Parameters:
+    -----------
+    weights: Mapping[str, float]
+        The priority classes and their share of turns (default: {"interactive": 4, "batch": 1}).
+    default: str
+        The class of requests sent without a priority (default: the first class).
+    rate: float
+        Requests admitted per second, e.g. the per-second limit of the subscription (default: unlimited).
+    burst: int
+        Requests that can be admitted at once after an idle period (default: 1).
+    max_concurrency: int
+        Requests in flight at once (default: unlimited).
+    max_wait: float
+        Seconds after which a queued request is served before any other, whatever its class (default: 5).
+    max_queue: int
+        Requests queued per class; beyond it requests are refused with `BraveOverloaded` (default: unlimited).
+    metrics: Metrics
+        Sink for queue depths and waits (default: the metrics of the client).
+    """
+
+    def __init__(
+        self,
+        weights: Optional[Mapping[str, float]] = None,
+        default: Optional[str] = None,
+        rate: Optional[float] = None,
+        burst: int = 1,
+        max_concurrency: Optional[int] = None,
+        max_wait: float = 5.0,
+        max_queue: Optional[int] = None,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        self.weights = dict(weights or {INTERACTIVE: 4, BATCH: 1})
+        if not self.weights or any(weight <= 0 for weight in self.weights.values()):
+            raise BraveError("A Scheduler needs at least one priority class, with positive weights")
+        self.default = default or next(iter(self.weights))
+        if self.default not in self.weights:
+            raise BraveError(f"Unknown default priority: {self.default!r}")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_concurrency = max_concurrency
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.metrics = metrics or NULL_METRICS
+        self.in_flight = 0
+        self._queues: Dict[str, Deque[_Waiter]] = {name: deque() for name in self.weights}
+        self._current = dict.fromkeys(self.weights, 0.0)  # smooth weighted round-robin state
+        self._tokens = float(self.burst)
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+
+    def depth(self, priority: Optional[str] = None) -> int:
+        """Return the number of queued requests of a class, or of all classes."""
+        with self._lock:
+            if priority is not None:
+                return len(self._queues[priority])
+            return sum(len(queue) for queue in self._queues.values())
+
+    def _enqueue(self, priority: Optional[str], wake: Callable[[], None]) -> _Waiter:
+        priority = priority or self.default
+        queue = self._queues.get(priority)
+        if queue is None:
+            raise BraveError(f"Unknown priority {priority!r}, expected one of {sorted(self.weights)}")
+        waiter = _Waiter(priority, wake)
+        with self._lock:
+            queue.append(waiter)
+            self._dispatch()
+            if not waiter.granted and self.max_queue is not None and len(queue) > self.max_queue:
+                queue.remove(waiter)
+                raise BraveOverloaded(f"The {priority} queue is full ({self.max_queue} requests)")
+            self.metrics.gauge(QUEUE_DEPTH, len(queue), priority=priority)
+        return waiter
+
+    def _pick(self, now: float) -> Optional[str]:
+        """Return the class to serve next, without changing any state; must be called with the lock held."""
+        waiting = [name for name, queue in self._queues.items() if queue]
+        if not waiting:
+            return None
+        oldest = min(waiting, key=lambda name: self._queues[name][0].enqueued)
+        if now - self._queues[oldest][0].enqueued >= self.max_wait:
+            return oldest
+        return max(waiting, key=lambda name: self._current[name] + self.weights[name])
+
+    def _turn(self, chosen: str) -> None:
+        """Advance the weighted round-robin after serving a class; must be called with the lock held."""
+        total = 0.0
+        for name, queue in self._queues.items():
+            if queue or name == chosen:
+                self._current[name] += self.weights[name]
+                total += self.weights[name]
+        self._current[chosen] -= total
+
+    def _dispatch(self) -> Optional[float]:
+        """
+        Admit as many queued requests as the limits allow; must be called with the lock held.
+
+        Returns the seconds until the rate limit admits the next queued request, or None if nothing waits on it.
+        """
+        now = time.monotonic()
+        if self.rate is not None:
+            self._tokens = min(float(self.burst), self._tokens + (now - self._refilled) * self.rate)
+            self._refilled = now
+        while True:
+            priority = self._pick(now)
+            if priority is None:
+                return None
+            if self.max_concurrency is not None and self.in_flight >= self.max_concurrency:
+                return None
+            waiter = self._queues[priority][0]
+            if self.rate is not None and self._tokens < 1:
+                if waiter.rate_limited_since is None:
+                    waiter.rate_limited_since = now
+                return (1 - self._tokens) / self.rate
+            self._turn(priority)
+            self._queues[priority].popleft()
+            if self.rate is not None:
+                self._tokens -= 1
+            self.in_flight += 1
+            waiter.granted = True
+            self.metrics.gauge(QUEUE_DEPTH, len(self._queues[priority]), priority=priority)
+            self.metrics.observe(QUEUE_WAIT_SECONDS, now - waiter.enqueued, priority=priority)
+            if waiter.rate_limited_since is not None:
+                self.metrics.observe(RATE_LIMIT_WAIT_SECONDS, now - waiter.rate_limited_since, priority=priority)
+            waiter.wake()
+
+    def _cancel(self, waiter: _Waiter) -> None:
+        """Withdraw a request that stopped waiting, releasing its slot if it was admitted meanwhile."""
+        with self._lock:
+            if waiter.granted:
+                self.in_flight -= 1
+            else:
+                queue = self._queues[waiter.priority]
+                queue.remove(waiter)
+                self.metrics.gauge(QUEUE_DEPTH, len(queue), priority=waiter.priority)
+            self._dispatch()
+
+    def acquire(self, priority: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until a request of a priority class is admitted; every admission must be followed by `release`.
+
+        Returns False if the request was not admitted within `timeout` seconds.
+        """
+        event = threading.Event()
+        waiter = self._enqueue(priority, event.set)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        try:
+            while True:
+                with self._lock:
+                    retry_in = self._dispatch()
+                    if waiter.granted:
+                        return True
+                if deadline is not None:
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        self._cancel(waiter)
+                        return False
+                    retry_in = min(retry_in, left) if retry_in is not None else left
+                event.wait(retry_in)
+        except BaseException:
+            self._cancel(waiter)
+            raise
+
+    async def aacquire(self, priority: Optional[str] = None) -> None:
+        """
+        Wait until a request of a priority class is admitted, from a task; every admission must be followed by
+        `release`. Cancel the task to stop waiting.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = self._enqueue(priority, lambda: loop.call_soon_threadsafe(_set_result, future))
+        try:
+            while True:
+                with self._lock:
+                    retry_in = self._dispatch()
+                    if waiter.granted:
+                        return
+                await asyncio.wait({future}, timeout=retry_in)
+        except BaseException:
+            self._cancel(waiter)
+            raise
+
+    def release(self) -> None:
+        """Release the slot of a completed request and admit the next one."""
+        with self._lock:
+            self.in_flight -= 1
+            self._dispatch()
@@ -0,0 +1,233 @@
+"""
+Memory-bounded retention of parsed responses.
+
+A parsed `WebSearchApiResponse` takes several times the memory of its JSON body: every nested model carries its
+`__dict__`, every URL a `pydantic` URL object, and the same hostnames, favicons, languages and type names are repeated
+as separate objects in every result. A `ResponseStore` keeps a bounded number of responses parsed and the rest as
+compressed JSON:
+
+- hot: the `hot` most recently used responses, as models. Their repeated values and sub-objects (hostnames,
+  favicons, languages, type names, `MetaUrl`, `Profile` and `Thumbnail`...) are shared through an `ObjectPool` common
+  to every response of the store, so each distinct one is held once.
+- weak: responses evicted from the hot tier stay reachable through weak references for as long as the application
+  holds them, and are returned as the same objects without being parsed again.
+- cold: older responses, as zlib-compressed JSON, parsed again (and promoted back to the hot tier) on access. Past
+  `max_bytes` of compressed data, the least recently used responses are dropped.
+
+`memory()` reports the size of each tier; the size of the hot tier is measured by walking its models, counting each
+shared object once.
+"""
+import sys
+import threading
+import weakref
+import zlib
+
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from typing import Set
+from typing import Type
+
+from brave.metrics import NULL_METRICS
+from brave.metrics import STORE_BYTES
+from brave.metrics import Metrics
+from brave.types.pooling import ObjectPool
+from brave.types.pooling import is_url
+
+
+class ResponseStore:
+    """
+    Thread-safe store of parsed responses, keeping the recent ones parsed and the older ones compressed.
+
+    Parameters:
+    -----------
+    model: Type[BaseModel]
+        Model the responses are parsed into again when read from the cold tier (default: `WebSearchApiResponse`).
+    hot: int
+        Number of responses kept parsed (default: 128).
+    max_bytes: int
+        Compressed bytes kept in the cold tier before the least recently used responses are dropped (default: no
+        limit).
+    level: int
+        zlib compression level of the cold tier (default: 6).
+    metrics: Metrics
+        Sink for the `store_bytes` gauge of the cold tier (default: none).
+    pool: ObjectPool
+        Pool sharing the repeated values of the responses, e.g. the pool of the client that parsed them (default: a
+        pool of the store's own).
+    """
+
+    def __init__(
+        self,
+        model: Optional[Type[Any]] = None,
+        hot: int = 128,
+        max_bytes: Optional[int] = None,
+        level: int = 6,
+        metrics: Optional[Metrics] = None,
+        pool: Optional[ObjectPool] = None,
+    ) -> None:
+        if model is None:
+            from brave.types import WebSearchApiResponse
+
+            model = WebSearchApiResponse
+        self.model = model
+        self.hot = max(0, hot)
+        self.max_bytes = max_bytes
+        self.level = level
+        self.metrics = metrics or NULL_METRICS
+        self._hot: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._bodies: Dict[Hashable, bytes] = {}  # compressed bodies of hot responses, when known
+        self._cold: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._weak: "weakref.WeakValueDictionary[Hashable, Any]" = weakref.WeakValueDictionary()
+        self._sizes: Dict[Hashable, int] = {}  # sizes of the uncompressed bodies
+        self._cold_bytes = 0
+        self.pool = pool if pool is not None else ObjectPool()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._hot) + len(self._cold)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._hot or key in self._cold
+
+    def put(self, key: Hashable, response: Any, body: Optional[bytes] = None) -> None:
+        """
+        Store a parsed response.
+
+        Parameters:
+        -----------
+        key: Hashable
+            Key to read the response back with, e.g. `ResponseCache.key(endpoint, params)`.
+        response: BaseModel
+            The parsed response.
+        body: bytes
+            The JSON body the response was parsed from, compressed now and kept for when the response goes cold,
+            instead of serialising the model again then (default: serialise the model).
+        """
+        with self._lock:
+            self._discard(key)
+            self.pool.share(response)
+            self._hot[key] = response
+            if body is not None:
+                self._sizes[key] = len(body)
+                self._bodies[key] = zlib.compress(body, self.level)
+            self._evict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the response stored under `key`, parsing it again if it was cold, or `default`."""
+        with self._lock:
+            response = self._hot.get(key)
+            if response is not None:
+                self._hot.move_to_end(key)
+                return response
+            compressed = self._cold.pop(key, None)
+            if compressed is None:
+                return default
+            self._cold_bytes -= len(compressed)
+            response = self._weak.pop(key, None)
+            if response is None:
+                response = self.model.model_validate_json(zlib.decompress(compressed))
+                self.pool.share(response)
+            self._bodies[key] = compressed  # reused when it goes cold again
+            self._hot[key] = response
+            self._evict()
+            return response
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove the response stored under `key` and return it, or `default`."""
+        with self._lock:
+            response = self.get(key, default)
+            self._discard(key)
+            self._gauge()
+            return response
+
+    def clear(self) -> None:
+        """Remove every response and empty the pool."""
+        with self._lock:
+            self._hot.clear()
+            self._bodies.clear()
+            self._cold.clear()
+            self._weak.clear()
+            self._sizes.clear()
+            self.pool.clear()
+            self._cold_bytes = 0
+            self._gauge()
+
+    def _discard(self, key: Hashable) -> None:
+        self._hot.pop(key, None)
+        self._bodies.pop(key, None)
+        compressed = self._cold.pop(key, None)
+        if compressed is not None:
+            self._cold_bytes -= len(compressed)
+        self._weak.pop(key, None)
+        self._sizes.pop(key, None)
+
+    def _evict(self) -> None:
+        """Move the least recently used hot responses to the cold tier, and drop cold ones past `max_bytes`."""
+        while len(self._hot) > self.hot:
+            key, response = self._hot.popitem(last=False)
+            compressed = self._bodies.pop(key, None)
+            if compressed is None:
+                body = response.model_dump_json(by_alias=True, exclude_unset=True).encode("utf-8")
+                self._sizes[key] = len(body)
+                compressed = zlib.compress(body, self.level)
+            self._cold[key] = compressed
+            self._cold_bytes += len(compressed)
+            self._weak[key] = response
+        while self.max_bytes is not None and self._cold_bytes > self.max_bytes and self._cold:
+            key, compressed = self._cold.popitem(last=False)
+            self._cold_bytes -= len(compressed)
+            self._weak.pop(key, None)
+            self._sizes.pop(key, None)
+        self._gauge()
+
+    def _gauge(self) -> None:
+        if self.metrics.enabled:
+            self.metrics.gauge(STORE_BYTES, self._cold_bytes, tier="cold")
+
+    def memory(self) -> Dict[str, int]:
+        """
+        Return the number of responses and bytes of each tier.
+
+        `hot_bytes` is measured by walking the hot models, which takes time in proportion to their size;
+        `raw_bytes` is the size of the JSON bodies of the cold responses, and `weak` the number of cold responses
+        still held by the application.
+        """
+        with self._lock:
+            seen: Set[int] = set()
+            return {
+                "hot": len(self._hot),
+                "hot_bytes": sum(_deep_size(response, seen) for response in self._hot.values()),
+                "weak": len(self._weak),
+                "cold": len(self._cold),
+                "cold_bytes": self._cold_bytes,
+                "raw_bytes": sum(self._sizes.get(key, 0) for key in self._cold),
+                "pooled": len(self.pool),
+            }
+
+
+def _deep_size(value: Any, seen: Set[int]) -> int:
+    """Return the size of an object and of everything it references that was not seen yet."""
+    size = 0
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if id(value) in seen or value is None or isinstance(value, (bool, type)):
+            continue
+        seen.add(id(value))
+        size += sys.getsizeof(value)
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            stack.extend(value)
+        elif hasattr(type(value), "model_fields"):
+            stack.append(value.__dict__)
+            stack.append(getattr(value, "__pydantic_fields_set__", None))
+        elif is_url(value):
+            size += sys.getsizeof(str(value))  # held by the Rust core of the URL
+    return size
@@ -1,40 +1,171 @@
+import concurrent.futures
 import logging
+import time
 
+from typing import Any
 from typing import Dict
+from typing import Mapping
 from typing import Optional
+from typing import Sequence
+from typing import Union
 
-import requests
-
-from tenacity import retry
-from tenacity import stop_after_attempt
-from tenacity import wait_fixed
+from tenacity import Retrying
 
 from brave.client import BraveAPIClient
+from brave.keys import KeyPool
+from brave.metrics import NULL_METRICS
+from brave.transport import BaseTransport
+from brave.transport import Request
+from brave.transport import RequestsTransport
 
 
 logger = logging.getLogger(__name__)
 
+# Threads hedged attempts are sent from, unless a scheduler caps the concurrency: the default size of the connection
+# pools of `requests`, so hedging never holds more connections than a pool keeps.
+HEDGE_WORKERS = 10
+
 
 class Brave(BraveAPIClient):
-    """Synchronous client for interacting with the Brave Search API."""
+    """
+    Synchronous client for interacting with the Brave Search API.
+
+    Takes the parameters of `BraveAPIClient`, plus:
+
+    transport:
+        The `BaseTransport` used to send requests (default: a `RequestsTransport` for `base_url`).
+    """
+
+    def __init__(
+        self,
+        api_key: Union[str, Sequence[str], Mapping[str, float], KeyPool, None] = None,
+        endpoint: str = "web",
+        transport: Optional[BaseTransport] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(api_key=api_key, endpoint=endpoint, **kwargs)
+        if transport is None:
+            transport = RequestsTransport(base_url=self.base_url, metrics=self.metrics)
+        elif transport.metrics is NULL_METRICS:
+            transport.metrics = self.metrics
+        self._install_middleware(transport)
+        self._negotiate(transport)
+        self.transport = transport
+        self.base_url = self.transport.base_url
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    def __enter__(self) -> "Brave":
+        return self
 
-    def __init__(self, api_key: Optional[str] = None, endpoint: str = "web") -> None:
-        super().__init__(api_key=api_key, endpoint=endpoint)
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
-    def _get(self, params: Optional[Dict] = None) -> Optional[requests.Response]:
+    def warm(self, connections: int = 1) -> int:
+        """
+        Open `connections` pooled connections to the API ahead of the first requests, so they do not pay for DNS,
+        TCP and TLS, and return how many answered; see `BaseTransport.warm`. Call `brave.warmup()` too to build the
+        response models.
+        """
+        return self.transport.warm(connections, timeout=self.timeout)
+
+    def close(self) -> None:
+        """Release the connections held by the transport, and the hedging threads."""
+        self.transport.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _get(
+        self,
+        params: Optional[Dict] = None,
+        endpoint: Optional[str] = None,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+        sink: Optional[Any] = None,
+        budget: Optional[str] = None,
+    ) -> Any:
         """
         Perform a synchronous GET request to the specified endpoint with optional parameters.
 
-        Includes retry logic using tenacity.
+        Includes retry logic using tenacity. The time left before the deadline of the call is the HTTP timeout of each
+        attempt, which bounds every connect and read rather than the attempt as a whole.
         """
-        url = self.base_url + self.endpoint + "/search"
-        headers = self._prepare_headers()
+        request = self._request(params=params, endpoint=endpoint, tag=tag, sink=sink, budget=budget)
+        deadline = self._deadline(timeout)
+
+        for attempt in Retrying(**self._retry_policy(deadline)):
+            with attempt:
+                request.timeout = self._time_left(deadline, request)
+                response = self._send(request, priority)
+                response.raise_for_status()  # Raises HTTPError for bad requests
+                return response
+
+    def _send(self, request: Request, priority: Optional[str] = None) -> Any:
+        """
+        Send one attempt, hedging it with a duplicate if it is slow to answer.
+
+        The attempt that loses is cancelled if it has not started yet, e.g. while queued for a hedging thread; one
+        already sending cannot be interrupted and runs to completion in the background, holding its thread and
+        connection until it is answered or times out.
+        """
+        delay = self._hedge_delay(request)
+        if delay is None:
+            return self._timed_send(request, priority)
+        end = time.monotonic() + request.timeout if request.timeout is not None else None
+        if self._executor is None:
+            workers = (self.scheduler.max_concurrency if self.scheduler is not None else None) or HEDGE_WORKERS
+            self._executor = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix="brave-hedge")
+        first = self._executor.submit(self._timed_send, request, priority)
+        futures = [first]
+        try:
+            done, _ = concurrent.futures.wait(futures, timeout=delay)
+            if done:
+                return first.result()
+            second = self._executor.submit(self._timed_send, self._duplicate(request), priority)
+            futures.append(second)
+            pending, error = set(futures), None
+            while pending:
+                timeout = max(0.0, end - time.monotonic()) if end is not None else None
+                done, pending = concurrent.futures.wait(
+                    pending, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                if not done:
+                    raise self._timed_out(request)
+                for future in done:
+                    if future.exception() is None:
+                        self._count_hedge(won=future is second)
+                        return future.result()
+                    error = error or future.exception()
+            self._count_hedge(won=False)
+            raise error
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _timed_send(self, request: Request, priority: Optional[str] = None) -> Any:
+        """
+        Send a request once the scheduler, if any, admits it, and record its latency for the hedging policy.
+
+        Waiting for admission counts against the timeout of the attempt.
+        """
+        if self.scheduler is None:
+            return self._measured_send(request)
+        queued = time.monotonic()
+        if not self.scheduler.acquire(priority, timeout=request.timeout):
+            raise self._timed_out(request)
         try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()  # Raises HTTPError for bad requests
-            return response
-        except requests.exceptions.HTTPError as e:
-            logger.warning(f"HTTP error occurred: {e}")
-        except requests.exceptions.RequestException as e:
-            logger.warning(f"Request error occurred: {e}")
+            if request.timeout is not None:
+                request.timeout = self._time_left(queued + request.timeout, request)
+            return self._measured_send(request)
+        finally:
+            self.scheduler.release()
+
+    def _measured_send(self, request: Request) -> Any:
+        """Send a request, recording its latency for the hedging policy."""
+        if self.hedge is None:
+            return self.transport.send(request)
+        start = time.perf_counter()
+        response = self.transport.send(request)
+        self.hedge.record(time.perf_counter() - start)
+        return response
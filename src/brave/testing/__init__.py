@@ -0,0 +1,2 @@
+from .server import FakeBraveServer
+from .server import load_fixtures
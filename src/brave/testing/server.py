@@ -0,0 +1,253 @@
+"""
+A local fake Brave Search API server for offline tests and load tests.
+
+The server answers `GET <base_url>/<endpoint>/search` with recorded JSON fixtures, such as the responses in
+`tests/test_responses`, and can inject latency, server errors and 429 rate limit responses. Bodies are compressed
+with every installed encoding (`brave.encoding`) once when the server starts, so serving a request costs no JSON
+encoding nor compression; each request gets the first encoding of its `Accept-Encoding` the server has.
+
+Run it standalone with::
+
+    python -m brave.testing.server tests/test_responses --port 8080 --latency 0.05 --rate-limit-rate 0.01
+"""
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+from typing import Union
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+from brave.encoding import IDENTITY
+from brave.encoding import available
+from brave.encoding import compress
+from brave.encoding import split
+
+
+logger = logging.getLogger(__name__)
+
+Fixture = Union[bytes, str, Mapping[str, Any]]
+Latency = Union[float, Tuple[float, float], Callable[[], float]]
+
+
+def _fixture_key(query: str) -> str:
+    """Return the lookup key of a query: lower-case with collapsed whitespace."""
+    return " ".join(query.lower().split())
+
+
+def _encode(fixture: Fixture) -> bytes:
+    """Return a fixture as JSON bytes."""
+    if isinstance(fixture, bytes):
+        return fixture
+    if isinstance(fixture, str):
+        return fixture.encode("utf-8")
+    return json.dumps(fixture).encode("utf-8")
+
+
+def load_fixtures(path: Union[str, Path]) -> Dict[str, bytes]:
+    """
+    Load every `*.json` file of a directory as a fixture.
+
+    Each fixture is keyed by its `query.original` value when present, otherwise by the file name without extension.
+    """
+    fixtures = {}
+    for file in sorted(Path(path).glob("*.json")):
+        body = file.read_bytes()
+        original = json.loads(body).get("query", {}).get("original")
+        fixtures[original or file.stem] = body
+    return fixtures
+
+
+class FakeBraveServer:
+    """
+    In-process HTTP server imitating the Brave Search API.
+
+    Requests are matched to a fixture by their `q` parameter (case and whitespace insensitive), falling back to
+    `default`; unmatched requests get a 404. Use it as a context manager, and point a client at `base_url`.
+
+    Parameters:
+    -----------
+    fixtures: Mapping[str, Fixture]
+        Response bodies keyed by query, as bytes, JSON strings or dictionaries.
+    default: Fixture
+        Response body for queries without a fixture (default: None).
+    latency: float, (float, float) or callable
+        Seconds to wait before answering: a constant, a uniform (min, max) range or a callable (default: 0).
+    error_rate: float
+        Fraction of requests answered with a 500 (default: 0).
+    rate_limit_rate: float
+        Fraction of requests answered with a 429 (default: 0).
+    host: str
+        The interface to bind (default: "127.0.0.1").
+    port: int
+        The port to bind, 0 picks a free port (default: 0).
+    seed: int
+        Seed for the error and rate limit draws, for reproducible runs (default: None).
+    """
+
+    def __init__(
+        self,
+        fixtures: Optional[Mapping[str, Fixture]] = None,
+        default: Optional[Fixture] = None,
+        latency: Latency = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.fixtures = {_fixture_key(query): self._prepare(body) for query, body in (fixtures or {}).items()}
+        self.default = self._prepare(default) if default is not None else None
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.host = host
+        self.port = port
+        self.requests_served = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _prepare(fixture: Fixture) -> Dict[str, bytes]:
+        """Return the body of a fixture, plain and compressed with every installed encoding."""
+        body = _encode(fixture)
+        bodies = {encoding: compress(body, encoding) for encoding in available()}
+        bodies[IDENTITY] = body
+        return bodies
+
+    @property
+    def base_url(self) -> str:
+        """The base URL to pass to a client or transport."""
+        return f"http://{self.host}:{self.port}/res/v1/"
+
+    def _delay(self) -> float:
+        """Draw the latency of the next response."""
+        if callable(self.latency):
+            return self.latency()
+        if isinstance(self.latency, tuple):
+            return self._random.uniform(*self.latency)
+        return self.latency
+
+    def respond(self, path: str, query: str, accept_encoding: str) -> Tuple[int, Dict[str, str], bytes]:
+        """Return the status, headers and body of the response to a request."""
+        with self._lock:
+            self.requests_served += 1
+            draw = self._random.random()
+        delay = self._delay()
+        if delay > 0:
+            time.sleep(delay)
+        if draw < self.rate_limit_rate:
+            return 429, {"Retry-After": "1", "X-RateLimit-Remaining": "0"}, b'{"type": "ErrorResponse"}'
+        if draw < self.rate_limit_rate + self.error_rate:
+            return 500, {}, b'{"type": "ErrorResponse"}'
+        if not path.endswith("/search"):
+            return 404, {}, b'{"type": "ErrorResponse"}'
+        bodies = self.fixtures.get(_fixture_key(query), self.default)
+        if bodies is None:
+            return 404, {}, b'{"type": "ErrorResponse"}'
+        for encoding in split(accept_encoding):
+            if encoding in bodies and encoding != IDENTITY:
+                return 200, {"Content-Encoding": encoding}, bodies[encoding]
+        return 200, {}, bodies[IDENTITY]
+
+    def _handler(self) -> type:
+        """Build the request handler class bound to this server."""
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so clients can reuse connections
+            disable_nagle_algorithm = True  # headers and body are written separately
+
+            def do_GET(self) -> None:  # noqa: N802
+                url = urlsplit(self.path)
+                query = parse_qs(url.query).get("q", [""])[0]
+                status, headers, body = fake.respond(url.path, query, self.headers.get("Accept-Encoding", ""))
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_HEAD(self) -> None:  # noqa: N802
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format: str, *args) -> None:  # noqa: A002
+                logger.debug(format, *args)
+
+        return Handler
+
+    def start(self) -> "FakeBraveServer":
+        """Start serving on a background thread."""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-brave-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and wait for the serving thread to exit."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self) -> "FakeBraveServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main() -> None:
+    """Run a fake server in the foreground."""
+    parser = argparse.ArgumentParser(description="Serve recorded Brave Search API responses locally.")
+    parser.add_argument("fixtures", help="Directory of recorded JSON responses.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each response.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 500.")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with a 429.")
+    parser.add_argument("--default", help="Fixture query served for unmatched queries.")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    server = FakeBraveServer(
+        fixtures=fixtures,
+        default=fixtures.get(args.default) if args.default else None,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        host=args.host,
+        port=args.port,
+    )
+    server.start()
+    logger.info("Serving %d fixtures on %s", len(fixtures), server.base_url)
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,187 @@
+"""
+Strip the text decorations of snippets into clean text, keeping the highlights as offsets.
+
+With `text_decorations=True` (the default), titles, descriptions and extra snippets highlight the query terms with
+`<strong>` tags and escape characters as HTML entities (`&#x27;`, `&quot;`, `&amp;`...). `normalize` turns such a
+string into a `Snippet`: the clean text, with entities unescaped and whitespace collapsed, and the `(start, end)`
+offsets of its highlighted spans in that text, e.g. to bold them again in another markup or to weight them when
+embedding.
+
+Patterns are precompiled, and markup is located with `str.find` rather than by scanning with a regex, so strings
+without decorations are returned as they are after a few substring checks. `strip` skips the offsets for about half
+the cost of the usual per-string `re.sub`, `html.unescape` and `split` (`text.*` benchmarks). `strip_all` and
+`normalize_all` apply the engine to a batch of strings, and `clean_response` to every decorated field of a response,
+parsed or raw, in place.
+"""
+import html
+import re
+
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Tuple
+
+
+# Fields of the responses that carry text decorations.
+DECORATED_FIELDS = frozenset({"title", "description", "extra_snippets", "snippet", "question", "answer"})
+
+# Tags and entities, matched where `str.find` spotted a "<" or a "&": scanning a whole string with a regex of
+# alternatives costs several times more.
+_MARKUP_PATTERN = r"<(/?)strong>|</?[A-Za-z][^<>]*>|&(?:#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);?"
+_MARKUP = re.compile(_MARKUP_PATTERN)
+
+# Markup and whitespace other than single spaces, for the rare strings with irregular whitespace.
+_DECORATION = re.compile(_MARKUP_PATTERN + r"|\s{2,}|[^\S ]")
+
+# `strip` does not track highlights, so it removes every tag at once.
+_TAG = re.compile(r"</?[A-Za-z][^<>]*>")
+
+
+class Snippet(NamedTuple):
+    """Clean text and the `(start, end)` offsets of its highlighted spans."""
+
+    text: str
+    highlights: Tuple[Tuple[int, int], ...] = ()
+
+    def highlighted(self) -> List[str]:
+        """Return the text of the highlighted spans."""
+        return [self.text[start:end] for start, end in self.highlights]
+
+
+def _irregular(text: str) -> bool:
+    """Return whether a string has whitespace to collapse or strip."""
+    return "  " in text or not text.isprintable() or text[:1] == " " or text[-1:] == " "
+
+
+def _markup(text: str) -> Iterator["re.Match[str]"]:
+    """Yield the tags and entities of a string."""
+    find, match = text.find, _MARKUP.match
+    position = 0
+    while True:
+        tag, entity = find("<", position), find("&", position)
+        start = tag if entity < 0 or 0 <= tag < entity else entity
+        if start < 0:
+            return
+        found = match(text, start)
+        if found is None:
+            position = start + 1
+            continue
+        yield found
+        position = found.end()
+
+
+def normalize(text: str) -> Snippet:
+    """Return the clean text of a decorated string, with the offsets of its highlights."""
+    irregular = _irregular(text)
+    if "<" not in text and "&" not in text:
+        return Snippet(" ".join(text.split()) if irregular else text)
+    pieces: List[str] = []
+    highlights: List[Tuple[int, int]] = []
+    length = previous = 0
+    opened = -1
+    for match in _DECORATION.finditer(text) if irregular else _markup(text):
+        start = match.start()
+        if start > previous:
+            length += _append(pieces, text[previous:start])
+        previous = match.end()
+        tag = match.group(1)
+        if tag is not None:  # <strong> or </strong>
+            if not tag:
+                opened = length if opened < 0 else opened
+            elif opened >= 0:
+                if length > opened:
+                    highlights.append((opened, length))
+                opened = -1
+            continue
+        token = match.group()
+        if token[0] == "<":  # any other tag
+            continue
+        if token[0] == "&":
+            token = html.unescape(token)
+        length += _append(pieces, " " if token.isspace() else token)
+    if previous < len(text):
+        length += _append(pieces, text[previous:])
+    if opened >= 0 and length > opened:  # unclosed highlight
+        highlights.append((opened, length))
+    return _trim("".join(pieces), highlights)
+
+
+def _append(pieces: List[str], piece: str) -> int:
+    """Append a piece of clean text, without doubling a space between pieces, and return the length added."""
+    if piece[0] == " " and pieces and pieces[-1][-1] == " ":
+        piece = piece[1:]
+        if not piece:
+            return 0
+    pieces.append(piece)
+    return len(piece)
+
+
+def _trim(text: str, highlights: List[Tuple[int, int]]) -> Snippet:
+    """Strip the surrounding spaces of a text, shifting its highlights along."""
+    stripped = text.strip()
+    if len(stripped) == len(text):
+        return Snippet(text, tuple(highlights))
+    shift, end = len(text) - len(text.lstrip()), len(stripped)
+    spans = ((max(0, start - shift), min(end, stop - shift)) for start, stop in highlights)
+    return Snippet(stripped, tuple((start, stop) for start, stop in spans if stop > start))
+
+
+def strip(text: str) -> str:
+    """Return the clean text of a decorated string, without tracking the highlights."""
+    if "<" in text:
+        text = _TAG.sub("", text)
+    if "&" in text:
+        text = html.unescape(text)
+    return " ".join(text.split()) if _irregular(text) else text
+
+
+def strip_all(texts: Iterable[str]) -> List[str]:
+    """Return the clean text of every string of a batch."""
+    return [strip(text) for text in texts]
+
+
+def normalize_all(texts: Iterable[str]) -> List[Snippet]:
+    """Return the `Snippet` of every string of a batch."""
+    return [normalize(text) for text in texts]
+
+
+def clean_response(response: Any, fields: Iterable[str] = DECORATED_FIELDS) -> Any:
+    """
+    Strip the decorations of every decorated field of a response in place, and return it.
+
+    Parameters:
+    -----------
+    response: Any
+        A response or any part of it: a parsed model, or the raw dictionary returned with `raw=True`.
+    fields: Iterable[str]
+        Names of the fields to clean, strings or lists of strings, wherever they are in the response (default:
+        `DECORATED_FIELDS`).
+    """
+    _clean(response, frozenset(fields))
+    return response
+
+
+def _clean(value: Any, fields: frozenset) -> None:
+    if isinstance(value, list):
+        for item in value:
+            _clean(item, fields)
+        return
+    if isinstance(value, dict):
+        attributes: Dict[str, Any] = value
+    elif hasattr(type(value), "model_fields"):
+        attributes = value.__dict__  # where models keep their fields; writing there skips pydantic's assignment
+    else:
+        return
+    for name, item in attributes.items():
+        if name in fields:
+            if isinstance(item, str):
+                attributes[name] = strip(item)
+                continue
+            if isinstance(item, list) and item and isinstance(item[0], str):
+                attributes[name] = strip_all(item)
+                continue
+        if isinstance(item, (dict, list)) or hasattr(type(item), "model_fields"):
+            _clean(item, fields)
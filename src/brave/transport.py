@@ -0,0 +1,867 @@
+"""
+Pluggable HTTP transports for the Brave Search API clients.
+
+A transport owns everything network related: the base URL, the HTTP library and its session or connection pool,
+and an optional chain of middleware. The clients only build a `Request` and hand it to `transport.send`, so any of
+these can be swapped, e.g. to point the client at `brave.testing.FakeBraveServer` for offline load tests.
+
+A request with a `sink` is sent in passthrough mode: the transport copies the body to the sink chunk by chunk, as it
+comes off the socket and still compressed, and returns a `Passthrough` carrying only the status and headers, so a
+proxy forwarding responses never decompresses, decodes or buffers them.
+
+Pooled transports can open their connections ahead of the first requests (`warm`, `awarm`), ping them when idle so
+neither side closes them (`keepalive`), and replace them once they reach `max_age`, e.g. to follow DNS changes; see
+`brave.dns` for caching the resolution itself.
+"""
+import functools
+import json
+import logging
+import socket
+import threading
+import time
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import AsyncIterable
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from urllib.parse import urlsplit
+
+from brave.encoding import GZIP
+from brave.encoding import decompress
+from brave.encoding import split
+from brave.exceptions import BraveError
+from brave.exceptions import BraveHTTPError
+from brave.metrics import COMPRESSION_RATIO
+from brave.metrics import CONNECT_SECONDS
+from brave.metrics import DECOMPRESS_SECONDS
+from brave.metrics import DOWNLOAD_SECONDS
+from brave.metrics import NULL_METRICS
+from brave.metrics import REQUEST_SECONDS
+from brave.metrics import REQUESTS
+from brave.metrics import RESPONSE_BYTES
+from brave.metrics import RESPONSE_COMPRESSED_BYTES
+from brave.metrics import TTFB_SECONDS
+from brave.metrics import Metrics
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://api.search.brave.com/res/v1/"
+
+# Size of the chunks the bodies of passthrough requests are copied in.
+CHUNK_SIZE = 65536
+
+
+@dataclass
+class Request:
+    """
+    A request to the Brave Search API, relative to the transport base URL.
+
+    `timeout` is the time left for the call in seconds, used as the HTTP timeout of the attempt (default: none),
+    `tag` the caller tag the request is accounted under by a `QuotaLedger` (default: none), `budget` the mode of the
+    quota the client already checked for the call, which the ledger then does not check again (default: none), and
+    `sink` the socket, binary file or callable a successful body is copied to, undecoded, instead of being read
+    (default: none).
+    """
+
+    path: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    headers: Dict[str, str] = field(default_factory=dict)
+    timeout: Optional[float] = None
+    tag: Optional[str] = None
+    budget: Optional[str] = None
+    sink: Optional[Any] = None
+
+
+class Response:
+    """
+    Minimal HTTP response, API compatible with the `requests` and `httpx` responses used by the clients.
+
+    Transports return the native response of their HTTP library; this class is used by middleware that produce
+    responses without network I/O.
+    """
+
+    def __init__(self, status_code: int, content: bytes = b"", headers: Optional[Mapping[str, str]] = None) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.headers = dict(headers or {})
+
+    @property
+    def text(self) -> str:
+        """The body decoded as UTF-8."""
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        """The body decoded as JSON."""
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        """Raise a `BraveHTTPError` for 4xx and 5xx responses."""
+        if self.status_code >= 400:
+            raise BraveHTTPError(f"HTTP {self.status_code}: {self.text}", status_code=self.status_code)
+
+
+class Passthrough(Response):
+    """
+    Response of a request with a `sink`: the body went to the sink as it arrived and is not kept.
+
+    `headers` are those of the HTTP library, so `Content-Encoding` tells how the bytes written are encoded, and `size`
+    is the number of bytes written.
+    """
+
+    def __init__(self, status_code: int, headers: Optional[Mapping[str, str]] = None, size: int = 0) -> None:
+        super().__init__(status_code)
+        self.headers = headers if headers is not None else {}
+        self.size = size
+
+
+def writer(sink: Any) -> Callable[[bytes], Any]:
+    """Return the function writing bytes to a sink: a socket (`sendall`), a binary file or stream, or a callable."""
+    for name in ("sendall", "write"):
+        method = getattr(sink, name, None)
+        if method is not None:
+            return method
+    if callable(sink):
+        return sink
+    raise BraveError(f"Cannot write to {sink!r}: expected a socket, a binary file or a callable")
+
+
+def _interrupted(request: Request, written: int, exception: BaseException) -> BraveError:
+    """
+    Return the error to raise when a passthrough body breaks off once the sink got some of it. It is not retried:
+    the sink cannot take the bytes back.
+    """
+    return BraveError(f"Passthrough of {request.path} interrupted after {written} bytes: {exception!r}")
+
+
+def _copy(request: Request, chunks: Iterable[bytes], write: Callable[[bytes], Any]) -> int:
+    """Copy chunks to a sink and return the number of bytes written."""
+    written, started = 0, False
+    try:
+        for chunk in chunks:
+            started = True
+            write(chunk)
+            written += len(chunk)
+    except Exception as exception:
+        if not started:
+            raise
+        raise _interrupted(request, written, exception) from exception
+    return written
+
+
+async def _acopy(request: Request, chunks: AsyncIterable[bytes], write: Callable[[bytes], Any]) -> int:
+    """Copy chunks to a sink and return the number of bytes written."""
+    written, started = 0, False
+    try:
+        async for chunk in chunks:
+            started = True
+            write(chunk)
+            written += len(chunk)
+    except Exception as exception:
+        if not started:
+            raise
+        raise _interrupted(request, written, exception) from exception
+    return written
+
+
+class Middleware:
+    """
+    Hooks run by a transport around every request.
+
+    Middleware is synchronous so the same instance works with both sync and async transports. Override
+    `before_request` to inspect or modify a request, or return a response to skip the network entirely,
+    `after_response` to inspect or replace the response, and `on_error` to observe requests that raised.
+    """
+
+    def before_request(self, request: Request) -> Optional[Any]:
+        """Called before a request is sent. Return a response to short-circuit the request."""
+        return None
+
+    def after_response(self, request: Request, response: Any) -> Any:
+        """Called with every response, including short-circuited ones. Return the response to use."""
+        return response
+
+    def on_error(self, request: Request, exception: BaseException) -> None:
+        """Called instead of `after_response` when sending the request raised, including from another middleware."""
+        pass
+
+
+def _before_request(chain: Sequence[Middleware], request: Request) -> Optional[Any]:
+    """Run the `before_request` hooks, stopping at the first middleware that returns a response."""
+    for middleware in chain:
+        response = middleware.before_request(request)
+        if response is not None:
+            return response
+    return None
+
+
+def _after_response(chain: Sequence[Middleware], request: Request, response: Any) -> Any:
+    """Run the `after_response` hooks in reverse order."""
+    for middleware in reversed(chain):
+        response = middleware.after_response(request, response)
+    return response
+
+
+def _on_error(chain: Sequence[Middleware], request: Request, exception: BaseException) -> None:
+    """Run the `on_error` hooks in reverse order."""
+    for middleware in reversed(chain):
+        middleware.on_error(request, exception)
+
+
+def _options(request: Request) -> Dict[str, Any]:
+    """Return the keyword arguments of the HTTP library call, leaving its default timeout alone when none is set."""
+    options = {"headers": request.headers, "params": request.params}
+    if request.timeout is not None:
+        options["timeout"] = request.timeout
+    return options
+
+
+def _endpoint(request: Request) -> str:
+    """Return the endpoint of a request, used to tag its metrics."""
+    return request.path.split("/", 1)[0]
+
+
+def _report(metrics: Metrics, request: Request, response: Any, seconds: float) -> None:
+    """Report the duration, status and body sizes of an HTTP attempt."""
+    endpoint = _endpoint(request)
+    metrics.observe(REQUEST_SECONDS, seconds, endpoint=endpoint)
+    metrics.increment(REQUESTS, endpoint=endpoint, status=str(response.status_code))
+    if isinstance(response, Passthrough):  # the body was never decompressed
+        metrics.observe(RESPONSE_COMPRESSED_BYTES, response.size, endpoint=endpoint)
+        return
+    size = len(response.content)
+    metrics.observe(RESPONSE_BYTES, size, endpoint=endpoint)
+    compressed = response.headers.get("Content-Length") if response.headers.get("Content-Encoding") else None
+    metrics.observe(RESPONSE_COMPRESSED_BYTES, int(compressed) if compressed else size, endpoint=endpoint)
+
+
+def _decode(metrics: Metrics, request: Request, headers: Any, compressed: bytes) -> bytes:
+    """Decompress a body read undecoded, reporting the time it took and the compression ratio."""
+    encoding = headers.get("Content-Encoding")
+    if not encoding:
+        return compressed
+    start = time.perf_counter()
+    content = decompress(compressed, encoding)
+    endpoint = _endpoint(request)
+    metrics.observe(DECOMPRESS_SECONDS, time.perf_counter() - start, endpoint=endpoint, encoding=encoding)
+    metrics.observe(COMPRESSION_RATIO, len(content) / max(1, len(compressed)), endpoint=endpoint, encoding=encoding)
+    return content
+
+
+@functools.lru_cache(maxsize=None)
+def _httpx_encodings() -> Tuple[str, ...]:
+    """Return the content encodings `httpx` decodes, which depend on the packages installed."""
+    try:
+        from httpx._decoders import SUPPORTED_DECODERS
+    except ImportError:
+        return (GZIP,)
+    return tuple(SUPPORTED_DECODERS)
+
+
+class _HTTPXTrace:
+    """Collects the httpcore trace events of one request to split its duration into phases."""
+
+    def __init__(self) -> None:
+        self.events: Dict[str, float] = {}
+
+    def __call__(self, name: str, info: Dict[str, Any]) -> None:
+        self.events[name.split(".", 1)[1] if name.startswith(("http11.", "http2.")) else name] = time.perf_counter()
+
+    async def atrace(self, name: str, info: Dict[str, Any]) -> None:
+        """Asynchronous trace callback, required by `httpx.AsyncClient`."""
+        self(name, info)
+
+    def report(self, metrics: Metrics, request: Request, end: float) -> None:
+        """Report the connect, time to first byte and download phases."""
+        events, endpoint = self.events, _endpoint(request)
+        connect_started = events.get("connection.connect_tcp.started")
+        connected = events.get("connection.start_tls.complete", events.get("connection.connect_tcp.complete"))
+        if connect_started is not None and connected is not None:
+            metrics.observe(CONNECT_SECONDS, connected - connect_started, endpoint=endpoint)
+        sent = events.get("send_request_headers.started")
+        headers = events.get("receive_response_headers.complete")
+        if sent is not None and headers is not None:
+            metrics.observe(TTFB_SECONDS, headers - sent, endpoint=endpoint)
+            metrics.observe(DOWNLOAD_SECONDS, end - headers, endpoint=endpoint)
+
+
+def _expired(transport: Any) -> bool:
+    """Note a use of the connections of a transport, and return whether they reached `max_age` and must be replaced."""
+    now = time.monotonic()
+    transport._used = now
+    if transport.max_age is None or now - transport._born < transport.max_age:
+        return False
+    transport._born = now
+    return True
+
+
+def _concurrently(function: Callable[[], Any], count: int) -> int:
+    """
+    Call a function from `count` threads at once, so each call holds its own pooled connection, and return how many
+    calls succeeded; failures are logged.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    barrier = threading.Barrier(count)
+
+    def call(_: int) -> bool:
+        try:
+            barrier.wait(timeout=1.0)
+        except threading.BrokenBarrierError:
+            pass
+        try:
+            function()
+        except Exception as error:
+            logger.warning("Warm-up request failed: %s", error)
+            return False
+        return True
+
+    with ThreadPoolExecutor(count, thread_name_prefix="brave-warm") as pool:
+        return sum(pool.map(call, range(count)))
+
+
+def _timeout(timeout: Optional[float]) -> Dict[str, float]:
+    """Return the timeout keyword argument of an HTTP library call, leaving its default alone when none is set."""
+    return {"timeout": timeout} if timeout is not None else {}
+
+
+class BaseTransport:
+    """
+    Synchronous transport. Subclasses implement `handle` with the HTTP library of their choice.
+
+    Parameters:
+    -----------
+    base_url: str
+        The URL requests are relative to (default: the Brave Search API).
+    middleware: Sequence[Middleware]
+        Middleware run around every request, in order.
+    metrics: Metrics
+        Sink for request timings and sizes (default: none).
+    keepalive: float
+        Once warmed, seconds of idleness after which the warmed connections are pinged again (default: never).
+    max_age: float
+        Seconds after which the pooled connections are replaced by new ones (default: never).
+    """
+
+    # Content encodings the HTTP library decodes; see `brave.encoding`.
+    encodings: Tuple[str, ...] = (GZIP,)
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        middleware: Sequence[Middleware] = (),
+        metrics: Optional[Metrics] = None,
+        keepalive: Optional[float] = None,
+        max_age: Optional[float] = None,
+    ) -> None:
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.middleware = list(middleware)
+        self.metrics = metrics or NULL_METRICS
+        self.keepalive = keepalive
+        self.max_age = max_age
+        self._warmed = 0  # connections kept warm
+        self._used = self._born = time.monotonic()
+        self._pinger: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def send(self, request: Request) -> Any:
+        """Send a request through the middleware chain."""
+        if _expired(self):
+            self.recycle()
+        try:
+            response = _before_request(self.middleware, request)
+            if response is None:
+                if self.metrics.enabled:
+                    start = time.perf_counter()
+                    response = self.handle(request)
+                    _report(self.metrics, request, response, time.perf_counter() - start)
+                else:
+                    response = self.handle(request)
+        except BaseException as exception:
+            _on_error(self.middleware, request, exception)
+            raise
+        return _after_response(self.middleware, request, response)
+
+    def handle(self, request: Request) -> Any:
+        """Perform the HTTP request."""
+        raise NotImplementedError
+
+    def warm(self, connections: int = 1, timeout: Optional[float] = None) -> int:
+        """
+        Open `connections` pooled connections to the base URL ahead of the first requests, and return how many
+        answered. With `keepalive` set, they are pinged again whenever they are idle that long, until `close`.
+        """
+        warmed = self._warm(max(1, connections), timeout)
+        self._warmed = max(self._warmed, connections)
+        if self.keepalive is not None and self._pinger is None:
+            self._stopped = threading.Event()  # its own, so a pinger stopped by `close` never resumes
+            self._pinger = threading.Thread(
+                target=self._keep_alive, args=(self._stopped,), name="brave-keepalive", daemon=True
+            )
+            self._pinger.start()
+        return warmed
+
+    def _warm(self, connections: int, timeout: Optional[float]) -> int:
+        """Open connections; a transport without a connection pool has none to open."""
+        return 0
+
+    def _keep_alive(self, stopped: threading.Event) -> None:
+        """Ping the warmed connections whenever they have been idle for `keepalive` seconds, until `stopped`."""
+        delay = self.keepalive
+        while not stopped.wait(delay):
+            idle = time.monotonic() - self._used
+            if idle < self.keepalive:
+                delay = self.keepalive - idle
+                continue
+            if _expired(self):
+                self.recycle()
+            try:
+                self._warm(self._warmed, self.keepalive)
+            except Exception:
+                logger.debug("Keep-alive ping to %s failed", self.base_url, exc_info=True)
+            delay = self.keepalive
+
+    def recycle(self) -> None:
+        """Replace the pooled connections by new ones, as `max_age` does."""
+        pass
+
+    def close(self) -> None:
+        """Release any connections held by the transport, and stop the keep-alive pings."""
+        if self._pinger is not None:
+            self._stopped.set()
+            self._pinger = None
+
+
+class AsyncBaseTransport:
+    """
+    Asynchronous transport. Subclasses implement `handle` with the HTTP library of their choice.
+
+    Parameters:
+    -----------
+    base_url: str
+        The URL requests are relative to (default: the Brave Search API).
+    middleware: Sequence[Middleware]
+        Middleware run around every request, in order.
+    metrics: Metrics
+        Sink for request timings and sizes (default: none).
+    keepalive: float
+        Once warmed, seconds of idleness after which the warmed connections are pinged again (default: never).
+    max_age: float
+        Seconds after which the pooled connections are replaced by new ones (default: never).
+    """
+
+    # Content encodings the HTTP library decodes; see `brave.encoding`.
+    encodings: Tuple[str, ...] = (GZIP,)
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        middleware: Sequence[Middleware] = (),
+        metrics: Optional[Metrics] = None,
+        keepalive: Optional[float] = None,
+        max_age: Optional[float] = None,
+    ) -> None:
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.middleware = list(middleware)
+        self.metrics = metrics or NULL_METRICS
+        self.keepalive = keepalive
+        self.max_age = max_age
+        self._warmed = 0  # connections kept warm
+        self._used = self._born = time.monotonic()
+        self._pinger: Optional[Any] = None  # an `asyncio.Task`
+
+    async def send(self, request: Request) -> Any:
+        """Send a request through the middleware chain."""
+        if _expired(self):
+            await self.arecycle()
+        try:
+            response = _before_request(self.middleware, request)
+            if response is None:
+                if self.metrics.enabled:
+                    start = time.perf_counter()
+                    response = await self.handle(request)
+                    _report(self.metrics, request, response, time.perf_counter() - start)
+                else:
+                    response = await self.handle(request)
+        except BaseException as exception:
+            _on_error(self.middleware, request, exception)
+            raise
+        return _after_response(self.middleware, request, response)
+
+    async def handle(self, request: Request) -> Any:
+        """Perform the HTTP request."""
+        raise NotImplementedError
+
+    async def awarm(self, connections: int = 1, timeout: Optional[float] = None) -> int:
+        """
+        Open `connections` pooled connections to the base URL ahead of the first requests, and return how many
+        answered. With `keepalive` set, they are pinged again whenever they are idle that long, until `aclose`.
+        """
+        import asyncio
+
+        warmed = await self._awarm(max(1, connections), timeout)
+        self._warmed = max(self._warmed, connections)
+        if self.keepalive is not None and (self._pinger is None or self._pinger.done()):
+            self._pinger = asyncio.ensure_future(self._keep_alive())
+        return warmed
+
+    async def _awarm(self, connections: int, timeout: Optional[float]) -> int:
+        """Open connections; a transport without a connection pool has none to open."""
+        return 0
+
+    async def _keep_alive(self) -> None:
+        """Ping the warmed connections whenever they have been idle for `keepalive` seconds, until closed."""
+        import asyncio
+
+        delay = self.keepalive
+        while True:
+            await asyncio.sleep(delay)
+            idle = time.monotonic() - self._used
+            if idle < self.keepalive:
+                delay = self.keepalive - idle
+                continue
+            if _expired(self):
+                await self.arecycle()
+            try:
+                await self._awarm(self._warmed, self.keepalive)
+            except Exception:
+                logger.debug("Keep-alive ping to %s failed", self.base_url, exc_info=True)
+            delay = self.keepalive
+
+    async def arecycle(self) -> None:
+        """Replace the pooled connections by new ones, as `max_age` does."""
+        pass
+
+    async def aclose(self) -> None:
+        """Release any connections held by the transport, and stop the keep-alive pings."""
+        if self._pinger is not None:
+            self._pinger.cancel()
+            self._pinger = None
+
+
+class RequestsTransport(BaseTransport):
+    """
+    Synchronous transport built on `requests`.
+
+    Without a session every request opens a new connection; pass a `requests.Session` to reuse pooled connections.
+    `requests` does not expose connection timings, so only the time to first byte and download phases are reported.
+    With metrics enabled, bodies are read undecoded and decompressed by `brave.encoding`, to time decompression.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, session: Optional[Any] = None, **kwargs) -> None:
+        super().__init__(base_url=base_url, **kwargs)
+        self.session = session
+
+    @property
+    def encodings(self) -> Tuple[str, ...]:
+        """The content encodings urllib3 decodes, which depend on the packages installed."""
+        from urllib3.util.request import ACCEPT_ENCODING
+
+        return split(ACCEPT_ENCODING)
+
+    def handle(self, request: Request) -> Any:
+        """Perform the HTTP request with `requests`."""
+        import requests
+
+        sender = self.session if self.session is not None else requests
+        if request.sink is not None:
+            return self._passthrough(sender, request)
+        if not self.metrics.enabled:
+            return sender.get(self.base_url + request.path, **_options(request))
+        start = time.perf_counter()
+        response = sender.get(self.base_url + request.path, stream=True, **_options(request))
+        compressed = response.raw.read(decode_content=False)
+        total = time.perf_counter() - start
+        # Set where `response.content` reads it from, as `requests` itself does once it has read the body.
+        response._content = _decode(self.metrics, request, response.headers, compressed)
+        response._content_consumed = True
+        response.close()  # returns the connection to the pool
+        ttfb = response.elapsed.total_seconds()  # from sending the request until the headers are parsed
+        self.metrics.observe(TTFB_SECONDS, ttfb, endpoint=_endpoint(request))
+        self.metrics.observe(DOWNLOAD_SECONDS, max(total - ttfb, 0.0), endpoint=_endpoint(request))
+        return response
+
+    def _warm(self, connections: int, timeout: Optional[float]) -> int:
+        """Send concurrent HEAD requests to the base URL through the session; without one, only resolve its host."""
+        if self.session is None:  # every request opens its own connection
+            url = urlsplit(self.base_url)
+            socket.getaddrinfo(url.hostname, url.port or (443 if url.scheme == "https" else 80), 0, socket.SOCK_STREAM)
+            return 0
+        return _concurrently(lambda: self.session.head(self.base_url, **_timeout(timeout)).close(), connections)
+
+    def recycle(self) -> None:
+        """Close the pooled connections of the session, those in use once they are released."""
+        if self.session is not None:
+            self.session.close()  # the session opens new pools on its next request
+
+    def _passthrough(self, sender: Any, request: Request) -> Any:
+        """Copy the raw body of a successful response to the sink of the request."""
+        with sender.get(self.base_url + request.path, stream=True, **_options(request)) as response:
+            if response.status_code != 200:
+                response.content  # read the error for the client to report
+                return response
+            chunks = response.raw.stream(CHUNK_SIZE, decode_content=False)
+            size = _copy(request, chunks, writer(request.sink))
+        return Passthrough(response.status_code, response.headers, size)
+
+    def close(self) -> None:
+        """Close the session, if any."""
+        super().close()
+        if self.session is not None:
+            self.session.close()
+
+
+class HTTPXTransport(BaseTransport):
+    """
+    Synchronous transport built on `httpx`, reusing a single pooled `httpx.Client`.
+
+    With metrics enabled, bodies are read undecoded and decompressed by `brave.encoding`, to time decompression.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, client: Optional[Any] = None, **kwargs) -> None:
+        super().__init__(base_url=base_url, **kwargs)
+        self.client = client
+        self.encodings = _httpx_encodings()
+        self._owns_client = client is None
+        self._retired: List[Any] = []  # clients replaced by `recycle`, closed once their requests are done
+        self._in_flight: Dict[Any, int] = {}  # requests in flight per client
+        self._lock = threading.Lock()
+
+    def _get_client(self) -> Any:
+        """Return the client, creating it on first use."""
+        if self.client is None:
+            import httpx
+
+            self.client = httpx.Client()
+        return self.client
+
+    def _lease(self) -> Any:
+        """Return the client and count a request in flight on it."""
+        with self._lock:
+            client = self._get_client()
+            self._in_flight[client] = self._in_flight.get(client, 0) + 1
+        return client
+
+    def _release(self, client: Any) -> None:
+        """Count a request of a client as done, and close the client if it was retired and is now idle."""
+        with self._lock:
+            self._in_flight[client] -= 1
+            if self._in_flight[client] or client not in self._retired:
+                return
+            del self._in_flight[client]
+            self._retired.remove(client)
+        client.close()
+
+    def handle(self, request: Request) -> Any:
+        """Perform the HTTP request with `httpx`."""
+        client = self._lease()
+        try:
+            return self._handle(client, request)
+        finally:
+            self._release(client)
+
+    def _handle(self, client: Any, request: Request) -> Any:
+        url = self.base_url + request.path
+        if request.sink is not None:
+            with client.stream("GET", url, **_options(request)) as response:
+                if response.status_code != 200:
+                    response.read()
+                    return response
+                size = _copy(request, response.iter_raw(CHUNK_SIZE), writer(request.sink))
+            return Passthrough(response.status_code, response.headers, size)
+        if not self.metrics.enabled:
+            return client.get(url, **_options(request))
+        trace = _HTTPXTrace()
+        with client.stream("GET", url, **_options(request), extensions={"trace": trace}) as response:
+            compressed = b"".join(response.iter_raw())
+        trace.report(self.metrics, request, time.perf_counter())
+        # Set where `response.content` reads it from, as `httpx` itself does once it has read the body.
+        response._content = _decode(self.metrics, request, response.headers, compressed)
+        return response
+
+    def _warm(self, connections: int, timeout: Optional[float]) -> int:
+        """Send concurrent HEAD requests to the base URL."""
+
+        def head() -> None:
+            client = self._lease()
+            try:
+                client.head(self.base_url, **_timeout(timeout))
+            finally:
+                self._release(client)
+
+        return _concurrently(head, connections)
+
+    def recycle(self) -> None:
+        """
+        Start a new client of the transport's own; the previous one is closed once its requests in flight are done.
+        A client given to the transport is left alone.
+        """
+        with self._lock:
+            if not self._owns_client or self.client is None:
+                return
+            retired, self.client = self.client, None
+            if self._in_flight.get(retired):
+                self._retired.append(retired)
+                return
+            self._in_flight.pop(retired, None)
+        retired.close()
+
+    def close(self) -> None:
+        """Close the client, if any, and the retired ones."""
+        super().close()
+        with self._lock:
+            clients, self._retired = self._retired, []
+        for client in clients:
+            client.close()
+        if self.client is not None:
+            self.client.close()
+
+
+class AsyncHTTPXTransport(AsyncBaseTransport):
+    """
+    Asynchronous transport built on `httpx`, reusing a single pooled `httpx.AsyncClient`.
+
+    When no client is given one is created on first use. Because an `httpx.AsyncClient` is bound to the event loop
+    it was first used on, the transport keeps one client per event loop it is used from, and `aclose` closes those
+    whose loops are still open; a loop closed with its client still open leaves the client's connections to the
+    garbage collector. With metrics enabled, bodies are read undecoded and decompressed by `brave.encoding`, to time
+    decompression.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, client: Optional[Any] = None, **kwargs) -> None:
+        super().__init__(base_url=base_url, **kwargs)
+        self.client = client
+        self.encodings = _httpx_encodings()
+        self._owns_client = client is None
+        self._clients: Dict[Any, Any] = {}  # clients of the transport's own, per event loop
+        self._retired: Dict[Any, Any] = {}  # clients replaced by `arecycle`, and their loops, closed once idle
+        self._in_flight: Dict[Any, int] = {}  # requests in flight per client
+
+    def _get_client(self) -> Any:
+        """Return the client for the running event loop."""
+        if not self._owns_client:
+            return self.client
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            import httpx
+
+            for closed in [other for other in self._clients if other.is_closed()]:
+                del self._clients[closed]  # cannot be closed anymore
+            client = self._clients[loop] = httpx.AsyncClient()
+        self.client = client
+        return client
+
+    def _lease(self) -> Any:
+        """Return the client and count a request in flight on it."""
+        client = self._get_client()
+        self._in_flight[client] = self._in_flight.get(client, 0) + 1
+        return client
+
+    async def _release(self, client: Any) -> None:
+        """Count a request of a client as done, and close the client if it was retired and is now idle."""
+        self._in_flight[client] -= 1
+        if self._in_flight[client] or client not in self._retired:
+            return
+        del self._in_flight[client]
+        del self._retired[client]
+        await client.aclose()
+
+    async def handle(self, request: Request) -> Any:
+        """Perform the HTTP request with `httpx`."""
+        client = self._lease()
+        try:
+            return await self._handle(client, request)
+        finally:
+            await self._release(client)
+
+    async def _handle(self, client: Any, request: Request) -> Any:
+        url = self.base_url + request.path
+        if request.sink is not None:
+            async with client.stream("GET", url, **_options(request)) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    return response
+                size = await _acopy(request, response.aiter_raw(CHUNK_SIZE), writer(request.sink))
+            return Passthrough(response.status_code, response.headers, size)
+        if not self.metrics.enabled:
+            return await client.get(url, **_options(request))
+        trace = _HTTPXTrace()
+        async with client.stream("GET", url, **_options(request), extensions={"trace": trace.atrace}) as response:
+            compressed = b"".join([chunk async for chunk in response.aiter_raw()])
+        trace.report(self.metrics, request, time.perf_counter())
+        # Set where `response.content` reads it from, as `httpx` itself does once it has read the body.
+        response._content = _decode(self.metrics, request, response.headers, compressed)
+        return response
+
+    async def _awarm(self, connections: int, timeout: Optional[float]) -> int:
+        """Send concurrent HEAD requests to the base URL."""
+        import asyncio
+
+        async def head() -> None:
+            client = self._lease()
+            try:
+                await client.head(self.base_url, **_timeout(timeout))
+            finally:
+                await self._release(client)
+
+        results = await asyncio.gather(*(head() for _ in range(connections)), return_exceptions=True)
+        failures = [result for result in results if isinstance(result, BaseException)]
+        for failure in failures:
+            logger.warning("Warm-up request failed: %s", failure)
+        return connections - len(failures)
+
+    async def arecycle(self) -> None:
+        """
+        Start a new client of the transport's own; the previous one is closed once its requests in flight are done.
+        A client given to the transport is left alone.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        retired = self._clients.pop(loop, None) if self._owns_client else None
+        if retired is None:
+            return
+        if self.client is retired:
+            self.client = None
+        if self._in_flight.get(retired):
+            self._retired[retired] = loop
+            return
+        self._in_flight.pop(retired, None)
+        await retired.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Close the client, if any, and the retired ones. Clients of other event loops are closed on their loop if it
+        is running, kept for an `aclose` from their loop if it is idle, and left to the garbage collector if it is
+        closed.
+        """
+        import asyncio
+
+        await super().aclose()
+        if not self._owns_client:
+            if self.client is not None:
+                await self.client.aclose()
+            return
+        current = asyncio.get_running_loop()
+        self.client = None
+        owned = [(self._clients, loop, loop, client) for loop, client in self._clients.items()]
+        owned += [(self._retired, client, loop, client) for client, loop in self._retired.items()]
+        for clients, key, loop, client in owned:
+            if loop is current:
+                await client.aclose()
+            elif loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            elif not loop.is_closed():
+                continue
+            del clients[key]
@@ -1,2 +1,37 @@
-from .image.image_search_response import ImageSearchApiResponse
-from .web.web_search_response import WebSearchApiResponse
+"""
+Pydantic models of the Brave Search API responses.
+
+The response models are imported lazily (PEP 562) and build their validation schemas on first use
+(`defer_build`), so importing a module that only references them costs almost nothing.
+"""
+import importlib
+
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import List
+
+
+if TYPE_CHECKING:
+    from .image.image_search_response import ImageSearchApiResponse
+    from .web.web_search_response import WebSearchApiResponse
+
+__all__ = ["ImageSearchApiResponse", "WebSearchApiResponse"]
+
+# Public attribute -> module defining it.
+_LAZY_ATTRIBUTES = {
+    "ImageSearchApiResponse": ".image.image_search_response",
+    "WebSearchApiResponse": ".web.web_search_response",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,9 @@
+"""
+Uniform access to the fields of responses, parsed into models or decoded as raw dictionaries.
+"""
+from typing import Any
+
+
+def get_field(value: Any, name: str) -> Any:
+    """Return a field of a model or of a raw dictionary, or None."""
+    return value.get(name) if isinstance(value, dict) else getattr(value, name, None)
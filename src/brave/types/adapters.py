@@ -0,0 +1,80 @@
+"""
+Validator warm-up and shared `TypeAdapter`s for the response models.
+
+The models defer building their validators until first use, so the first response parsed in a process pays for
+building the whole nested schema. `warmup` builds them ahead of time, e.g. in a pre-fork server before the workers
+are forked, so the cost is paid once and the built validators are shared copy-on-write by every worker.
+
+Sub-models parsed on their own, such as lists of news, video or location results, should go through
+`type_adapter`, which builds one `TypeAdapter` per type and reuses it instead of rebuilding it on every call.
+"""
+import functools
+import time
+
+from typing import Any
+from typing import List
+from typing import Type
+
+from pydantic import BaseModel
+from pydantic import TypeAdapter
+
+from .image.image_result import ImageResult
+from .image.image_search_response import ImageSearchApiResponse
+from .web.discussions import DiscussionResult
+from .web.location_result import LocationResult
+from .web.news import NewsResult
+from .web.product import Product
+from .web.search_result import SearchResult
+from .web.videos import VideoResult
+from .web.web_search_response import WebSearchApiResponse
+
+
+# Models validated as whole API responses.
+RESPONSE_MODELS = (WebSearchApiResponse, ImageSearchApiResponse)
+
+# Sub-model lists commonly validated on their own, e.g. results cached or stored separately from their response.
+ADAPTED_TYPES = (
+    List[SearchResult],
+    List[NewsResult],
+    List[VideoResult],
+    List[LocationResult],
+    List[DiscussionResult],
+    List[Product],
+    List[ImageResult],
+)
+
+
+@functools.lru_cache(maxsize=None)
+def type_adapter(type_: Any) -> TypeAdapter:
+    """
+    Return the shared `TypeAdapter` of a type, building it on first use.
+
+    Example: `type_adapter(List[NewsResult]).validate_python(payload["news"]["results"])`.
+    """
+    return TypeAdapter(type_)
+
+
+def build(model: Type[BaseModel]) -> None:
+    """Build the validator and serializer of a model now, if they were deferred."""
+    if not model.__pydantic_complete__:
+        model.model_rebuild(force=True)
+
+
+def warmup(*types: Any) -> float:
+    """
+    Build the validators of the response models and of the shared sub-model adapters, and return the seconds spent.
+
+    Parameters:
+    -----------
+    types:
+        Additional models or types to build; models are built directly, other types get a shared `TypeAdapter`.
+    """
+    start = time.perf_counter()
+    for model in RESPONSE_MODELS:
+        build(model)
+    for type_ in ADAPTED_TYPES + types:
+        if isinstance(type_, type) and issubclass(type_, BaseModel):
+            build(type_)
+        else:
+            type_adapter(type_)
+    return time.perf_counter() - start
@@ -1,10 +1,13 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 
 class Query(BaseModel):
     """A model representing information gathered around the requested query."""
 
+    model_config = ConfigDict(defer_build=True)
+
     original: str = Field(description="The original query that was requested.")
     altered: str = Field(
         description="The altered query by the spellchecker. This is the query that is used to search."
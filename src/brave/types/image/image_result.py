@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 from pydantic import HttpUrl
 
@@ -10,6 +11,8 @@ from .properties import Properties
 class ImageResult(BaseModel):
     """A model representing an image result for the requested query."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str = Field(
         default="image_result", description="The type of image search API result. The value is always image_result."
     )
@@ -1,6 +1,7 @@
 from typing import List
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from .image_query import Query
@@ -10,6 +11,8 @@ from .image_result import ImageResult
 class ImageSearchApiResponse(BaseModel):
     """Top level response model for successful Image Search API requests."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str = Field(default="images", description="The type of search API result. The value is always images.")
     query: Query = Field(description="Image search query string.")
     results: List[ImageResult] = Field(description="The list of image results for the given query.")
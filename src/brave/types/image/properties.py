@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 from pydantic import HttpUrl
 
@@ -6,5 +7,7 @@ from pydantic import HttpUrl
 class Properties(BaseModel):
     """Metadata on an image."""
 
+    model_config = ConfigDict(defer_build=True)
+
     url: HttpUrl = Field(description="The image URL.")
     placeholder: HttpUrl = Field(description="The lower resolution placeholder image URL.")
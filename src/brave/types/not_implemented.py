@@ -1,61 +1,62 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 
 
 class Video(BaseModel):  # Replace with actual model definition
     """Video model"""
 
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class Movie(BaseModel):  # Replace with actual model definition
     """Movie model"""
 
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class CreativeWork(BaseModel):  # Replace with actual model definition
     """CreativeWork model"""
 
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class MusicRecording(BaseModel):  # Replace with actual model definition
     """MusicRecording model"""
 
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class Software(BaseModel):  # Replace with actual model definition
     """Software model"""
 
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class Discussions(BaseModel):  # Replace with actual model definition
     """Discussions model"""
 
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class GraphInfobox(BaseModel):  # Replace with actual model definition
     """GraphInfobox model"""
 
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class News(BaseModel):  # Replace with actual model definition
     """News model"""
 
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class Videos(BaseModel):  # Replace with actual model definition
     """Videos model"""
 
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class DeepResult(BaseModel):  # Replace with actual model definition
     """DeepResult model"""
 
-    pass
+    model_config = ConfigDict(defer_build=True)
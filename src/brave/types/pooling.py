@@ -0,0 +1,214 @@
+"""
+Opt-in sharing of the repeated values and sub-objects of parsed responses.
+
+Across thousands of results, the same hostnames, netlocs, favicons, schemes, languages and profiles come back over and
+over, and each parse builds its own objects for them. An `ObjectPool` walks a parsed response once and replaces:
+
+- the strings and URLs of `INTERNED_FIELDS` by a single shared instance per distinct value;
+- every `MetaUrl`, `Profile` and `Thumbnail` by a shared frozen copy (`FrozenMetaUrl`, `FrozenProfile`,
+  `FrozenThumbnail`), one per distinct set of field values. The frozen copies are subclasses, so they are drop-in
+  replacements, but assigning to their fields raises: a change to one would otherwise show in every result sharing it.
+  Being of other classes, they do not compare equal to the originals; compare `model_dump()`s instead.
+
+The pool is bounded: past `maxsize` distinct values, the oldest ones are forgotten, which only means a
+later occurrence gets a new shared instance. Pass a pool to a client (`Brave(pool=ObjectPool())`) to apply it to every
+parsed response; raw responses are left untouched. See the `memory.*` benchmarks for the savings on batches of
+responses.
+"""
+import functools
+import threading
+
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import get_args
+
+from pydantic import BaseModel
+from pydantic import ConfigDict
+
+from .shared.meta_url import MetaUrl
+from .shared.thumbnail import Thumbnail
+from .web.profile import Profile
+
+
+# Fields whose values, strings or URLs, repeat across results and responses.
+INTERNED_FIELDS = frozenset(
+    {
+        "type",
+        "subtype",
+        "language",
+        "scheme",
+        "netloc",
+        "hostname",
+        "favicon",
+        "name",
+        "long_name",
+        "img",
+        "content_type",
+        "source",
+        "country",
+    }
+)
+
+
+class FrozenMetaUrl(MetaUrl):
+    """A `MetaUrl` shared by several results, which cannot be modified."""
+
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
+
+class FrozenProfile(Profile):
+    """A `Profile` shared by several results, which cannot be modified."""
+
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
+
+class FrozenThumbnail(Thumbnail):
+    """A `Thumbnail` shared by several results, which cannot be modified."""
+
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
+
+# Sub-models replaced by shared frozen copies.
+FROZEN_MODELS: Dict[Type[BaseModel], Type[BaseModel]] = {
+    MetaUrl: FrozenMetaUrl,
+    Profile: FrozenProfile,
+    Thumbnail: FrozenThumbnail,
+}
+_SHARED_MODELS = frozenset(FROZEN_MODELS.values())
+
+
+def is_url(value: Any) -> bool:
+    """Return whether a value is an immutable URL object of `pydantic`."""
+    return hasattr(type(value), "unicode_string")
+
+
+def _may_hold_models(annotation: Any) -> bool:
+    """Return whether a field of this type may hold a model, directly or in a list."""
+    if annotation is Any:
+        return True
+    arguments = get_args(annotation)
+    if arguments:
+        return any(_may_hold_models(argument) for argument in arguments)
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+@functools.lru_cache(maxsize=None)
+def _is_model(kind: type) -> bool:
+    """Return whether a type is a model; cached, as `isinstance` checks against models go through `ABCMeta`."""
+    return issubclass(kind, BaseModel)
+
+
+@functools.lru_cache(maxsize=None)
+def _plan(model: Type[BaseModel]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Return the fields of a model the walk visits: those that may hold models, and those of shared values.
+
+    Skipping every other field, e.g. descriptions and lists of snippets, makes the walk several times faster.
+    """
+    fields = model.model_fields
+    nested = tuple(name for name, field in fields.items() if _may_hold_models(field.annotation))
+    values = tuple(name for name in fields if name in INTERNED_FIELDS and name not in nested)
+    return nested, values
+
+
+class ObjectPool:
+    """
+    Thread-safe bounded pool of the values and sub-objects shared by parsed responses.
+
+    Parameters:
+    -----------
+    maxsize: int
+        Distinct values and sub-objects remembered (default: 65536; None for no limit).
+    """
+
+    def __init__(self, maxsize: Optional[int] = 65536) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Forget every value."""
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, key: Hashable) -> Any:
+        """Return the instance shared under `key`, or None."""
+        shared = self._entries.get(key)
+        if shared is not None:
+            self.hits += 1
+        return shared
+
+    def _add(self, key: Hashable, value: Any) -> Any:
+        """Share `value` under `key` and return it."""
+        self.misses += 1
+        self._entries[key] = value
+        if self.maxsize is not None and len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def _value(self, value: Any) -> Any:
+        """Return the shared instance of a string or URL."""
+        key = value if isinstance(value, str) else (type(value), value)
+        shared = self._get(key)
+        return self._add(key, value) if shared is None else shared
+
+    def share(self, response: Any) -> Any:
+        """Replace the repeated values and sub-objects of a parsed response by shared instances, and return it."""
+        with self._lock:
+            self._share(response)
+        return response
+
+    def _share(self, model: Any) -> None:
+        stack = [model]
+        while stack:
+            model = stack.pop()
+            attributes = model.__dict__
+            nested, values = _plan(type(model))
+            for name in values:
+                item = attributes.get(name)
+                if isinstance(item, str) or is_url(item):
+                    attributes[name] = self._value(item)
+            for name in nested:
+                item = attributes.get(name)
+                if item is None:
+                    continue
+                if _is_model(type(item)):
+                    attributes[name] = self._model(item, stack)
+                elif type(item) is list:
+                    for index, element in enumerate(item):
+                        if _is_model(type(element)):
+                            item[index] = self._model(element, stack)
+                elif isinstance(item, str) and name in INTERNED_FIELDS:  # e.g. a field typed Any
+                    attributes[name] = self._value(item)
+
+    def _model(self, model: Any, stack: list) -> Any:
+        """Return the shared frozen copy of a pooled sub-model, or queue any other sub-model to be walked."""
+        kind = type(model)
+        if kind in _SHARED_MODELS:  # already shared
+            return model
+        frozen = FROZEN_MODELS.get(kind)
+        if frozen is None:
+            stack.append(model)
+            return model
+        values = model.__dict__
+        for name, value in values.items():
+            if name in INTERNED_FIELDS and (isinstance(value, str) or is_url(value)):
+                values[name] = self._value(value)
+        key = (frozen, tuple(values.values()))
+        try:
+            shared = self._get(key)
+        except TypeError:  # an unhashable value: keep the object as is
+            return model
+        if shared is not None:
+            return shared
+        return self._add(key, frozen.model_construct(_fields_set=model.__pydantic_fields_set__, **values))
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 from pydantic import HttpUrl
 
@@ -10,6 +11,8 @@ class MetaUrl(BaseModel):
     url: https://api.search.brave.com/app/documentation/web-search/responses#MetaUrl
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     scheme: str = Field(description="The protocol scheme extracted from the URL.")
     netloc: str = Field(description="The network location part extracted from the URL.")
     hostname: str = Field(description="The lowercased domain name extracted from the URL.")
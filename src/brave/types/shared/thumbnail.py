@@ -1,12 +1,15 @@
 from typing import Optional
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 
 class Thumbnail(BaseModel):
     """Aggregated details representing a picture thumbnail."""
 
+    model_config = ConfigDict(defer_build=True)
+
     src: Optional[str] = Field(default=None, description="The served URL of the image.")
     height: Optional[int] = Field(default=None, description="The height of the image.")
     width: Optional[int] = Field(default=None, description="The width of the image.")
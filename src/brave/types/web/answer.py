@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 from typing import Optional
 
@@ -6,6 +7,8 @@ from typing import Optional
 class Answer(BaseModel):
     """A response representing an answer to a question on a forum."""
 
+    model_config = ConfigDict(defer_build=True)
+
     text: str = Field(description="The main content of the answer.")
     author: Optional[str] = Field(default=None, description="A name string for the author of the answer.")
     upvoteCount: Optional[int] = Field(default=None, description="Number of upvotes on the answer.")
@@ -2,6 +2,7 @@ from typing import List
 from typing import Optional
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from ..shared.thumbnail import Thumbnail
@@ -20,6 +21,8 @@ class Organization(Person):
 class Article(BaseModel):
     """A model representing an article."""
 
+    model_config = ConfigDict(defer_build=True)
+
     author: Optional[List[Person]] = Field(default=None, description="The author of the article.")
     date: Optional[str] = Field(default=None, description="The date when the article was published.")
     publisher: Optional[Organization] = Field(default=None, description="The name of the publisher for the article.")
@@ -3,6 +3,7 @@ from typing import Optional
 from typing import Union
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from .person import Person
@@ -13,6 +14,8 @@ from .rating import Rating
 class Book(BaseModel):
     """A model representing a book result."""
 
+    model_config = ConfigDict(defer_build=True)
+
     title: str = Field(description="The title of the book.")
     author: Optional[List[Person]] = Field(default=None, description="The author of the book.")
     date: Optional[str] = Field(default=None, description="A published date for the book.")
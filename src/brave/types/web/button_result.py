@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 from pydantic import HttpUrl
 
@@ -6,6 +7,8 @@ from pydantic import HttpUrl
 class ButtonResult(BaseModel):
     """A result which can be used as a button."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str = Field(
         default="button_result", description="A type identifying button result. The value is always button_result."
     )
@@ -1,9 +1,12 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 
 class Contact(BaseModel):
     """A model representing contact information for an entity."""
 
+    model_config = ConfigDict(defer_build=True)
+
     email: str = Field(description="The email address.")
     telephone: str = Field(description="The telephone number.")
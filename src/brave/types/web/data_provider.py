@@ -1,10 +1,13 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 
 class DataProvider(BaseModel):
     """A model representing the data provider associated with the entity."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str = Field(
         default="external", description="A type representing the source of data. This is usually external."
     )
@@ -1,6 +1,7 @@
 from typing import List
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from .button_result import ButtonResult
@@ -13,6 +14,8 @@ from .videos import VideoResult
 class DeepResult(BaseModel):
     """Aggregated deep results from news social videos and images."""
 
+    model_config = ConfigDict(defer_build=True)
+
     news: List[NewsResult] = Field(description="A list of news results associated with the result.")
     buttons: List[ButtonResult] = Field(description="A list of buttoned results associated with the result.")
     social: List[KnowledgeGraphProfile] = Field(description="Social profile associated with the result.")
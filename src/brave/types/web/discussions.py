@@ -1,6 +1,7 @@
 from typing import List
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from .search_result import SearchResult
@@ -9,6 +10,8 @@ from .search_result import SearchResult
 class ForumData(BaseModel):
     """Defines a result from a discussion forum."""
 
+    model_config = ConfigDict(defer_build=True)
+
     forum_name: str = Field(description="The name for the forum.")
     num_answers: int = Field(description="The number of answers in the post.")
     score: str = Field(description="The score of the post in the forum.")
@@ -29,6 +32,8 @@ class DiscussionResult(SearchResult):
 class Discussions(BaseModel):
     """A model representing a discussion cluster relevant to the query."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str = Field(
         default="search",
         description="The type identifying a discussion cluster. Currently, the value is always search.",
@@ -2,6 +2,7 @@ from typing import List
 from typing import Optional
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 from pydantic import HttpUrl
 
@@ -12,6 +13,8 @@ from .answer import Answer
 class QAPage(BaseModel):
     """Aggreated result from a question answer page."""
 
+    model_config = ConfigDict(defer_build=True)
+
     question: str = Field(description="The question being asked.")
     answer: Answer = Field(description="The answer to the question.")
 
@@ -19,6 +22,8 @@ class QAPage(BaseModel):
 class QA(BaseModel):
     """A question-answer result."""
 
+    model_config = ConfigDict(defer_build=True)
+
     question: str = Field(description="The question being asked.")
     answer: str = Field(description="The answer to the question.")
     title: str = Field(description="The title of the post.")
@@ -29,6 +34,8 @@ class QA(BaseModel):
 class FAQ(BaseModel):
     """Frequently asked questions relevant to the search query term."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str = Field(default="faq", description="The FAQ result type identifier. The value is always faq.")
     results: Optional[List[QA]] = Field(
         default=None, description="A list of aggregated question-answer results relevant to the query."
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from ..shared.thumbnail import Thumbnail
@@ -7,6 +8,8 @@ from ..shared.thumbnail import Thumbnail
 class ImageProperties(BaseModel):
     """Metadata on an image."""
 
+    model_config = ConfigDict(defer_build=True)
+
     url: str = Field(description="The image URL.")
     resized: str = Field(description="The resized image.")
     height: int = Field(description="The height of the image.")
@@ -18,6 +21,8 @@ class ImageProperties(BaseModel):
 class Image(BaseModel):
     """A model describing an image."""
 
+    model_config = ConfigDict(defer_build=True)
+
     thumbnail: Thumbnail = Field(description="The thumbnail associated with the image.")
     url: str = Field(description="The URL of the image.")
     properties: ImageProperties = Field(description="Metadata on the image.")
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from .url import URL
@@ -7,6 +8,8 @@ from .url import URL
 class KnowledgeGraphEntity(BaseModel):
     """Represents a knowledge graph entity."""
 
+    model_config = ConfigDict(defer_build=True)
+
     title: str = Field(description="A short title describing the entity.")
     description: str = Field(description="A description of the entity.")
     url: URL = Field(description="The URL representing the entity.")
@@ -1,6 +1,7 @@
 from typing import Optional
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 
@@ -11,4 +12,6 @@ class Language(BaseModel):
     url: https://api.search.brave.com/app/documentation/web-search/responses#Language
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     main: Optional[str] = Field(default=None, description="The main language seen in the string.")
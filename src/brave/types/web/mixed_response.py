@@ -2,12 +2,15 @@ from typing import List
 from typing import Optional
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 
 class ResultReference(BaseModel):
     """The ranking order of results on a search result page."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: Optional[str] = Field(default=None, description="The type of the result.")
     index: Optional[int] = Field(default=None, description="The 0th based index where the result should be placed.")
     all: Optional[bool] = Field(
@@ -18,6 +21,8 @@ class ResultReference(BaseModel):
 class MixedResponse(BaseModel):
     """The ranking order of results on a search result page."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str = Field(
         default="mixed", description="The type representing the model mixed. The value is by default mixed."
     )
@@ -1,6 +1,7 @@
 from typing import List
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from ..shared.thumbnail import Thumbnail
@@ -11,6 +12,8 @@ from .rating import Rating
 class MovieData(BaseModel):
     """Aggregated data for a movie result."""
 
+    model_config = ConfigDict(defer_build=True)
+
     name: str = Field(description="Name of the movie.")
     description: str = Field(description="A short plot summary for the movie.")
     url: str = Field(description="A URL serving a movie profile page.")
@@ -2,6 +2,7 @@ from typing import List
 from typing import Optional
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from ..shared.meta_url import MetaUrl
@@ -28,6 +29,8 @@ class NewsResult(Result):
 class News(BaseModel):
     """A model representing news results."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str = Field(default="news", description="The type representing the news. The value is always news.")
     results: List[NewsResult] = Field(description="A list of news results.")
     mutated_by_goggles: bool = Field(description="Whether the news result were changed by a goggle.")
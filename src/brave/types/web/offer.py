@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 from pydantic import HttpUrl
 
@@ -6,6 +7,8 @@ from pydantic import HttpUrl
 class Offer(BaseModel):
     """An offer associated with a product."""
 
+    model_config = ConfigDict(defer_build=True)
+
     url: HttpUrl = Field(description="The URL where the offer can be found.")
     priceCurrency: str = Field(description="The currency in which the offer is made.")
     price: str = Field(description="The price of the product currently on offer.")
@@ -1,12 +1,15 @@
 from typing import List
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 
 class DayOpeningHours(BaseModel):
     """A model representing a day opening hour for a business at a particular location."""
 
+    model_config = ConfigDict(defer_build=True)
+
     abbr_name: str = Field(description="A short string representing the day of the week.")
     full_name: str = Field(description="A full string representing the day of the week.")
     opens: str = Field(
@@ -20,6 +23,8 @@ class DayOpeningHours(BaseModel):
 class OpeningHours(BaseModel):
     """Opening hours of a business at a particular location."""
 
+    model_config = ConfigDict(defer_build=True)
+
     current_day: List[DayOpeningHours] = Field(
         description="The current day opening hours. Can have two sets of opening hours."
     )
@@ -1,6 +1,7 @@
 from typing import Optional
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from ..shared.thumbnail import Thumbnail
@@ -9,6 +10,8 @@ from ..shared.thumbnail import Thumbnail
 class Person(BaseModel):
     """A model representing a person entity"""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: Optional[str] = Field(
         default="person", description="A type identifying a person. The value is always person."
     )
@@ -1,6 +1,7 @@
 from typing import List
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from ..shared.thumbnail import Thumbnail
@@ -9,5 +10,7 @@ from ..shared.thumbnail import Thumbnail
 class PictureResults(BaseModel):
     """A model representing a list of pictures."""
 
+    model_config = ConfigDict(defer_build=True)
+
     viewMoreUrl: str = Field(description="A URL to view more pictures.")
     results: List[Thumbnail] = Field(description="A list of thumbnail results.")
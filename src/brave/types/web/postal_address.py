@@ -1,10 +1,13 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 
 class PostalAddress(BaseModel):
     """A model representing a postal address of a location."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str = Field(
         default="PostalAddress", description="A type identifying a postal address. The value is always postaladdress."
     )
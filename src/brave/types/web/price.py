@@ -1,9 +1,12 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 
 class Price(BaseModel):
     """A model describing a price for an entity."""
 
+    model_config = ConfigDict(defer_build=True)
+
     price: str = Field(description="The price value in a given currency.")
     price_currency: str = Field(description="The currency of the price value.")
@@ -2,6 +2,7 @@ from typing import List
 from typing import Optional
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from ..shared.thumbnail import Thumbnail
@@ -12,6 +13,8 @@ from .rating import Rating
 class Product(BaseModel):
     """A model representing a product."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str = Field(
         default="Product", description="A string representing a product type. The value is always product."
     )
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 from pydantic import HttpUrl
 
@@ -10,6 +11,8 @@ class Profile(BaseModel):
     url: https://api.search.brave.com/app/documentation/web-search/responses#Profile
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     name: str = Field(description="The name of the profile.")
     url: HttpUrl = Field(description="The original URL where the profile is available.")
     long_name: str = Field(description="The long name of the profile.")
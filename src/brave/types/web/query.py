@@ -3,6 +3,7 @@ import logging
 from typing import Optional
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from .language import Language
@@ -18,6 +19,8 @@ class Query(BaseModel):
     url: https://api.search.brave.com/app/documentation/web-search/responses#Query
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     original: str = Field(description="The original query that was requested.")
     show_strict_warning: bool = Field(
         description="Whether there is more content available for query, but the response was restricted due to safesearch."
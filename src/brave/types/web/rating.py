@@ -1,6 +1,7 @@
 from typing import Optional
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from .profile import Profile
@@ -9,6 +10,8 @@ from .profile import Profile
 class Rating(BaseModel):
     """The rating associated with an entity."""
 
+    model_config = ConfigDict(defer_build=True)
+
     ratingValue: Optional[float] = Field(default=None, description="The current value of the rating.")
     bestRating: Optional[float] = Field(default=None, description="Best rating received.")
     reviewCount: Optional[int] = Field(default=None, description="The number of reviews for the rating.")
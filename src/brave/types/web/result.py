@@ -1,6 +1,7 @@
 from typing import Optional
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 from pydantic import HttpUrl
 
@@ -14,6 +15,8 @@ class Result(BaseModel):
     url: https://api.search.brave.com/app/documentation/web-search/responses#Result
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     title: str = Field(description="The title of the web page.")
     url: HttpUrl = Field(description="The URL where the page is served.")
     is_source_local: Optional[bool] = Field(
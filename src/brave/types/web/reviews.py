@@ -1,6 +1,7 @@
 from typing import List
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from ..shared.thumbnail import Thumbnail
@@ -11,6 +12,8 @@ from .rating import Rating
 class TripAdvisorReview(BaseModel):
     """A model representing a TripAdvisor review."""
 
+    model_config = ConfigDict(defer_build=True)
+
     title: str = Field(description="The title of the review.")
     description: str = Field(description="A description seen in the review.")
     date: str = Field(description="The date when the review was published.")
@@ -23,6 +26,8 @@ class TripAdvisorReview(BaseModel):
 class Reviews(BaseModel):
     """The reviews associated with an entity."""
 
+    model_config = ConfigDict(defer_build=True)
+
     results: List[TripAdvisorReview] = Field(description="A list of TripAdvisor reviews for the entity.")
     viewMoreUrl: str = Field(description="A URL to a web page where more information on the result can be seen.")
     reviews_in_foreign_language: bool = Field(description="Any reviews available in a foreign language.")
@@ -31,6 +36,8 @@ class Reviews(BaseModel):
 class Review(BaseModel):
     """A model representing a review for an entity."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str = Field(default="review", description="A string representing review type. This is always review.")
     name: str = Field(description="The review title for the review.")
     thumbnail: Thumbnail = Field(description="The thumbnail associated with the reviewer.")
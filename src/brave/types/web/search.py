@@ -1,6 +1,7 @@
 from typing import List
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from .search_result import SearchResult
@@ -13,6 +14,8 @@ class Search(BaseModel):
     url: https://api.search.brave.com/app/documentation/web-search/responses#Search
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str = Field(
         default="search", description="A type identifying web search results. The value is always search."
     )
@@ -5,8 +5,6 @@ from typing import List
 from typing import Optional
 from typing import Union
 
-import requests
-
 from pydantic import Field
 
 from brave.exceptions import BraveError
@@ -116,6 +114,8 @@ class SearchResult(Result):
         filename : str
             The name of the file to save the PDF to.
         """
+        import requests
+
         try:
             # check if directory "downloads" exists
             if not os.path.exists(path):
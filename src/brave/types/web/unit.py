@@ -1,9 +1,12 @@
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 
 class Unit(BaseModel):
     """A model representing a unit of measurement."""
 
+    model_config = ConfigDict(defer_build=True)
+
     value: float = Field(description="The quantity of the unit.")
     units: str = Field(description="The name of the unit associated with the quantity.")
@@ -1,6 +1,7 @@
 from typing import List
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 from pydantic import HttpUrl
 
@@ -8,6 +9,8 @@ from pydantic import HttpUrl
 class MobileUrlItem(BaseModel):
     """A mobile-friendly representation of the URL."""
 
+    model_config = ConfigDict(defer_build=True)
+
     original: str = Field(description="The original source URL.")
     amp: str = Field(description="The AMP version of the URL.")
     android: str = Field(description="An Android-friendly version of the URL.")
@@ -17,6 +20,8 @@ class MobileUrlItem(BaseModel):
 class URL(BaseModel):
     """A model representing a URL."""
 
+    model_config = ConfigDict(defer_build=True)
+
     original: HttpUrl = Field(description="The original source URL.")
     display: str = Field(description="The display URL.")
     alternatives: List[str] = Field(description="An alternative representation of a URL.")
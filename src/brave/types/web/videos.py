@@ -2,6 +2,7 @@ from typing import List
 from typing import Optional
 
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from ..shared.meta_url import MetaUrl
@@ -12,6 +13,8 @@ from .result import Result
 class VideoData(BaseModel):
     """A model representing metadata gathered for a video."""
 
+    model_config = ConfigDict(defer_build=True)
+
     duration: Optional[str] = Field(default=None, description="A time string representing the duration of the video.")
     views: Optional[str] = Field(default=None, description="The number of views of the video.")
     creator: Optional[str] = Field(default=None, description="The creator of the video.")
@@ -34,6 +37,8 @@ class VideoResult(Result):
 class Videos(BaseModel):
     """A model representing video results."""
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str = Field(default="videos", description="The type representing the videos. The value is always videos.")
     results: List[VideoResult] = Field(description="A list of video results.")
     mutated_by_goggles: bool = Field(description="Whether the videos result were changed by a goggle.")
@@ -4,9 +4,8 @@ from typing import List
 from typing import Optional
 from typing import Tuple
 
-import numpy as np
-
 from pydantic import BaseModel
+from pydantic import ConfigDict
 from pydantic import Field
 
 from .discussions import Discussions
@@ -27,6 +26,8 @@ logger = logging.getLogger(__name__)
 class WebSearchApiResponse(BaseModel):
     """Brave Search API response object"""
 
+    model_config = ConfigDict(defer_build=True)
+
     query: Query = Field(description="Search query string and its modifications that are used for search.")
     mixed: Optional[MixedResponse] = Field(default=None, description="Preferred ranked order of search results.")
     type: str = Field(default="search", description="The type of web search API result. The value is always search.")
@@ -90,8 +91,11 @@ class WebSearchApiResponse(BaseModel):
 
     @property
     def product_cluster(self) -> List[str]:
-        """Return a list of product clusters."""
-        return [result.product_cluster for result in self._web_results if result.subtype == "product_cluster"][0]
+        """Return the first product cluster, or an empty list if there is none."""
+        for result in self._web_results:
+            if result.subtype == "product_cluster":
+                return result.product_cluster or []
+        return []
 
     def download_all_pdfs(self, path: str = "downloads") -> None:
         """Download PDFs for all search results."""
@@ -128,6 +132,6 @@ class WebSearchApiResponse(BaseModel):
                 if product.rating and product.rating.ratingValue and product.rating.bestRating
             ]
         if ratings:
-            return np.mean([r for r in ratings if r is not None]) * 100
+            return sum(ratings) / len(ratings) * 100
         else:
             return None
@@ -0,0 +1,240 @@
+"""
+Local validation and normalisation of Brave Search API query parameters.
+
+Every parameter is checked against precomputed lookup tables before a request is sent, so invalid values fail
+immediately instead of coming back as a 422 from the API. Values are also rewritten into a single canonical form
+(upper-case country codes, lower-case language codes, sorted result filters, lower-case booleans, ...) so that
+equivalent requests produce identical parameters, which keeps cache keys stable.
+
+url: https://api.search.brave.com/app/documentation/web-search/query
+"""
+import re
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import Mapping
+
+from brave.exceptions import BraveValidationError
+
+
+MAX_QUERY_LENGTH = 400
+MAX_QUERY_TERMS = 50
+MAX_COUNT = 20
+MAX_OFFSET = 9
+
+COUNTRIES: FrozenSet[str] = frozenset(
+    {
+        "ALL", "AR", "AU", "AT", "BE", "BR", "CA", "CL", "DK", "FI", "FR", "DE", "HK", "IN", "ID", "IT", "JP",
+        "KR", "MY", "MX", "NL", "NZ", "NO", "CN", "PL", "PT", "PH", "RU", "SA", "ZA", "ES", "SE", "CH", "TW",
+        "TR", "GB", "US",
+    }
+)  # fmt: skip
+
+SEARCH_LANGUAGES: FrozenSet[str] = frozenset(
+    {
+        "ar", "eu", "bn", "bg", "ca", "zh-hans", "zh-hant", "hr", "cs", "da", "nl", "en", "en-gb", "et", "fi",
+        "fr", "gl", "de", "gu", "he", "hi", "hu", "is", "it", "jp", "kn", "ko", "lv", "lt", "ms", "ml", "mr",
+        "nb", "pl", "pt-br", "pt-pt", "pa", "ro", "ru", "sr", "sk", "sl", "es", "sv", "ta", "te", "th", "tr",
+        "uk", "vi",
+    }
+)  # fmt: skip
+
+UI_LANGUAGES: FrozenSet[str] = frozenset(
+    {
+        "es-AR", "en-AU", "de-AT", "nl-BE", "fr-BE", "pt-BR", "en-CA", "fr-CA", "es-CL", "da-DK", "fi-FI",
+        "fr-FR", "de-DE", "zh-HK", "en-IN", "en-ID", "it-IT", "ja-JP", "ko-KR", "en-MY", "es-MX", "nl-NL",
+        "en-NZ", "no-NO", "zh-CN", "pl-PL", "en-PH", "ru-RU", "en-ZA", "es-ES", "sv-SE", "fr-CH", "de-CH",
+        "zh-TW", "tr-TR", "en-GB", "en-US", "es-US",
+    }
+)  # fmt: skip
+
+SAFESEARCH_LEVELS: FrozenSet[str] = frozenset({"off", "moderate", "strict"})
+IMAGE_SAFESEARCH_LEVELS: FrozenSet[str] = frozenset({"off", "strict"})
+FRESHNESS_PERIODS: FrozenSet[str] = frozenset({"pd", "pw", "pm", "py"})
+RESULT_FILTERS: FrozenSet[str] = frozenset(
+    {"discussions", "faq", "infobox", "news", "query", "summarizer", "videos", "web", "locations"}
+)
+UNITS: FrozenSet[str] = frozenset({"metric", "imperial"})
+
+# Lookup tables mapping every accepted spelling, keyed by `_key`, to the canonical code.
+_COUNTRY_LOOKUP = {code.lower(): code for code in COUNTRIES}
+_SEARCH_LANGUAGE_LOOKUP = {code: code for code in SEARCH_LANGUAGES}
+_SEARCH_LANGUAGE_LOOKUP.update({"ja": "jp", "zh": "zh-hans", "no": "nb", "pt": "pt-pt"})
+_UI_LANGUAGE_LOOKUP = {code.lower(): code for code in UI_LANGUAGES}
+_SAFESEARCH_LOOKUP = {level: level for level in SAFESEARCH_LEVELS}
+_IMAGE_SAFESEARCH_LOOKUP = {level: level for level in IMAGE_SAFESEARCH_LEVELS}
+_IMAGE_SAFESEARCH_LOOKUP["moderate"] = "strict"  # the image endpoint has no moderate level; strict is its default
+_UNITS_LOOKUP = {unit: unit for unit in UNITS}
+_BOOLEAN_LOOKUP = {True: "true", False: "false", "true": "true", "false": "false", "1": "true", "0": "false"}
+
+_FRESHNESS_RANGE = re.compile(r"^\d{4}-\d{2}-\d{2}to\d{4}-\d{2}-\d{2}$")
+
+Normalizer = Callable[[str, Any], Any]
+
+
+def _key(value: str) -> str:
+    """Return the lookup key for a code: stripped, lower-case and with `_` separators replaced by `-`."""
+    return value.strip().lower().replace("_", "-")
+
+
+def _lookup(table: Mapping[str, str], name: str, value: Any) -> str:
+    """Resolve `value` through a lookup table or raise a validation error."""
+    if not isinstance(value, str):
+        raise BraveValidationError(f"Invalid value for '{name}': expected a string, got {type(value).__name__}")
+    try:
+        return table[_key(value)]
+    except KeyError:
+        raise BraveValidationError(f"Invalid value for '{name}': {value!r}") from None
+
+
+def normalize_query(name: str, value: Any) -> str:
+    """Strip and collapse whitespace in the query string and check the API length limits."""
+    if not isinstance(value, str):
+        raise BraveValidationError(f"Invalid query parameter '{name}'")
+    terms = value.split()
+    if not terms or len(terms) > MAX_QUERY_TERMS:
+        raise BraveValidationError(f"Invalid query parameter '{name}'")
+    query = " ".join(terms)
+    if len(query) > MAX_QUERY_LENGTH:
+        raise BraveValidationError(f"Invalid query parameter '{name}'")
+    return query
+
+
+def normalize_country(name: str, value: Any) -> str:
+    """Return the upper-case country code."""
+    return _lookup(_COUNTRY_LOOKUP, name, value)
+
+
+def normalize_search_lang(name: str, value: Any) -> str:
+    """Return the lower-case search language code, resolving common ISO aliases."""
+    return _lookup(_SEARCH_LANGUAGE_LOOKUP, name, value)
+
+
+def normalize_ui_lang(name: str, value: Any) -> str:
+    """Return the `<language>-<REGION>` UI language code, accepting `_` as separator."""
+    return _lookup(_UI_LANGUAGE_LOOKUP, name, value)
+
+
+def normalize_safesearch(name: str, value: Any) -> str:
+    """Return the lower-case safesearch level for the web endpoint."""
+    return _lookup(_SAFESEARCH_LOOKUP, name, value)
+
+
+def normalize_image_safesearch(name: str, value: Any) -> str:
+    """Return the safesearch level for the image endpoint, which only supports 'off' and 'strict'."""
+    return _lookup(_IMAGE_SAFESEARCH_LOOKUP, name, value)
+
+
+def normalize_freshness(name: str, value: Any) -> str:
+    """Return a freshness period (pd, pw, pm, py) or a `YYYY-MM-DDtoYYYY-MM-DD` range."""
+    if isinstance(value, str):
+        freshness = value.strip()
+        if freshness.lower() in FRESHNESS_PERIODS:
+            return freshness.lower()
+        if _FRESHNESS_RANGE.match(freshness):
+            return freshness
+    raise BraveValidationError(f"Invalid value for '{name}': {value!r}")
+
+
+def normalize_result_filter(name: str, value: Any) -> str:
+    """Return the comma separated result filter with duplicates removed and types sorted."""
+    if not isinstance(value, str):
+        raise BraveValidationError(f"Invalid value for '{name}': expected a comma separated string")
+    filters = {part.strip().lower() for part in value.split(",") if part.strip()}
+    if not filters or not filters <= RESULT_FILTERS:
+        raise BraveValidationError(f"Invalid value for '{name}': {value!r}")
+    return ",".join(sorted(filters))
+
+
+def normalize_units(name: str, value: Any) -> str:
+    """Return the lower-case measurement units."""
+    return _lookup(_UNITS_LOOKUP, name, value)
+
+
+def normalize_bool(name: str, value: Any) -> str:
+    """Return the boolean as the lower-case string sent on the wire."""
+    key = value.strip().lower() if isinstance(value, str) else value
+    try:
+        return _BOOLEAN_LOOKUP[key]
+    except (KeyError, TypeError):
+        raise BraveValidationError(f"Invalid value for '{name}': expected a boolean, got {value!r}") from None
+
+
+def _bounded_int(minimum: int, maximum: int) -> Normalizer:
+    """Build a normalizer that rejects values below `minimum` and clamps values above `maximum`."""
+
+    def normalize(name: str, value: Any) -> int:
+        if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+            raise BraveValidationError(f"Invalid value for '{name}': expected an integer >= {minimum}")
+        return min(value, maximum)
+
+    return normalize
+
+
+def normalize_goggles_id(name: str, value: Any) -> str:
+    """Return the stripped goggle URL or definition."""
+    if not isinstance(value, str) or not value.strip():
+        raise BraveValidationError(f"Invalid value for '{name}': expected a goggle URL")
+    return value.strip()
+
+
+WEB_SEARCH_PARAMS: Dict[str, Normalizer] = {
+    "q": normalize_query,
+    "country": normalize_country,
+    "search_lang": normalize_search_lang,
+    "ui_lang": normalize_ui_lang,
+    "count": _bounded_int(1, MAX_COUNT),
+    "offset": _bounded_int(0, MAX_OFFSET),
+    "safesearch": normalize_safesearch,
+    "freshness": normalize_freshness,
+    "text_decorations": normalize_bool,
+    "spellcheck": normalize_bool,
+    "result_filter": normalize_result_filter,
+    "goggles_id": normalize_goggles_id,
+    "units": normalize_units,
+    "extra_snippets": normalize_bool,
+}
+
+IMAGE_SEARCH_PARAMS: Dict[str, Normalizer] = {
+    "q": normalize_query,
+    "country": normalize_country,
+    "search_lang": normalize_search_lang,
+    "count": _bounded_int(1, MAX_COUNT),
+    "safesearch": normalize_image_safesearch,
+    "spellcheck": normalize_bool,
+}
+
+
+def normalize_params(params: Mapping[str, Any], rules: Mapping[str, Normalizer] = WEB_SEARCH_PARAMS) -> Dict[str, Any]:
+    """
+    Validate and canonicalise a mapping of query parameters.
+
+    Parameters:
+    -----------
+    params: Mapping[str, Any]
+        The query parameters. Entries whose value is None are dropped.
+    rules: Mapping[str, Normalizer]
+        The normalizer to apply to each accepted parameter (default: WEB_SEARCH_PARAMS).
+
+    Returns:
+    --------
+    Dict[str, Any]
+        The canonical parameters, in the order they were given.
+
+    Raises:
+    -------
+    BraveValidationError
+        If a parameter is unknown or its value is invalid.
+    """
+    normalized = {}
+    for name, value in params.items():
+        if value is None:
+            continue
+        try:
+            normalizer = rules[name]
+        except KeyError:
+            raise BraveValidationError(f"Unknown query parameter '{name}'") from None
+        normalized[name] = normalizer(name, value)
+    return normalized
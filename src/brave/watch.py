@@ -0,0 +1,269 @@
+"""
+Incremental monitoring of queries: re-poll them on a schedule and emit only new or changed results.
+
+A `Watcher` polls every query when it is due, with the client's raw mode so responses are never validated into
+models, and diffs the news and web results of each poll against what it saw before:
+
+- Results are keyed by kind (news or web) and canonical URL: lower-case scheme and host, no `www.`, fragment,
+  tracking parameters or trailing slash, and sorted query parameters, so the same article reached through different
+  links is one result. A page returned both as news and as a web result is tracked once as each.
+- A result is new if its URL was not seen in the last `memory` polls of the query, and changed if the hash of its
+  content (title, description, extra snippets, publication date and breaking flag) differs. Relative ages such as
+  "2 hours ago" change on every poll and are not part of the content.
+
+Each query adapts its poll interval to how often it changes: it halves after a poll with changes and grows by half
+after a poll without, within `min_interval` and `max_interval`.
+
+The state, 64-bit hashes of the URLs and contents seen per query plus the schedule, is saved atomically as JSON
+after every round of polls, so a restarted watcher does not emit everything again.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+
+from dataclasses import dataclass
+from typing import Any
+from typing import AsyncIterator
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+from typing import Union
+from urllib.parse import parse_qsl
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+from urllib.parse import urlunsplit
+
+from brave.exceptions import BraveValidationError
+
+
+logger = logging.getLogger(__name__)
+
+NEW = "new"
+CHANGED = "changed"
+
+# Query parameters that identify the referrer rather than the page.
+TRACKING_PARAMETERS = frozenset({"fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src", "igshid"})
+
+# Fields of a result that make up its content.
+_CONTENT_FIELDS = ("title", "description", "extra_snippets", "page_age", "breaking")
+
+
+def canonical_url(url: str) -> str:
+    """Return the canonical form of a URL, under which results are compared."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.startswith("utm_") and name not in TRACKING_PARAMETERS
+    )
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip("/") or "/", urlencode(query), ""))
+
+
+def _digest(value: str) -> str:
+    """Return a stable 64-bit hash of a string, in hexadecimal."""
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def content_hash(result: Mapping[str, Any]) -> str:
+    """Return the hash of the content of a raw result."""
+    return _digest(json.dumps([result.get(name) for name in _CONTENT_FIELDS], ensure_ascii=False))
+
+
+def results_of(response: Mapping[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield the kind ("news" or "web") and raw dictionary of every result of a raw web search response."""
+    for kind in ("news", "web"):
+        for result in (response.get(kind) or {}).get("results") or ():
+            if result.get("url"):
+                yield kind, result
+
+
+@dataclass
+class Change:
+    """A new or changed result of a watched query."""
+
+    query: str
+    change: str  # NEW or CHANGED
+    url: str
+    kind: str  # "news" or "web"
+    result: Dict[str, Any]
+
+
+class QueryState:
+    """The schedule of a watched query and the hashes of the results it returned lately."""
+
+    __slots__ = ("interval", "due", "polls", "seen")
+
+    def __init__(self, interval: float, due: float = 0.0, polls: int = 0, seen: Optional[Dict] = None) -> None:
+        self.interval = interval
+        self.due = due
+        self.polls = polls
+        self.seen: Dict[str, List] = seen or {}  # hash of kind and URL -> [content hash, last poll it was seen in]
+
+    def to_json(self) -> Dict[str, Any]:
+        """Return the state as saved in the state file."""
+        return {"interval": self.interval, "due": self.due, "polls": self.polls, "seen": self.seen}
+
+
+class Watcher:
+    """
+    Poll a set of queries on adaptive schedules and report their new and changed results.
+
+    Parameters:
+    -----------
+    client: Brave or AsyncBrave
+        The client to search with; use `poll_due` and `watch` with a `Brave`, `apoll_due` and `awatch` with an
+        `AsyncBrave`.
+    queries: Iterable[str] or Mapping[str, dict]
+        The queries to watch, or queries mapped to the parameters of their searches.
+    path: str
+        JSON file to keep the state in across restarts (default: in memory only).
+    interval: float
+        Seconds between the first polls of a query (default: 300).
+    min_interval: float
+        Shortest interval a query adapts to (default: 60).
+    max_interval: float
+        Longest interval a query adapts to (default: 3600).
+    memory: int
+        Polls a result is remembered for after it was last returned (default: 10).
+    concurrency: int
+        Searches `apoll_due` runs at once (default: 8).
+    **params:
+        Parameters of every search, e.g. `freshness="pd"` or `result_filter="news"`.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        queries: Union[Iterable[str], Mapping[str, Dict[str, Any]]],
+        path: Optional[str] = None,
+        interval: float = 300.0,
+        min_interval: float = 60.0,
+        max_interval: float = 3600.0,
+        memory: int = 10,
+        concurrency: int = 8,
+        **params,
+    ) -> None:
+        self.client = client
+        self.queries = dict(queries) if isinstance(queries, Mapping) else {query: {} for query in queries}
+        for query, query_params in self.queries.items():
+            if "q" in query_params or "raw" in query_params:
+                raise BraveValidationError(f"The parameters of {query!r} cannot set 'q' or 'raw'")
+        self.path = path
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.memory = max(1, memory)
+        self.concurrency = max(1, concurrency)
+        self.params = params
+        self.states = {query: QueryState(interval) for query in self.queries}
+        if path is not None and os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                saved = json.load(file)
+            for query, state in saved.items():
+                if query in self.states:
+                    self.states[query] = QueryState(**state)
+
+    def save(self) -> None:
+        """Write the state file, replacing the previous one atomically."""
+        if self.path is None:
+            return
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump({query: state.to_json() for query, state in self.states.items()}, file, separators=(",", ":"))
+        os.replace(temporary, self.path)
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Return the queries due for a poll."""
+        now = time.time() if now is None else now
+        return [query for query, state in self.states.items() if state.due <= now]
+
+    def _search_params(self, query: str) -> Dict[str, Any]:
+        return {**self.params, **self.queries[query], "q": query, "raw": True}
+
+    def diff(self, query: str, response: Mapping[str, Any], now: Optional[float] = None) -> List[Change]:
+        """Record a poll of a query from its raw response and return its new and changed results."""
+        state = self.states[query]
+        state.polls += 1
+        changes = []
+        for kind, result in results_of(response):
+            url = canonical_url(result["url"])
+            key, content = _digest(f"{kind} {url}"), content_hash(result)
+            previous = state.seen.get(key)
+            if previous is None or previous[0] != content:
+                changes.append(Change(query, NEW if previous is None else CHANGED, url, kind, result))
+            state.seen[key] = [content, state.polls]
+        state.seen = {key: seen for key, seen in state.seen.items() if state.polls - seen[1] < self.memory}
+        self._reschedule(state, bool(changes), now)
+        return changes
+
+    def _reschedule(self, state: QueryState, changed: bool, now: Optional[float]) -> None:
+        """Adapt the interval of a query to whether its last poll changed, and schedule the next poll."""
+        factor = 0.5 if changed else 1.5
+        state.interval = min(self.max_interval, max(self.min_interval, state.interval * factor))
+        state.due = (time.time() if now is None else now) + state.interval
+
+    def _failed(self, query: str, error: BaseException) -> None:
+        """Log a failed poll and retry it after the current interval."""
+        logger.warning("Poll of %r failed: %s", query, error)
+        self.states[query].due = time.time() + self.states[query].interval
+
+    def poll_due(self) -> List[Change]:
+        """Poll every due query with a synchronous client, save the state and return the changes."""
+        changes = []
+        for query in self.due():
+            try:
+                response = self.client.search(**self._search_params(query))
+            except Exception as error:  # one failing query must not stop the others
+                self._failed(query, error)
+                continue
+            changes.extend(self.diff(query, response))
+        self.save()
+        return changes
+
+    async def apoll_due(self) -> List[Change]:
+        """
+        Poll the due queries, `concurrency` at a time, with an asynchronous client, save the state and return the
+        changes.
+        """
+        due = self.due()
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def search(query: str) -> Any:
+            async with slots:
+                return await self.client.search(**self._search_params(query))
+
+        responses = await asyncio.gather(*(search(query) for query in due), return_exceptions=True)
+        changes = []
+        for query, response in zip(due, responses):
+            if isinstance(response, BaseException):
+                self._failed(query, response)
+            else:
+                changes.extend(self.diff(query, response))
+        self.save()
+        return changes
+
+    def _sleep_time(self) -> float:
+        return max(0.0, min(state.due for state in self.states.values()) - time.time()) if self.states else 0.0
+
+    def watch(self) -> Iterator[Change]:
+        """Poll forever with a synchronous client, yielding changes as they are found."""
+        while True:
+            yield from self.poll_due()
+            time.sleep(self._sleep_time())
+
+    async def awatch(self) -> AsyncIterator[Change]:
+        """Poll forever with an asynchronous client, yielding changes as they are found."""
+        while True:
+            for change in await self.apoll_due():
+                yield change
+            await asyncio.sleep(self._sleep_time())
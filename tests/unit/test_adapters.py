@@ -0,0 +1,39 @@
+import json
+import subprocess
+import sys
+
+from typing import List
+
+import brave
+
+from brave.types.adapters import type_adapter
+from brave.types.web.news import NewsResult
+from brave.types.web.videos import VideoResult
+
+
+def test_warmup_builds_deferred_validators():
+    code = (
+        "import brave; from brave.types import WebSearchApiResponse as W; "
+        "from brave.types.web.product import Product; "
+        "before = W.__pydantic_complete__; brave.warmup(Product); print(before, W.__pydantic_complete__, "
+        "Product.__pydantic_complete__)"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.split() == ["False", "True", "True"]
+
+
+def test_warmup_is_cheap_once_built():
+    brave.warmup()
+    assert brave.warmup() < 0.01
+
+
+def test_type_adapter_is_shared():
+    assert type_adapter(List[NewsResult]) is type_adapter(List[NewsResult])
+    assert type_adapter(List[NewsResult]) is not type_adapter(List[VideoResult])
+
+
+def test_type_adapter_parses_sub_model_lists():
+    with open("tests/test_responses/blue_tack_minimal.json") as file:
+        payload = json.load(file)
+    videos = type_adapter(List[VideoResult]).validate_python(payload["videos"]["results"])
+    assert videos and all(isinstance(video, VideoResult) for video in videos)
@@ -84,3 +84,25 @@ async def test_response_validation(monkeypatch):
     client = AsyncBrave(api_key="test_key")
     response = await client.search("Blue tack")  # Replace with the actual async method
     assert isinstance(response, WebSearchApiResponse)
+
+
+@pytest.mark.asyncio
+async def test_async_search_raw_and_image(monkeypatch):
+    with open("tests/test_responses/blue_tack_minimal.json", "r") as f:
+        _mock_response = json.load(f)
+
+    urls = []
+
+    async def mock_get(*args, **kwargs):
+        urls.append(args[0])
+        mock_response = httpx.Response(200, json=_mock_response)
+        mock_response._request = httpx.Request(method="GET", url=args[0])
+        return mock_response
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", AsyncMock(side_effect=mock_get))
+
+    client = AsyncBrave(api_key="test_key")
+    response = await client.search("Blue tack", raw=True)
+    assert response == _mock_response
+    await client.image("Blue tack", raw=True)
+    assert urls[-1].endswith("/images/search")
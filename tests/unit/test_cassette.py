@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+from tenacity import RetryError
+
+from brave.cassette import Cassette
+from brave.exceptions import BraveCassetteMiss
+from brave.quota import QuotaLedger
+from brave.sync import Brave
+from brave.testing import FakeBraveServer
+from brave.testing import load_fixtures
+from brave.transport import RequestsTransport
+from brave.types import WebSearchApiResponse
+
+
+FIXTURES = load_fixtures("tests/test_responses")
+
+
+def _client(cassette, base_url="http://127.0.0.1:9/res/v1/"):
+    return Brave(api_key="test_key", transport=RequestsTransport(base_url=base_url, middleware=[cassette]))
+
+
+def test_record_then_replay_without_network(tmp_path):
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        recorded = _client(Cassette(tmp_path, mode="record"), server.base_url).search("Blue tack")
+        assert server.requests_served == 1
+
+    assert os.path.exists(tmp_path / "bodies.bin")
+    cassette = Cassette(tmp_path)
+    replayed = _client(cassette).search("Blue tack")
+    assert replayed == recorded
+    assert isinstance(replayed, WebSearchApiResponse)
+    assert cassette.hits == 1
+
+
+def test_replay_miss_raises_without_retrying(tmp_path):
+    cassette = Cassette(tmp_path)
+    with pytest.raises(BraveCassetteMiss):
+        _client(cassette).search("Blue tack")
+    assert cassette.misses == 1
+
+
+def test_fuzzy_matching(tmp_path):
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        _client(Cassette(tmp_path, mode="record"), server.base_url).search("Blue tack", country="GB")
+
+    with pytest.raises(BraveCassetteMiss):
+        _client(Cassette(tmp_path)).search("blue tack", country="US")
+    response = _client(Cassette(tmp_path, match="fuzzy")).search("blue tack", country="US")
+    assert isinstance(response, WebSearchApiResponse)
+
+
+def test_record_new_only_records_misses(tmp_path):
+    cassette = Cassette(tmp_path, mode="record_new")
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        client = _client(cassette, server.base_url)
+        client.search("Blue tack")
+        client.search("Blue tack")
+        assert server.requests_served == 1
+    assert len(cassette) == 1
+    assert len(Cassette(tmp_path)) == 1
+
+
+def test_error_responses_are_not_recorded(tmp_path):
+    cassette = Cassette(tmp_path, mode="record_new")
+    with FakeBraveServer(fixtures=FIXTURES, error_rate=1.0) as server:
+        client = _client(cassette, server.base_url)
+        client.retry_attempts = 1
+        with pytest.raises(RetryError):
+            client.search("Blue tack")
+    assert len(cassette) == 0
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        assert isinstance(_client(cassette, server.base_url).search("Blue tack"), WebSearchApiResponse)
+    assert len(Cassette(tmp_path)) == 1
+
+
+def test_replays_lease_no_key_and_spend_no_quota(tmp_path):
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        _client(Cassette(tmp_path, mode="record"), server.base_url).search("Blue tack")
+
+    ledger = QuotaLedger()
+    client = Brave(
+        api_key="k1, k2",
+        quota=ledger,
+        transport=RequestsTransport(base_url="http://127.0.0.1:9/res/v1/", middleware=[Cassette(tmp_path)]),
+    )
+    assert isinstance(client.transport.middleware[0], Cassette)
+    assert isinstance(client.search("Blue tack"), WebSearchApiResponse)
+    assert ledger.used() == 0
+    assert all(state.requests == 0 for state in client.keys.states)
@@ -0,0 +1,102 @@
+import csv
+import json
+
+import pytest
+
+from brave.async_brave import AsyncBrave
+from brave.cli import Checkpoint
+from brave.cli import main
+from brave.testing import FakeBraveServer
+from brave.testing import load_fixtures
+
+
+FIXTURES = load_fixtures("tests/test_responses")
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(AsyncBrave, "retry_wait", 0)
+    with FakeBraveServer(default=FIXTURES["Blue tack"]) as server:
+        yield server
+
+
+def run(server, tmp_path, lines, *options):
+    queries = tmp_path / "queries.txt"
+    queries.write_text("\n".join(lines) + "\n")
+    return main([str(queries), "--api-key", "test_key", "--base-url", server.base_url, *options])
+
+
+def test_results_are_streamed_as_jsonl(server, tmp_path):
+    output = tmp_path / "results.jsonl"
+    lines = ["Blue tack", "", '{"q": "Blu tack uses", "id": "a1", "country": "GB"}']
+    assert run(server, tmp_path, lines, "-o", str(output), "-c", "2") == 0
+    records = sorted((json.loads(line) for line in output.read_text().splitlines()), key=lambda r: r["line"])
+    assert [(record["line"], record["id"], record["query"]) for record in records] == [
+        (1, None, "Blue tack"),
+        (3, "a1", "Blu tack uses"),
+    ]
+    assert all(record["response"]["type"] == "search" for record in records)
+    assert server.requests_served == 2
+
+
+def test_failed_queries_are_written_as_csv_rows(server, tmp_path):
+    output = tmp_path / "results.csv"
+    assert run(server, tmp_path, ["Blue tack", '{"q": "Blue tack", "count": -1}'], "-o", str(output)) == 1
+    rows = list(csv.DictReader(output.open()))
+    failed = [row for row in rows if row["error"]]
+    assert len(failed) == 1 and failed[0]["line"] == "2" and failed[0]["url"] == ""
+    assert {row["line"] for row in rows if row["url"]} == {"1"}
+
+
+def test_an_interrupted_run_resumes_from_its_checkpoint(server, tmp_path):
+    output = tmp_path / "results.jsonl"
+    output.write_text('{"line": 1}\n{"line": 2}\n{"line": 4}\n')
+    checkpoint = tmp_path / "run.ckpt"
+    checkpoint.write_text(json.dumps({"below": 3, "done": [4]}))
+    lines = [f"query {number}" for number in range(1, 6)]
+    assert run(server, tmp_path, lines, "-o", str(output), "--checkpoint", str(checkpoint)) == 0
+    assert server.requests_served == 2
+    assert sorted(json.loads(line)["line"] for line in output.read_text().splitlines()) == [1, 2, 3, 4, 5]
+    assert json.loads(checkpoint.read_text()) == {"below": 6, "done": []}
+
+
+def test_failed_queries_are_sent_again_on_resume(monkeypatch, tmp_path):
+    monkeypatch.setattr(AsyncBrave, "retry_wait", 0)
+    output, checkpoint = tmp_path / "results.jsonl", tmp_path / "run.ckpt"
+    lines = ["Blue tack", '{"q": "Blue tack", "count": -1}', '{"q": "Blue tack", "raw": false}', "Blu tack"]
+    options = ["-o", str(output), "--checkpoint", str(checkpoint)]
+    with FakeBraveServer(default=FIXTURES["Blue tack"], error_rate=1.0) as failing:
+        assert run(failing, tmp_path, lines, *options) == 1
+    assert json.loads(checkpoint.read_text()) == {"below": 1, "done": [2, 3]}  # invalid lines fail again anyway
+    with FakeBraveServer(default=FIXTURES["Blue tack"]) as server:
+        assert run(server, tmp_path, lines, *options) == 0
+        assert server.requests_served == 2
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted((record["line"], "error" in record) for record in records) == [
+        (1, False),
+        (1, True),
+        (2, True),
+        (3, True),
+        (4, False),
+        (4, True),
+    ]
+    assert "'raw'" in next(record["error"] for record in records if record["line"] == 3)
+    assert json.loads(checkpoint.read_text()) == {"below": 5, "done": []}
+
+
+def test_checkpoint_tracks_out_of_order_completions():
+    checkpoint = Checkpoint()
+    for line in (2, 3, 5):
+        checkpoint.mark(line)
+    assert checkpoint.below == 1 and checkpoint.done == {2, 3, 5}
+    checkpoint.mark(1)
+    assert checkpoint.below == 4 and checkpoint.done == {5}
+    assert 3 in checkpoint and 4 not in checkpoint and 5 in checkpoint
+
+
+def test_results_are_written_as_parquet(server, tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    output = tmp_path / "results"
+    assert run(server, tmp_path, ["Blue tack"], "-o", str(output), "-f", "parquet") == 0
+    table = parquet.read_table(str(output))
+    assert table.num_rows > 0 and set(table.column("line").to_pylist()) == {1}
@@ -4,6 +4,7 @@ from unittest.mock import patch
 
 import pytest
 
+from brave.cache import ResponseCache
 from brave.client import BraveAPIClient
 from brave.exceptions import BraveError
 from brave.types import WebSearchApiResponse
@@ -54,3 +55,31 @@ def test_response_type_validation():
         client = BraveAPIClient(api_key="test_api_key")
         response = client.search(q="Blue tack")
         assert isinstance(response, WebSearchApiResponse)
+
+
+def test_response_cache_expires_and_evicts():
+    cache = ResponseCache(maxsize=2, ttl=60)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.set("c", b"3")
+    assert cache.get("a") is None
+    assert cache.get("c") == b"3"
+    expired = ResponseCache(ttl=-1)
+    expired.set("a", b"1")
+    assert expired.get("a") is None
+
+
+def test_error_status_raises_brave_error():
+    class Response:
+        status_code = 422
+        text = "Unprocessable"
+
+    client = BraveAPIClient(api_key="test_api_key")
+    client._get = lambda params=None, endpoint=None, **options: Response()
+    with pytest.raises(BraveError):
+        client.search(q="Blue tack")
+
+
+def test_product_accessors_without_product_cluster():
+    assert mock_response.product_cluster == []
+    assert mock_response.product_prices() == []
@@ -0,0 +1,67 @@
+import socket
+
+import pytest
+
+from brave.dns import DNSCache
+from brave.exceptions import BraveError
+
+
+ADDRESS = (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", 443))
+
+
+class Calls(list):
+    down = False
+
+
+@pytest.fixture
+def resolver(monkeypatch):
+    calls = Calls()
+
+    def getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):  # noqa: A002
+        calls.append(host)
+        if calls.down:
+            raise socket.gaierror("resolver down")
+        return [ADDRESS]
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    return calls
+
+
+def test_lookups_are_cached_until_their_ttl(resolver, monkeypatch):
+    with DNSCache(ttl=60) as cache:
+        assert cache.resolve("API.search.brave.com") == ["10.0.0.1"]
+        assert socket.getaddrinfo("api.search.brave.com", 443, 0, socket.SOCK_STREAM) == [ADDRESS]
+        assert resolver == ["API.search.brave.com"]
+        assert (cache.hits, cache.misses) == (1, 1)
+        cache.ttl = 0
+        cache.clear()
+        socket.getaddrinfo("api.search.brave.com", 443)
+        socket.getaddrinfo("api.search.brave.com", 443)
+    assert len(resolver) == 3
+
+
+def test_expired_entries_are_served_while_the_resolver_fails(resolver):
+    cache = DNSCache(ttl=0, stale=60)
+    cache.getaddrinfo("api.search.brave.com", 443)
+    resolver.down = True
+    assert cache.getaddrinfo("api.search.brave.com", 443) == [ADDRESS]
+    cache.stale = 0
+    with pytest.raises(socket.gaierror):
+        cache.getaddrinfo("api.search.brave.com", 443)
+
+
+def test_only_listed_hosts_are_cached(resolver):
+    cache = DNSCache(hosts=["api.search.brave.com"])
+    cache.getaddrinfo("example.com", 443)
+    cache.getaddrinfo("example.com", 443)
+    assert resolver == ["example.com", "example.com"] and len(cache) == 0
+
+
+def test_install_and_uninstall(resolver):
+    original = socket.getaddrinfo
+    cache = DNSCache().install()
+    assert socket.getaddrinfo == cache.getaddrinfo
+    with pytest.raises(BraveError):
+        DNSCache().install()
+    cache.uninstall()
+    assert socket.getaddrinfo is original
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+import requests
+
+from brave.async_brave import AsyncBrave
+from brave.encoding import GZIP
+from brave.encoding import IDENTITY
+from brave.encoding import accept_encoding
+from brave.encoding import available
+from brave.encoding import compress
+from brave.encoding import decompress
+from brave.exceptions import BraveError
+from brave.metrics import InMemoryMetrics
+from brave.sync import Brave
+from brave.testing import FakeBraveServer
+from brave.testing import load_fixtures
+from brave.transport import HTTPXTransport
+from brave.transport import RequestsTransport
+from brave.types import WebSearchApiResponse
+
+
+FIXTURES = load_fixtures("tests/test_responses")
+BODY = FIXTURES["Blue tack"]
+
+
+@pytest.mark.parametrize("encoding", ["zstd", "br", "gzip", "deflate"])
+def test_bodies_round_trip(encoding):
+    if encoding not in available((encoding,)):
+        pytest.skip(f"no {encoding} decoder installed")
+    compressed = compress(BODY, encoding)
+    assert len(compressed) < len(BODY)
+    assert decompress(compressed, encoding) == BODY
+
+
+def test_stacked_and_missing_encodings():
+    assert decompress(compress(compress(BODY, "deflate"), GZIP), "deflate, gzip") == BODY
+    assert decompress(BODY, None) == decompress(BODY, IDENTITY) == BODY
+    with pytest.raises(BraveError):
+        decompress(BODY, "compress")
+
+
+def test_accept_encoding_offers_what_is_decoded():
+    assert accept_encoding(supported=["gzip", "deflate"]) == "gzip"
+    assert accept_encoding(["gzip"]) == "gzip"
+    assert accept_encoding(supported=[]) == IDENTITY
+    with pytest.raises(BraveError):
+        accept_encoding(["gzip", "compress"])
+
+
+@pytest.mark.parametrize("transport", [RequestsTransport, HTTPXTransport])
+def test_clients_negotiate_with_their_transport(transport):
+    transport = transport()
+    client = Brave(api_key="test_key", transport=transport)
+    offered = client._prepare_headers()["Accept-Encoding"].split(", ")
+    assert GZIP in offered
+    assert set(offered) <= set(transport.encodings) & set(available())
+    assert Brave(api_key="test_key", transport=transport, encodings=["gzip"]).accept_encoding == "gzip"
+
+
+def test_fake_server_serves_the_first_encoding_offered():
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        for encoding in available():
+            response = requests.get(
+                server.base_url + "web/search",
+                params={"q": "Blue tack"},
+                headers={"Accept-Encoding": f"{encoding}, gzip"},
+                stream=True,
+            )
+            assert response.headers["Content-Encoding"] == encoding
+            assert decompress(response.raw.read(decode_content=False), encoding) == BODY
+
+
+@pytest.mark.parametrize("transport", [RequestsTransport, HTTPXTransport])
+def test_decompression_is_measured(transport):
+    metrics = InMemoryMetrics()
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        with Brave(api_key="test_key", transport=transport(base_url=server.base_url), metrics=metrics) as client:
+            assert isinstance(client.search("Blue tack"), WebSearchApiResponse)
+            encoding = client.accept_encoding.split(", ")[0]
+    histograms = metrics.snapshot()["histograms"]
+    assert histograms[f"decompress_seconds{{encoding={encoding},endpoint=web}}"]["count"] == 1
+    assert histograms[f"compression_ratio{{encoding={encoding},endpoint=web}}"]["min"] > 1
+
+
+def test_async_decompression_is_measured():
+    metrics = InMemoryMetrics()
+
+    async def run(base_url):
+        async with AsyncBrave(api_key="test_key", base_url=base_url, metrics=metrics, encodings=["gzip"]) as client:
+            return await client.search("Blue tack", raw="bytes")
+
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        assert asyncio.run(run(server.base_url)) == BODY
+    assert metrics.snapshot()["histograms"]["decompress_seconds{encoding=gzip,endpoint=web}"]["count"] == 1
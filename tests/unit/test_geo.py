@@ -0,0 +1,128 @@
+import random
+
+import pytest
+
+import brave.geo
+
+from brave.geo import SpatialIndex
+from brave.geo import haversine_km
+from brave.geo import locations_of
+from brave.geo import query_location
+
+
+def points(count, seed=0):
+    generator = random.Random(seed)
+    return [(51.5 + generator.uniform(-0.2, 0.2), -0.1 + generator.uniform(-0.3, 0.3)) for _ in range(count)]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(brave.geo, "_numpy", lambda: None)
+    return request.param
+
+
+def test_within_and_nearest_match_a_full_scan(backend):
+    index = SpatialIndex(cell_km=2.0)
+    for position, (lat, lon) in enumerate(points(2000)):
+        index.add(lat, lon, position)
+    for lat, lon in points(20, seed=1):
+        expected = sorted((haversine_km(lat, lon, *point), position) for position, point in enumerate(points(2000)))
+        assert [item for _, item in index.within(lat, lon, 3.0)] == [
+            position for distance, position in expected if distance <= 3.0
+        ]
+        assert [item for _, item in index.nearest(lat, lon, k=7)] == [position for _, position in expected[:7]]
+        nearest = index.nearest(lat, lon, k=7, max_km=0.5)
+        assert [item for _, item in nearest] == [position for distance, position in expected[:7] if distance <= 0.5]
+
+
+def test_nearest_on_sparse_points():
+    index = SpatialIndex()
+    index.add(0.0, 0.0, "null island")
+    index.add(48.8566, 2.3522, "paris")
+    assert [item for _, item in index.nearest(51.5072, -0.1276, k=1)] == ["paris"]
+    assert index.nearest(51.5072, -0.1276, k=1, max_km=100) == []
+    assert [item for _, item in index.nearest(51.5072, -0.1276, k=5)] == ["paris", "null island"]
+
+
+def test_bbox_crosses_the_antimeridian():
+    index = SpatialIndex(cell_km=50)
+    index.add(-17.7, 178.0, "fiji")
+    index.add(-13.8, -171.8, "samoa")
+    index.add(-33.9, 151.2, "sydney")
+    assert sorted(index.bbox(-20, 175, -10, -170)) == ["fiji", "samoa"]
+    assert index.bbox(-40, 150, -30, 152) == ["sydney"]
+
+
+def test_within_and_nearest_cross_the_antimeridian(backend):
+    index = SpatialIndex(cell_km=2.0)
+    for position, (lat, lon) in enumerate(points(500)):  # enough cells for `nearest` to search ring by ring
+        index.add(lat, lon, position)
+    index.add(10.0, 179.9, "east")
+    index.add(10.0, -179.9, "west")
+    for lon, near, far in [(179.9, "east", "west"), (-179.9, "west", "east")]:
+        assert [item for _, item in index.within(10.0, lon, 30.0)] == [near, far]
+        assert [item for _, item in index.nearest(10.0, lon, k=2)] == [near, far]
+    assert sorted(item for _, item in index.within(10.0, 180.0, 15.0)) == ["east", "west"]
+
+
+def test_within_reaches_across_partial_columns():
+    index = SpatialIndex(cell_km=500)  # 500 km does not divide the 360° of longitude
+    index.add(10.0, 179.0, "east")
+    assert [item for _, item in index.within(10.0, -179.0, 300.0)] == ["east"]
+
+
+@pytest.mark.parametrize("cell_km", [1.0, 5.0, 70.0, 500.0])
+def test_within_and_nearest_match_a_full_scan_near_the_antimeridian(backend, cell_km):
+    generator = random.Random(cell_km)
+
+    def near_the_antimeridian(count):
+        return [
+            (generator.uniform(-10, 10), generator.choice([180.0, -180.0]) * generator.uniform(0.98, 1))
+            for _ in range(count)
+        ]
+
+    population = near_the_antimeridian(500)
+    index = SpatialIndex(cell_km=cell_km)
+    for position, (lat, lon) in enumerate(population):
+        index.add(lat, lon, position)
+    for lat, lon in near_the_antimeridian(50):
+        expected = sorted((haversine_km(lat, lon, *point), position) for position, point in enumerate(population))
+        radius = generator.uniform(10, 300)
+        assert [item for _, item in index.within(lat, lon, radius)] == [
+            position for distance, position in expected if distance <= radius
+        ]
+        assert [item for _, item in index.nearest(lat, lon, k=5)] == [position for _, position in expected[:5]]
+
+
+def test_dedupe_merges_the_same_poi_nearby():
+    index = SpatialIndex()
+    index.add(51.50000, -0.12000, {"title": "Blue Bottle"})
+    index.add(51.50010, -0.12010, {"title": "blue  bottle"})  # about 13 m away
+    index.add(51.50010, -0.12010, {"title": "Green Cup"})
+    index.add(51.51000, -0.12000, {"title": "Blue Bottle"})  # another branch, 1.1 km away
+    unique = index.dedupe(radius_km=0.05)
+    assert [item["title"] for item in unique.items] == ["Blue Bottle", "Green Cup", "Blue Bottle"]
+
+
+def test_locations_of_raw_responses():
+    response = {
+        "query": {"original": "coffee", "lat": "51.5", "long": "-0.12"},
+        "locations": {
+            "type": "locations",
+            "results": [
+                {"type": "location_result", "title": "Blue Bottle", "coordinates": [51.501, -0.121]},
+                {"type": "location_result", "title": "Unknown"},
+            ],
+        },
+    }
+    assert [(lat, lon, result["title"]) for lat, lon, result in locations_of(response)] == [
+        (51.501, -0.121, "Blue Bottle")
+    ]
+    assert query_location(response) == (51.5, -0.12)
+    assert query_location({"query": {"original": "coffee"}}) is None
+    index = SpatialIndex.from_responses([response, response])
+    assert len(index) == 2
+    assert len(index.dedupe()) == 1
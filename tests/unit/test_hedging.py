@@ -0,0 +1,106 @@
+import asyncio
+import itertools
+import time
+
+import pytest
+import requests
+
+from brave.async_brave import AsyncBrave
+from brave.exceptions import BraveTimeout
+from brave.hedging import Hedge
+from brave.metrics import InMemoryMetrics
+from brave.sync import Brave
+from brave.testing import FakeBraveServer
+from brave.testing import load_fixtures
+from brave.transport import RequestsTransport
+from brave.types.adapters import warmup
+
+
+FIXTURES = load_fixtures("tests/test_responses")
+
+
+def first_request_slow(seconds):
+    """Server latency: only the first request is slow."""
+    counter = itertools.count()
+    return lambda: seconds if next(counter) == 0 else 0.0
+
+
+def primed_hedge(latency=0.01):
+    hedge = Hedge(min_samples=1)
+    hedge.record(latency)
+    return hedge
+
+
+def test_hedge_delay_is_a_percentile_of_the_recent_window():
+    hedge = Hedge(percentile=90, min_samples=5, window=10)
+    for latency in range(4):
+        hedge.record(latency)
+    assert hedge.delay() is None
+    for latency in range(100, 110):
+        hedge.record(latency / 100)
+    assert hedge.delay() == pytest.approx(1.09)
+
+
+def test_sync_call_times_out(monkeypatch):
+    with FakeBraveServer(fixtures=FIXTURES, latency=1.0) as server:
+        client = Brave(api_key="test_key", base_url=server.base_url)
+        start = time.monotonic()
+        with pytest.raises(BraveTimeout):
+            client.search("Blue tack", timeout=0.2)
+    assert time.monotonic() - start < 0.9
+
+
+def test_async_call_times_out_with_client_default():
+    metrics = InMemoryMetrics()
+
+    async def run(base_url):
+        async with AsyncBrave(api_key="test_key", base_url=base_url, timeout=0.1, metrics=metrics) as client:
+            await client.search("Blue tack")
+
+    with FakeBraveServer(fixtures=FIXTURES, latency=3.0) as server:
+        start = time.monotonic()
+        with pytest.raises(BraveTimeout):
+            asyncio.run(run(server.base_url))
+    assert time.monotonic() - start < 2.0
+    assert metrics.snapshot()["counters"]["timeouts{endpoint=web}"] == 1
+
+
+def test_sync_hedge_answers_a_slow_request():
+    hedge = primed_hedge()
+    with FakeBraveServer(fixtures=FIXTURES, latency=first_request_slow(1.0)) as server:
+        transport = RequestsTransport(base_url=server.base_url, session=requests.Session())
+        with Brave(api_key="test_key", transport=transport, hedge=hedge) as client:
+            client.warm()  # the slow request reaches the server first, on the warm connection, before the hedge
+            warmup()
+            start = time.monotonic()
+            response = client.search("Blue tack")
+            elapsed = time.monotonic() - start
+    assert response.query.original == "Blue tack"
+    assert elapsed < 0.9
+    assert hedge.hedged == 1 and hedge.won == 1
+
+
+def test_async_hedge_answers_a_slow_request():
+    hedge = primed_hedge()
+
+    async def run(base_url):
+        async with AsyncBrave(api_key="test_key", base_url=base_url, hedge=hedge) as client:
+            await client.awarm()
+            warmup()
+            return await client.search("Blue tack", raw=True)
+
+    with FakeBraveServer(fixtures=FIXTURES, latency=first_request_slow(1.0)) as server:
+        start = time.monotonic()
+        response = asyncio.run(run(server.base_url))
+        elapsed = time.monotonic() - start
+    assert response["query"]["original"] == "Blue tack"
+    assert elapsed < 0.9
+    assert hedge.hedged == 1 and hedge.won == 1
+
+
+def test_fast_requests_are_not_hedged():
+    hedge = primed_hedge(latency=0.5)
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        with Brave(api_key="test_key", base_url=server.base_url, hedge=hedge) as client:
+            client.search("Blue tack")
+    assert hedge.hedged == 0
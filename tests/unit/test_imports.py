@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def _modules_after(statement: str) -> set:
+    """Return the modules loaded by a fresh interpreter after running a statement."""
+    code = f"import sys; {statement}; print(' '.join(sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return set(output.split())
+
+
+def test_import_brave_is_lazy():
+    modules = _modules_after("import brave")
+    assert not {"brave.sync", "brave.async_brave", "requests", "httpx", "tenacity", "pydantic"} & modules
+
+
+def test_client_import_skips_http_libraries_models_and_numpy():
+    modules = _modules_after("from brave import Brave, AsyncBrave")
+    assert {"brave.sync", "brave.async_brave"} <= modules
+    assert not {"requests", "httpx", "numpy", "pydantic", "brave.types.web.web_search_response"} & modules
+
+
+def test_lazy_attributes():
+    import brave
+    import brave.types
+
+    assert brave.Brave.__name__ == "Brave"
+    assert "AsyncBrave" in dir(brave)
+    assert brave.types.WebSearchApiResponse.__name__ == "WebSearchApiResponse"
+    with pytest.raises(AttributeError, match="Missing"):
+        brave.Missing
@@ -0,0 +1,122 @@
+import asyncio
+import threading
+
+import pytest
+
+from tenacity import RetryError
+
+from brave.async_brave import AsyncBrave
+from brave.exceptions import BraveKeysExhausted
+from brave.keys import TOKEN_HEADER
+from brave.keys import KeyPool
+from brave.sync import Brave
+from brave.testing import FakeBraveServer
+from brave.testing import load_fixtures
+from brave.transport import Middleware
+from brave.transport import Response
+
+
+FIXTURES = load_fixtures("tests/test_responses")
+
+
+class Tokens(Middleware):
+    def __init__(self, fail=False):
+        self.tokens = []
+        self.fail = fail
+
+    def before_request(self, request):
+        self.tokens.append(request.headers[TOKEN_HEADER])
+        if self.fail:
+            raise ConnectionError("network down")
+
+
+def test_weighted_round_robin_is_smooth():
+    pool = KeyPool({"heavy": 3, "light": 1})
+    picks = []
+    for _ in range(8):
+        key = pool.acquire()
+        picks.append(key)
+        pool.release(key)
+    assert picks.count("heavy") == 6 and picks.count("light") == 2
+    assert picks[:4].count("light") == 1
+
+
+def test_least_loaded_prefers_idle_keys():
+    pool = KeyPool(["a", "b"], strategy="least_loaded")
+    first, second = pool.acquire(), pool.acquire()
+    assert {first, second} == {"a", "b"}
+    pool.release(second)
+    assert pool.acquire() == second
+
+
+def test_rate_limited_keys_leave_rotation_until_reset():
+    pool = KeyPool(["a", "b"])
+    pool.release(pool.acquire(), 429, {"Retry-After": "60"})
+    pool.release(pool.acquire(), 200, {"x-ratelimit-remaining": "0, 10", "x-ratelimit-reset": "30, 1000"})
+    with pytest.raises(BraveKeysExhausted) as error:
+        pool.acquire()
+    assert error.value.status_code == 429
+    assert 29 < error.value.retry_after <= 30
+
+
+def test_unauthorized_keys_leave_rotation():
+    pool = KeyPool(["bad", "good"])
+    pool.release(pool.acquire(), 401, {})
+    assert {pool.acquire() for _ in range(3)} == {"good"}
+
+
+def test_pool_is_thread_safe():
+    pool = KeyPool(["a", "b", "c"], strategy="least_loaded")
+
+    def work():
+        for _ in range(200):
+            pool.release(pool.acquire(), 200, {})
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    states = pool.snapshot()
+    assert sum(state["requests"] for state in states) == 1600
+    assert all(state["in_flight"] == 0 for state in states)
+
+
+def test_sync_client_spreads_requests_across_keys():
+    tokens = Tokens()
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        client = Brave(api_key=["k1", "k2"], base_url=server.base_url)
+        client.transport.middleware.append(tokens)
+        for _ in range(4):
+            client.search("Blue tack")
+    assert tokens.tokens == ["k1", "k2", "k1", "k2"]
+
+
+def test_async_client_retries_on_another_key(monkeypatch):
+    monkeypatch.setattr(AsyncBrave, "retry_wait", 0)
+    tokens = Tokens()
+
+    class RateLimitFirstKey(Middleware):
+        def before_request(self, request):
+            if request.headers[TOKEN_HEADER] == "k1":
+                return Response(429, b"{}", {"Retry-After": "60"})
+            return Response(200, FIXTURES["Blue tack"])
+
+    async def run():
+        client = AsyncBrave(api_key="k1, k2")
+        client.transport.middleware += [tokens, RateLimitFirstKey()]
+        return await client.search("Blue tack")
+
+    assert asyncio.run(run()).query.original == "Blue tack"
+    assert tokens.tokens == ["k1", "k2"]
+
+
+def test_failed_requests_return_their_key(monkeypatch):
+    monkeypatch.setattr(Brave, "retry_wait", 0)
+    pool = KeyPool(["a"])
+    client = Brave(api_key=pool)
+    client.transport.middleware.append(Tokens(fail=True))
+    with pytest.raises(RetryError):
+        client.search("Blue tack")
+    assert pool.snapshot()[0]["in_flight"] == 0
+    assert pool.snapshot()[0]["requests"] == client.retry_attempts
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from brave.async_brave import AsyncBrave
+from brave.cache import ResponseCache
+from brave.metrics import Histogram
+from brave.metrics import InMemoryMetrics
+from brave.sync import Brave
+from brave.testing import FakeBraveServer
+from brave.testing import load_fixtures
+
+
+FIXTURES = load_fixtures("tests/test_responses")
+
+
+def test_histogram_percentiles_are_within_bucket_precision():
+    histogram = Histogram()
+    for value in range(1, 1001):
+        histogram.add(value / 1000)
+    summary = histogram.summary()
+    assert summary["count"] == 1000
+    assert summary["min"] == 0.001 and summary["max"] == 1.0
+    assert summary["p50"] == pytest.approx(0.5, rel=0.05)
+    assert summary["p99"] == pytest.approx(0.99, rel=0.05)
+
+
+def test_sync_client_reports_phases_sizes_and_cache_hits():
+    metrics = InMemoryMetrics()
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        client = Brave(api_key="test_key", base_url=server.base_url, metrics=metrics, cache=ResponseCache())
+        client.search("Blue tack")
+        client.search("Blue tack")
+    snapshot = metrics.snapshot()
+    histograms = snapshot["histograms"]
+    for series in ("request_seconds", "ttfb_seconds", "download_seconds", "response_bytes"):
+        assert histograms[series + "{endpoint=web}"]["count"] == 1
+    assert histograms["parse_seconds{endpoint=web}"]["count"] == 2  # cached bodies are parsed too
+    compressed = histograms["response_compressed_bytes{endpoint=web}"]["sum"]
+    assert compressed < histograms["response_bytes{endpoint=web}"]["sum"]
+    assert snapshot["counters"]["requests{endpoint=web,status=200}"] == 1
+    assert snapshot["counters"]["cache_misses{endpoint=web}"] == 1
+    assert snapshot["counters"]["cache_hits{endpoint=web}"] == 1
+
+
+def test_async_client_reports_connect_time_and_retries(monkeypatch):
+    monkeypatch.setattr(AsyncBrave, "retry_wait", 0)
+    metrics = InMemoryMetrics()
+
+    async def run(base_url):
+        async with AsyncBrave(api_key="test_key", base_url=base_url, metrics=metrics) as client:
+            await client.search("Blue tack", raw=True)
+
+    with FakeBraveServer(fixtures=FIXTURES, error_rate=0.5, seed=3) as server:
+        asyncio.run(run(server.base_url))
+    snapshot = metrics.snapshot()
+    assert snapshot["histograms"]["connect_seconds{endpoint=web}"]["count"] >= 1
+    assert snapshot["histograms"]["json_decode_seconds{endpoint=web}"]["count"] == 1
+    assert snapshot["counters"].get("retries", 0) == snapshot["counters"].get("requests{endpoint=web,status=500}", 0)
+
+
+def test_prometheus_export():
+    prometheus_client = pytest.importorskip("prometheus_client")
+    from brave.metrics import PrometheusMetrics
+
+    registry = prometheus_client.CollectorRegistry()
+    metrics = PrometheusMetrics(registry=registry)
+    metrics.observe("request_seconds", 0.1, endpoint="web")
+    metrics.increment("retries")
+    assert registry.get_sample_value("brave_request_seconds_count", {"endpoint": "web"}) == 1
+    assert registry.get_sample_value("brave_retries_total") == 1
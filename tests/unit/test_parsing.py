@@ -0,0 +1,49 @@
+import asyncio
+import concurrent.futures
+import multiprocessing
+
+import pytest
+
+from brave.async_brave import AsyncBrave
+from brave.metrics import InMemoryMetrics
+from brave.parsing import default_executor
+from brave.testing import FakeBraveServer
+from brave.testing import load_fixtures
+from brave.types import WebSearchApiResponse
+
+
+FIXTURES = load_fixtures("tests/test_responses")
+
+
+@pytest.fixture(scope="module")
+def server():
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        yield server
+
+
+def search(server, executor, **options):
+    async def run():
+        async with AsyncBrave(api_key="test_key", base_url=server.base_url, parse_executor=executor, **options) as c:
+            return await asyncio.gather(c.search("Blue tack"), c.search("Blue tack", raw=True))
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("pool", ["thread", "process"])
+def test_responses_are_parsed_in_an_executor(server, pool):
+    if pool == "thread":
+        executor = concurrent.futures.ThreadPoolExecutor(2)
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn"))
+    metrics = InMemoryMetrics()
+    with executor:
+        model, raw = search(server, executor, metrics=metrics)
+    assert isinstance(model, WebSearchApiResponse) and model.query.original == "Blue tack"
+    assert raw["query"]["original"] == "Blue tack"
+    assert metrics.snapshot()["histograms"]["parse_seconds{endpoint=web}"]["count"] == 1
+
+
+def test_default_executor_parses_models_in_threads():
+    executor = default_executor(1)
+    assert isinstance(executor, concurrent.futures.ThreadPoolExecutor)
+    executor.shutdown()
@@ -0,0 +1,99 @@
+import asyncio
+import itertools
+
+import pytest
+
+from brave.async_brave import AsyncBrave
+from brave.pipeline import Pipeline
+from brave.pipeline import Searched
+from brave.testing import FakeBraveServer
+from brave.testing import load_fixtures
+
+
+FIXTURES = load_fixtures("tests/test_responses")
+
+
+@pytest.fixture(scope="module")
+def server():
+    with FakeBraveServer(default=FIXTURES["Blue tack"], latency=(0.0, 0.02), seed=7) as server:
+        yield server
+
+
+def collect(server, source, configure=lambda pipeline: pipeline, **options):
+    async def run():
+        async with AsyncBrave(api_key="test_key", base_url=server.base_url) as client:
+            pipeline = configure(Pipeline(client, raw=True, **options))
+            return [item async for item in pipeline.run(source)]
+
+    return asyncio.run(run())
+
+
+def test_ordered_pipelines_keep_the_source_order(server):
+    async def slow_first(item):
+        await asyncio.sleep(0.05 if item.query == "query 0" else 0)
+        return item.query
+
+    queries = [f"query {number}" for number in range(20)]
+    results = collect(server, queries, lambda p: p.stage(slow_first, concurrency=4), concurrency=4, ordered=True)
+    assert results == queries
+
+
+def test_stages_transform_and_drop_items(server):
+    async def source():
+        for number in range(10):
+            yield {"q": f"query {number}", "count": 5}
+
+    def keep_even(item: Searched):
+        assert item.params["count"] == 5 and item.response["type"] == "search"
+        return int(item.query.split()[1]) if item.query[-1] in "02468" else None
+
+    results = collect(server, source(), lambda p: p.stage(keep_even).stage(lambda n: n * 10, blocking=True))
+    assert sorted(results) == [0, 20, 40, 60, 80]
+
+
+def test_a_slow_consumer_holds_back_the_source(server):
+    read = itertools.count()
+
+    def endless():
+        while True:
+            yield f"query {next(read)}"
+
+    async def run():
+        async with AsyncBrave(api_key="test_key", base_url=server.base_url) as client:
+            pipeline = Pipeline(client, concurrency=2, window=4, raw=True)
+            results = pipeline.run(endless())
+            taken = [await results.__anext__() for _ in range(3)]
+            await asyncio.sleep(0.1)
+            await results.aclose()
+            return taken
+
+    assert len(asyncio.run(run())) == 3
+    assert next(read) <= 3 + 4 + 1
+
+
+def test_errors_stop_the_pipeline_or_drop_the_item(server):
+    def explode(item):
+        if item.query == "query 3":
+            raise RuntimeError("bad item")
+        return item.query
+
+    queries = [f"query {number}" for number in range(6)]
+    with pytest.raises(RuntimeError):
+        collect(server, queries, lambda p: p.stage(explode))
+    assert sorted(collect(server, queries, lambda p: p.stage(explode), errors="skip")) == sorted(
+        query for query in queries if query != "query 3"
+    )
+
+
+def test_results_are_sent_to_a_sink(server):
+    received = []
+
+    async def sink(item):
+        received.append(item.query)
+
+    async def run():
+        async with AsyncBrave(api_key="test_key", base_url=server.base_url) as client:
+            return await Pipeline(client, raw=True).into(["a", "b", "c"], sink)
+
+    assert asyncio.run(run()) == 3
+    assert sorted(received) == ["a", "b", "c"]
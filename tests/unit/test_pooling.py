@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from pydantic import ValidationError
+
+from brave.sync import Brave
+from brave.testing import FakeBraveServer
+from brave.testing import load_fixtures
+from brave.types import WebSearchApiResponse
+from brave.types.pooling import FrozenMetaUrl
+from brave.types.pooling import FrozenProfile
+from brave.types.pooling import ObjectPool
+
+
+FIXTURES = load_fixtures("tests/test_responses")
+
+with open("tests/test_responses/blue_tack_minimal.json", "rb") as file:
+    BODY = file.read()
+
+
+def parse():
+    return WebSearchApiResponse.model_validate_json(BODY)
+
+
+def test_repeated_values_and_sub_objects_are_shared():
+    pool = ObjectPool()
+    first, second = pool.share(parse()), pool.share(parse())
+    meta_url = first.web.results[0].meta_url
+    assert type(meta_url) is FrozenMetaUrl
+    assert meta_url is second.web.results[0].meta_url
+    assert first.web.results[0].profile is second.web.results[0].profile
+    assert type(first.web.results[0].profile) is FrozenProfile
+    assert first.videos.results[0].meta_url.favicon is second.videos.results[0].meta_url.favicon
+    assert first.web.results[0].language is second.web.results[0].language
+    assert pool.hits > 0
+    assert first.model_dump() == parse().model_dump()
+    assert json.loads(first.model_dump_json()) == json.loads(parse().model_dump_json())
+
+
+def test_shared_objects_are_frozen():
+    meta_url = ObjectPool().share(parse()).web.results[0].meta_url
+    with pytest.raises(ValidationError):
+        meta_url.hostname = "example.com"
+
+
+def test_pool_is_bounded():
+    pool = ObjectPool(maxsize=3)
+    pool.share(parse())
+    assert len(pool) == 3
+    pool.clear()
+    assert len(pool) == 0
+
+
+def test_clients_share_parsed_responses():
+    pool = ObjectPool()
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        client = Brave(api_key="test_key", base_url=server.base_url, pool=pool)
+        first, second = client.search("Blue tack"), client.search("Blue tack")
+        raw = client.search("Blue tack", raw=True)
+    assert first.web.results[0].meta_url is second.web.results[0].meta_url
+    assert isinstance(raw, dict)
@@ -0,0 +1,122 @@
+import pytest
+
+from brave.cache import ResponseCache
+from brave.exceptions import BraveQuotaExceeded
+from brave.metrics import InMemoryMetrics
+from brave.quota import CACHE_ONLY
+from brave.quota import DEGRADED
+from brave.quota import NORMAL
+from brave.quota import QuotaLedger
+from brave.quota import key_id
+from brave.sync import Brave
+from brave.testing import load_fixtures
+from brave.transport import Middleware
+from brave.transport import Response
+
+
+FIXTURES = load_fixtures("tests/test_responses")
+
+
+class Answer(Middleware):
+    def __init__(self, headers=None):
+        self.sent = 0
+        self.headers = headers or {}
+
+    def before_request(self, request):
+        self.sent += 1
+        return Response(200, FIXTURES["Blue tack"], self.headers)
+
+
+def client_with(ledger, cache=None, headers=None):
+    answer = Answer(headers)
+    client = Brave(api_key="k1, k2", quota=ledger, cache=cache)
+    client.transport.middleware.append(answer)
+    return client, answer
+
+
+def test_usage_is_counted_per_key_endpoint_and_tag():
+    ledger = QuotaLedger()
+    client, _ = client_with(ledger)
+    client.search("Blue tack", tag="ingest")
+    client.search("Blue tack", tag="ingest")
+    client.search("Blue tack")
+    assert ledger.used() == 3
+    assert ledger.used("ingest") == 2
+    usage = {(row["key"], row["tag"]): row["requests"] for row in ledger.usage()}
+    assert usage == {(key_id("k1"), "ingest"): 1, (key_id("k2"), "ingest"): 1, (key_id("k1"), None): 1}
+    assert all(row["endpoint"] == "web" for row in ledger.usage())
+
+
+def test_usage_persists_across_ledgers(tmp_path):
+    path = str(tmp_path / "quota.db")
+    first = QuotaLedger(path)
+    first.record("k1", "web")
+    first.close()
+    second = QuotaLedger(path)
+    second.record("k1", "images")
+    assert second.used() == 2
+    second.close()
+
+
+def test_counts_are_written_in_batches(tmp_path):
+    path = str(tmp_path / "quota.db")
+    writer = QuotaLedger(path, sync_interval=60)
+    reader = QuotaLedger(path, sync_interval=0)
+    writer.record("k1", "web", tag="ingest")
+    writer.record("k1", "web")
+    assert writer.used() == 2 and writer.used("ingest") == 1
+    assert reader.used() == 0
+    writer.flush()
+    assert reader.used() == 2 and reader.used("ingest") == 1
+    writer.record("k2", "web")
+    writer.close()
+    assert reader.used() == 3
+    reader.close()
+
+
+def test_usage_is_reconciled_with_the_reported_remaining():
+    ledger = QuotaLedger()
+    headers = {"X-RateLimit-Limit": "1, 2000", "X-RateLimit-Remaining": "0, 1500", "X-RateLimit-Reset": "1, 86400"}
+    ledger.record("k1", "web", headers=headers)
+    assert ledger.used() == 500
+    assert ledger.remaining("k1") == 1500
+    assert ledger.remaining("k2") is None
+
+
+def test_budgets_degrade_then_serve_only_the_cache():
+    metrics = InMemoryMetrics()
+    ledger = QuotaLedger(soft_limit=1, hard_limit=2, metrics=metrics)
+    cache = ResponseCache(ttl=-1)  # every entry is expired at once
+    client, answer = client_with(ledger, cache=cache)
+    assert ledger.mode() == NORMAL
+    client.search("Blue tack")
+    assert ledger.mode() == DEGRADED
+    client.search("Blue tack")  # served from the expired entry
+    assert answer.sent == 1
+    client.search("Blue tack", count=5)
+    assert ledger.mode() == CACHE_ONLY
+    assert client.search("Blue tack").query.original == "Blue tack"
+    with pytest.raises(BraveQuotaExceeded):
+        client.search("Blue tack", count=10)
+    assert answer.sent == 2
+    assert metrics.snapshot()["counters"]["rejected_requests{reason=quota}"] == 1
+    assert metrics.snapshot()["gauges"]["quota_used"] == 2
+
+
+def test_tag_budgets_and_exhausted_keys_stop_requests():
+    ledger = QuotaLedger(tag_limits={"batch": 1})
+    client, _ = client_with(ledger, headers={"X-RateLimit-Remaining": "5, 0", "X-RateLimit-Reset": "1, 600"})
+    client.search("Blue tack", tag="batch")
+    with pytest.raises(BraveQuotaExceeded):
+        ledger.check("batch")
+    assert ledger.mode() == CACHE_ONLY  # the only key reported no requests left this month
+
+
+def test_the_budget_is_checked_once_per_call(monkeypatch):
+    ledger = QuotaLedger(soft_limit=10)
+    modes = []
+    mode = ledger.mode
+    monkeypatch.setattr(ledger, "mode", lambda tag=None: modes.append(tag) or mode(tag))
+    client, answer = client_with(ledger)
+    client.search("Blue tack", tag="ingest")
+    assert modes == ["ingest"] and answer.sent == 1 and ledger.used() == 1
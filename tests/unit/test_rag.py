@@ -0,0 +1,129 @@
+import asyncio
+import json
+
+import pytest
+
+from brave.exceptions import BraveError
+from brave.rag import DISCUSSIONS
+from brave.rag import FAQ
+from brave.rag import INFOBOX
+from brave.rag import WEB
+from brave.rag import ContextBuilder
+from brave.types import WebSearchApiResponse
+
+
+def raw_response(query="blue tack"):
+    return {
+        "type": "search",
+        "query": {"original": query},
+        "web": {
+            "results": [
+                {
+                    "title": "Blu <strong>Tack</strong>",
+                    "url": "https://www.example.com/blu-tack?utm_source=x",
+                    "description": "A <strong>reusable</strong> putty.",
+                    "extra_snippets": ["A reusable putty.", "Made by Bostik."],
+                },
+                {
+                    "title": "Mirror",
+                    "url": "https://mirror.example.com/",
+                    "description": "a reusable  putty.\nMade by Bostik.",
+                },
+            ]
+        },
+        "faq": {
+            "results": [
+                {"question": "Is it blue?", "answer": "Usually.", "title": "FAQ", "url": "https://example.com/faq"}
+            ]
+        },
+        "discussions": {
+            "results": [
+                {
+                    "title": "Forum",
+                    "url": "https://forum.example.com/t/1",
+                    "description": "Thread",
+                    "data": {"question": "Best putty?", "top_comment": "Blu Tack, obviously."},
+                }
+            ]
+        },
+        "infobox": {
+            "results": [
+                {
+                    "title": "Blu Tack",
+                    "url": "https://en.wikipedia.org/wiki/Blu_Tack",
+                    "long_desc": "Blu Tack is a putty.",
+                }
+            ]
+        },
+    }
+
+
+def test_documents_are_extracted_cleaned_and_deduplicated():
+    builder = ContextBuilder()
+    documents = list(builder.documents(raw_response()))
+    assert [document.source for document in documents] == [INFOBOX, WEB, FAQ, DISCUSSIONS]
+    web = documents[1]
+    assert web.title == "Blu Tack"
+    assert web.text == "A reusable putty.\nMade by Bostik."  # the extra snippet repeating the description is dropped
+    assert documents[2].text == "Is it blue?\nUsually."
+    assert documents[3].text == "Best putty?\nBlu Tack, obviously."
+    assert all(document.query == "blue tack" for document in documents)
+    # The mirror repeated the first result; a second response adds nothing new.
+    assert list(builder.documents(raw_response("blu tack"))) == []
+
+
+def test_ids_are_stable_across_builders():
+    first = [document.id for document in ContextBuilder().documents(raw_response())]
+    assert [document.id for document in ContextBuilder().documents(raw_response("blu tack"))] == first
+    assert len(set(first)) == len(first)
+
+
+def test_build_fits_the_budget():
+    response = raw_response()
+    response["web"]["results"][0]["extra_snippets"] = ["Long sentence number %d about putty." % n for n in range(50)]
+    context = ContextBuilder(budget=60, sources=[WEB]).build(response)
+    assert context.query == "blue tack"
+    assert context.tokens <= 60
+    assert [document.tokens for document in context.documents] == [context.tokens]
+    text = context.documents[0].text
+    assert text.endswith(".…")
+    assert context.render().startswith(
+        "[1] Blu Tack (https://www.example.com/blu-tack?utm_source=x)\nA reusable putty."
+    )
+    assert context.sources() == ["https://www.example.com/blu-tack?utm_source=x"]
+
+
+def test_document_budget_skips_to_the_next_document():
+    response = raw_response()
+    response["infobox"]["results"][0]["long_desc"] = "x" * 400
+    context = ContextBuilder(budget=500, document_budget=20).build(response)
+    assert [document.source for document in context.documents] == [WEB, FAQ, DISCUSSIONS]
+
+
+def test_parsed_responses_match_raw_ones():
+    with open("tests/test_responses/blue_tack_minimal.json") as file:
+        raw = json.load(file)
+    parsed = WebSearchApiResponse.model_validate(raw)
+    from_raw = ContextBuilder().build(raw)
+    from_parsed = ContextBuilder().build(parsed)
+    assert from_raw.documents == from_parsed.documents
+    assert "<strong>" not in from_raw.render()
+
+
+def test_streams():
+    builder = ContextBuilder()
+    contexts = list(builder.stream([raw_response(), raw_response()]))
+    assert [len(context.documents) for context in contexts] == [4, 0]
+
+    async def responses():
+        yield raw_response()
+
+    async def collect():
+        return [context async for context in ContextBuilder().astream(responses())]
+
+    assert len(asyncio.run(collect())[0].documents) == 4
+
+
+def test_unknown_sources_are_rejected():
+    with pytest.raises(BraveError):
+        ContextBuilder(sources=["web", "news"])
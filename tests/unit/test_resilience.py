@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+
+from tenacity import RetryError
+
+from brave.async_brave import AsyncBrave
+from brave.exceptions import BraveCircuitOpen
+from brave.exceptions import BraveOverloaded
+from brave.metrics import InMemoryMetrics
+from brave.resilience import CLOSED
+from brave.resilience import OPEN
+from brave.resilience import AdaptiveLimiter
+from brave.resilience import CircuitBreaker
+from brave.sync import Brave
+from brave.testing import FakeBraveServer
+from brave.testing import load_fixtures
+from brave.transport import Request
+from brave.transport import Response
+
+
+FIXTURES = load_fixtures("tests/test_responses")
+
+
+def attempt(guard, status=200):
+    request = Request("web/search")
+    guard.before_request(request)
+    guard.after_response(request, Response(status))
+
+
+def test_breaker_fails_fast_once_open(monkeypatch):
+    monkeypatch.setattr(Brave, "retry_wait", 0)
+    metrics = InMemoryMetrics()
+    breaker = CircuitBreaker(window=5, min_calls=3, reset_timeout=60)
+    with FakeBraveServer(fixtures=FIXTURES, error_rate=1.0) as server:
+        client = Brave(api_key="test_key", base_url=server.base_url, breaker=breaker, metrics=metrics)
+        with pytest.raises(RetryError):
+            client.search("Blue tack")
+        served = server.requests_served
+        start = time.monotonic()
+        with pytest.raises(BraveCircuitOpen) as error:
+            client.search("Blue tack")
+        assert time.monotonic() - start < 0.1
+        assert server.requests_served == served == 3
+    assert breaker.state == OPEN and 59 < error.value.retry_after <= 60
+    snapshot = metrics.snapshot()
+    assert snapshot["gauges"]["circuit_state{breaker=brave}"] == 2
+    assert snapshot["counters"]["rejected_requests{reason=circuit_open}"] == 1
+
+
+def test_breaker_recovers_through_half_open(monkeypatch):
+    monkeypatch.setattr(Brave, "retry_wait", 0)
+    breaker = CircuitBreaker(window=5, min_calls=3, reset_timeout=0.05)
+    with FakeBraveServer(fixtures=FIXTURES, error_rate=1.0) as server:
+        client = Brave(api_key="test_key", base_url=server.base_url, breaker=breaker)
+        with pytest.raises(RetryError):
+            client.search("Blue tack")
+        assert breaker.state == OPEN
+        server.error_rate = 0.0
+        time.sleep(0.06)
+        assert client.search("Blue tack").query.original == "Blue tack"
+    assert breaker.state == CLOSED
+
+
+def test_half_open_admits_one_trial_and_reopens_on_failure():
+    breaker = CircuitBreaker(window=2, min_calls=2, reset_timeout=0.01)
+    attempt(breaker, 500)
+    attempt(breaker, 503)
+    assert breaker.state == OPEN
+    time.sleep(0.02)
+    trial = Request("web/search")
+    breaker.before_request(trial)
+    with pytest.raises(BraveCircuitOpen):
+        breaker.before_request(Request("web/search"))
+    breaker.on_error(trial, ConnectionError())
+    assert breaker.state == OPEN
+
+
+def test_client_errors_do_not_open_the_breaker():
+    breaker = CircuitBreaker(window=4, min_calls=2)
+    for _ in range(4):
+        attempt(breaker, 422)
+    assert breaker.state == CLOSED
+
+
+def test_limiter_sheds_load_and_adapts():
+    limiter = AdaptiveLimiter(initial=2, min_limit=1)
+    first, second = Request("web/search"), Request("web/search")
+    limiter.before_request(first)
+    limiter.before_request(second)
+    with pytest.raises(BraveOverloaded):
+        limiter.before_request(Request("web/search"))
+    limiter.after_response(first, Response(500))
+    limiter.after_response(second, Response(429))
+    assert limiter.limit == pytest.approx(2 * 0.9 * 0.9)
+    for _ in range(10):
+        attempt(limiter)
+    assert limiter.limit > 2 and limiter.in_flight == 0
+
+
+def test_limiter_caps_concurrent_async_requests():
+    async def run(base_url):
+        async with AsyncBrave(api_key="test_key", base_url=base_url, limiter=AdaptiveLimiter(initial=2)) as client:
+            calls = [client.search("Blue tack", raw=True) for _ in range(5)]
+            return await asyncio.gather(*calls, return_exceptions=True)
+
+    with FakeBraveServer(fixtures=FIXTURES, latency=0.2) as server:
+        results = asyncio.run(run(server.base_url))
+    assert sum(isinstance(result, BraveOverloaded) for result in results) == 3
+    assert sum(isinstance(result, dict) for result in results) == 2
@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import pytest
+
+from brave.async_brave import AsyncBrave
+from brave.exceptions import BraveError
+from brave.exceptions import BraveOverloaded
+from brave.metrics import InMemoryMetrics
+from brave.scheduler import Scheduler
+from brave.sync import Brave
+from brave.testing import FakeBraveServer
+from brave.testing import load_fixtures
+
+
+FIXTURES = load_fixtures("tests/test_responses")
+
+
+async def grant_order(scheduler, priorities):
+    """Queue one request per priority behind a held slot, then release the slot and record the admission order."""
+    order = []
+
+    async def request(priority):
+        await scheduler.aacquire(priority)
+        order.append(priority)
+        scheduler.release()
+
+    await scheduler.aacquire()
+    tasks = [asyncio.ensure_future(request(priority)) for priority in priorities]
+    await asyncio.sleep(0.01)
+    assert scheduler.depth() == len(priorities)
+    scheduler.release()
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_weighted_queues_favour_interactive_requests():
+    scheduler = Scheduler(max_concurrency=1)
+    order = asyncio.run(grant_order(scheduler, ["batch"] * 4 + ["interactive"] * 4))
+    assert order[:5].count("interactive") == 4
+    assert sorted(order) == ["batch"] * 4 + ["interactive"] * 4
+
+
+def test_old_requests_are_not_starved():
+    scheduler = Scheduler(weights={"interactive": 100, "batch": 1}, max_concurrency=1, max_wait=0.0)
+    order = asyncio.run(grant_order(scheduler, ["batch", "interactive", "interactive"]))
+    assert order[0] == "batch"
+
+
+def test_rate_limit_spaces_requests():
+    metrics = InMemoryMetrics()
+    scheduler = Scheduler(rate=20, burst=1, metrics=metrics)
+    start = time.monotonic()
+    for _ in range(5):
+        assert scheduler.acquire("batch")
+        scheduler.release()
+    assert time.monotonic() - start >= 0.19
+    histograms = metrics.snapshot()["histograms"]
+    assert histograms["rate_limit_wait_seconds{priority=batch}"]["count"] == 4
+    assert histograms["queue_wait_seconds{priority=batch}"]["count"] == 5
+
+
+def test_acquire_times_out_and_leaves_the_queue():
+    scheduler = Scheduler(max_concurrency=1)
+    assert scheduler.acquire()
+    assert not scheduler.acquire("batch", timeout=0.05)
+    assert scheduler.depth() == 0
+    scheduler.release()
+    assert scheduler.in_flight == 0
+
+
+def test_full_queues_and_unknown_priorities_are_refused():
+    scheduler = Scheduler(max_concurrency=1, max_queue=0)
+    assert scheduler.acquire()
+    with pytest.raises(BraveOverloaded):
+        scheduler.acquire("batch")
+    with pytest.raises(BraveError):
+        scheduler.acquire("urgent")
+
+
+def test_clients_send_through_the_scheduler():
+    metrics = InMemoryMetrics()
+    scheduler = Scheduler(max_concurrency=2)
+
+    async def run(base_url):
+        async with AsyncBrave(api_key="test_key", base_url=base_url, scheduler=scheduler, metrics=metrics) as client:
+            calls = [client.search("Blue tack", raw=True, priority="batch") for _ in range(4)]
+            return await asyncio.gather(*calls)
+
+    with FakeBraveServer(fixtures=FIXTURES, latency=0.05) as server:
+        assert len(asyncio.run(run(server.base_url))) == 4
+        client = Brave(api_key="test_key", base_url=server.base_url, scheduler=scheduler)
+        assert client.search("Blue tack").query.original == "Blue tack"
+    assert scheduler.in_flight == 0
+    assert metrics.snapshot()["histograms"]["queue_wait_seconds{priority=batch}"]["count"] == 4
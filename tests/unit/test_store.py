@@ -0,0 +1,85 @@
+import gc
+import json
+
+from brave.metrics import InMemoryMetrics
+from brave.store import ResponseStore
+from brave.types import WebSearchApiResponse
+
+
+with open("tests/test_responses/blue_tack_minimal.json", "rb") as file:
+    BODY = file.read()
+
+
+def parse(index=0):
+    payload = json.loads(BODY)
+    payload["query"]["original"] = f"query {index}"
+    body = json.dumps(payload).encode()
+    return WebSearchApiResponse.model_validate_json(body), body
+
+
+def test_older_responses_are_compressed_and_rehydrated():
+    store = ResponseStore(hot=2)
+    for index in range(5):
+        store.put(index, parse(index)[0])
+    gc.collect()
+    memory = store.memory()
+    assert (memory["hot"], memory["cold"], memory["weak"]) == (2, 3, 0)
+    assert 0 < memory["cold_bytes"] < memory["raw_bytes"]
+    assert len(store) == 5 and 0 in store and 5 not in store
+    response = store.get(0)
+    assert response.query.original == "query 0"
+    assert response.model_dump() == parse(0)[0].model_dump()
+    assert store.memory()["hot"] == 2 and store.memory()["cold"] == 3
+    assert store.get(5) is None
+
+
+def test_responses_still_held_are_returned_without_parsing():
+    store = ResponseStore(hot=1)
+    held = parse(0)[0]
+    store.put("held", held)
+    store.put("other", parse(1)[0])
+    assert store.memory()["weak"] == 1
+    assert store.get("held") is held
+
+
+def test_bodies_are_kept_instead_of_serialising_again():
+    store = ResponseStore(hot=0)
+    response, body = parse()
+    store.put("key", response, body=body)
+    assert store.memory()["raw_bytes"] == len(body)
+    del response
+    gc.collect()
+    assert store.get("key").query.original == "query 0"
+
+
+def test_repeated_values_are_shared():
+    store = ResponseStore()
+    first, second = parse(0)[0], parse(1)[0]
+    assert first.web.results[0].meta_url.favicon is not second.web.results[0].meta_url.favicon
+    store.put(1, first)
+    store.put(2, second)
+    assert first.web.results[0].meta_url.favicon is second.web.results[0].meta_url.favicon
+    assert first.web.results[0].meta_url.hostname is second.web.results[0].meta_url.hostname
+
+
+def test_cold_tier_is_bounded():
+    metrics = InMemoryMetrics()
+    store = ResponseStore(hot=1, max_bytes=4000, metrics=metrics)
+    for index in range(20):
+        store.put(index, parse(index)[0])
+    gc.collect()
+    memory = store.memory()
+    assert memory["cold_bytes"] <= 4000
+    assert 0 < memory["cold"] < 19
+    assert store.get(0) is None and store.get(19) is not None
+    assert metrics.gauges["store_bytes{tier=cold}"] == memory["cold_bytes"]
+
+
+def test_pop_and_clear():
+    store = ResponseStore(hot=1)
+    store.put(1, parse(1)[0])
+    store.put(2, parse(2)[0])
+    assert store.pop(1).query.original == "query 1"
+    assert 1 not in store and len(store) == 1
+    store.clear()
+    assert len(store) == 0 and store.memory()["cold_bytes"] == 0
@@ -1,7 +1,9 @@
 from unittest.mock import Mock
 from unittest.mock import patch
 
+from brave.cache import ResponseCache
 from brave.sync import Brave
+from brave.types import WebSearchApiResponse
 
 
 def test_brave_initialization():
@@ -17,3 +19,39 @@ def test_sync_get_success():
         client = Brave(api_key="test_key")
         response = client._get(params={"q": "test query"})
         assert response.json() == {"data": "test response"}
+
+
+def _fixture_response():
+    with open("tests/test_responses/blue_tack_minimal.json", "rb") as f:
+        return Mock(status_code=200, content=f.read())
+
+
+def test_sync_search_parses_response():
+    with patch("requests.get", return_value=_fixture_response()) as mock_get:
+        client = Brave(api_key="test_key")
+        response = client.search("Blue tack", country="us")
+        assert isinstance(response, WebSearchApiResponse)
+        assert mock_get.call_args.kwargs["params"]["country"] == "US"
+
+
+def test_sync_search_raw():
+    with patch("requests.get", return_value=_fixture_response()):
+        client = Brave(api_key="test_key")
+        response = client.search("Blue tack", raw=True)
+        assert response["query"]["original"] == "Blue tack"
+
+
+def test_sync_image_uses_image_endpoint():
+    with patch("requests.get", return_value=Mock(status_code=200, content=b"{}")) as mock_get:
+        client = Brave(api_key="test_key")
+        client.image("Blue tack", raw=True)
+        assert mock_get.call_args.args[0].endswith("/images/search")
+
+
+def test_sync_search_served_from_cache():
+    with patch("requests.get", return_value=_fixture_response()) as mock_get:
+        client = Brave(api_key="test_key", cache=ResponseCache())
+        first = client.search("Blue tack")
+        second = client.search("  Blue   tack ")
+        assert mock_get.call_count == 1
+        assert first == second
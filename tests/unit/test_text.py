@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from brave.text import Snippet
+from brave.text import clean_response
+from brave.text import normalize
+from brave.text import normalize_all
+from brave.text import strip
+from brave.text import strip_all
+from brave.types import WebSearchApiResponse
+
+
+@pytest.mark.parametrize(
+    "text, expected, highlighted",
+    [
+        ("plain text", "plain text", []),
+        ("Blu Tack is a <strong>reusable putty</strong>.", "Blu Tack is a reusable putty.", ["reusable putty"]),
+        ("<strong>Brave</strong> &amp; <strong>Search</strong>", "Brave & Search", ["Brave", "Search"]),
+        ("It&#x27;s &quot;quoted&quot; AT&T", 'It\'s "quoted" AT&T', []),
+        ("  <strong>Brave</strong>  \n search <b>x</b>&nbsp;y ", "Brave search x y", ["Brave"]),
+        ("a <strong> b</strong> c", "a b c", ["b"]),
+        ("<strong>unclosed", "unclosed", ["unclosed"]),
+        ("a < b and c > d", "a < b and c > d", []),
+        ("&lt;strong&gt; is a tag", "<strong> is a tag", []),
+    ],
+)
+def test_normalize(text, expected, highlighted):
+    snippet = normalize(text)
+    assert snippet.text == expected
+    assert snippet.highlighted() == highlighted
+    assert strip(text) == expected
+
+
+def test_undecorated_strings_are_returned_as_is():
+    text = "Nothing to strip here."
+    assert strip(text) is text
+    assert normalize(text) == Snippet(text)
+
+
+def test_batches():
+    texts = ["<strong>a</strong> b", "c &amp; d", "e"]
+    assert strip_all(texts) == ["a b", "c & d", "e"]
+    assert normalize_all(texts) == [Snippet("a b", ((0, 1),)), Snippet("c & d"), Snippet("e")]
+
+
+def test_clean_response_raw_and_parsed():
+    with open("tests/test_responses/blue_tack_minimal.json") as file:
+        raw = json.load(file)
+    parsed = WebSearchApiResponse.model_validate(raw)
+    assert clean_response(raw) is raw
+    clean_response(parsed)
+    for result, model in zip(raw["web"]["results"], parsed.web.results):
+        assert "<strong>" not in result["description"]
+        assert model.description == result["description"]
+        assert model.title == result["title"]
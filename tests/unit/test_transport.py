@@ -0,0 +1,264 @@
+import asyncio
+import io
+import itertools
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+import requests
+
+from brave.async_brave import AsyncBrave
+from brave.encoding import decompress
+from brave.exceptions import BraveError
+from brave.sync import Brave
+from brave.testing import FakeBraveServer
+from brave.testing import load_fixtures
+from brave.transport import AsyncHTTPXTransport
+from brave.transport import HTTPXTransport
+from brave.transport import Middleware
+from brave.transport import Passthrough
+from brave.transport import RequestsTransport
+from brave.transport import Response
+from brave.types import WebSearchApiResponse
+
+
+FIXTURES = load_fixtures("tests/test_responses")
+
+
+class Recorder(Middleware):
+    def __init__(self):
+        self.paths = []
+
+    def before_request(self, request):
+        self.paths.append(request.path)
+
+
+class ShortCircuit(Middleware):
+    def before_request(self, request):
+        return Response(200, FIXTURES["Blue tack"])
+
+
+def test_sync_client_against_fake_server():
+    recorder = Recorder()
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        transport = RequestsTransport(base_url=server.base_url, session=requests.Session(), middleware=[recorder])
+        with Brave(api_key="test_key", transport=transport) as client:
+            response = client.search("blue  TACK")
+    assert isinstance(response, WebSearchApiResponse)
+    assert recorder.paths == ["web/search"]
+    assert server.requests_served == 1
+
+
+def test_httpx_transport_against_fake_server():
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        client = Brave(api_key="test_key", transport=HTTPXTransport(base_url=server.base_url))
+        assert client.search("Blue tack", raw=True)["query"]["original"] == "Blue tack"
+        client.close()
+
+
+def test_async_client_against_fake_server():
+    async def run(base_url):
+        async with AsyncBrave(api_key="test_key", base_url=base_url) as client:
+            return await asyncio.gather(*(client.search("Blue tack") for _ in range(10)))
+
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        responses = asyncio.run(run(server.base_url))
+        assert server.requests_served == 10
+    assert all(isinstance(response, WebSearchApiResponse) for response in responses)
+
+
+def test_async_transport_recreates_client_for_new_loop():
+    async def fetch(transport):
+        return transport._get_client()
+
+    transport = AsyncHTTPXTransport()
+    assert asyncio.run(fetch(transport)) is not asyncio.run(fetch(transport))
+    assert len(transport._clients) == 1  # the client of the closed loop is dropped
+
+
+def test_async_transport_keeps_and_closes_a_client_per_loop():
+    async def fetch(transport):
+        return transport._get_client()
+
+    transport = AsyncHTTPXTransport()
+    first, second = asyncio.new_event_loop(), asyncio.new_event_loop()
+    try:
+        client = first.run_until_complete(fetch(transport))
+        other = second.run_until_complete(fetch(transport))
+        assert first.run_until_complete(fetch(transport)) is client and other is not client
+        second.run_until_complete(transport.aclose())
+        assert other.is_closed and not client.is_closed
+        first.run_until_complete(transport.aclose())
+        assert client.is_closed and transport._clients == {}
+    finally:
+        first.close()
+        second.close()
+
+
+def test_middleware_short_circuits_network():
+    client = Brave(api_key="test_key", base_url="http://127.0.0.1:9/")
+    client.transport.middleware.append(ShortCircuit())
+    assert isinstance(client.search("Blue tack"), WebSearchApiResponse)
+
+
+def test_fake_server_injects_rate_limits():
+    with FakeBraveServer(fixtures=FIXTURES, rate_limit_rate=1.0) as server:
+        response = requests.get(server.base_url + "web/search", params={"q": "Blue tack"})
+    assert response.status_code == 429
+
+
+def test_fake_server_unknown_query_is_an_error(monkeypatch):
+    monkeypatch.setattr(Brave, "retry_wait", 0)
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        client = Brave(api_key="test_key", base_url=server.base_url)
+        with pytest.raises(Exception) as error:
+            client.search("unknown query")
+    assert not isinstance(error.value, BraveError)
+
+
+@pytest.mark.parametrize("transport", [RequestsTransport, HTTPXTransport])
+def test_passthrough_writes_the_compressed_body(transport):
+    sink = io.BytesIO()
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        with Brave(api_key="test_key", transport=transport(base_url=server.base_url)) as client:
+            response = client.search("Blue tack", sink=sink)
+    assert isinstance(response, Passthrough)
+    assert response.headers["Content-Encoding"] in client.accept_encoding
+    assert response.size == len(sink.getvalue())
+    assert decompress(sink.getvalue(), response.headers["Content-Encoding"]) == FIXTURES["Blue tack"]
+
+
+def test_async_passthrough_writes_the_compressed_body():
+    async def run(base_url, sink):
+        async with AsyncBrave(api_key="test_key", base_url=base_url) as client:
+            return await client.search("Blue tack", sink=sink.write)
+
+    sink = io.BytesIO()
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        response = asyncio.run(run(server.base_url, sink))
+    assert response.size == len(sink.getvalue())
+    assert decompress(sink.getvalue(), response.headers["Content-Encoding"]) == FIXTURES["Blue tack"]
+
+
+def test_passthrough_of_a_short_circuited_response_is_decompressed():
+    sink = io.BytesIO()
+    client = Brave(api_key="test_key", base_url="http://127.0.0.1:9/")
+    client.transport.middleware.append(ShortCircuit())
+    response = client.search("Blue tack", sink=sink)
+    assert sink.getvalue() == FIXTURES["Blue tack"]
+    assert "Content-Encoding" not in response.headers
+
+
+def test_passthrough_does_not_write_errors(monkeypatch):
+    monkeypatch.setattr(Brave, "retry_wait", 0)
+    sink = io.BytesIO()
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        client = Brave(api_key="test_key", base_url=server.base_url)
+        with pytest.raises(Exception):
+            client.search("unknown query", sink=sink)
+    assert sink.getvalue() == b""
+
+
+@pytest.mark.parametrize("raw, kind", [("bytes", bytes), ("memoryview", memoryview)])
+def test_raw_body_is_not_decoded(raw, kind):
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        client = Brave(api_key="test_key", base_url=server.base_url)
+        body = client.search("Blue tack", raw=raw)
+    assert isinstance(body, kind)
+    assert bytes(body) == FIXTURES["Blue tack"]
+
+
+def test_unknown_raw_mode_is_an_error():
+    client = Brave(api_key="test_key", base_url="http://127.0.0.1:9/")
+    with pytest.raises(BraveError):
+        client.search("Blue tack", raw="text")
+
+
+@pytest.mark.parametrize("transport", [RequestsTransport, HTTPXTransport])
+def test_warm_opens_pooled_connections(transport):
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        options = {"session": requests.Session()} if transport is RequestsTransport else {}
+        with Brave(api_key="test_key", transport=transport(base_url=server.base_url, **options)) as client:
+            assert client.warm(3) == 3
+            assert isinstance(client.search("Blue tack"), WebSearchApiResponse)
+
+
+def test_async_warm_opens_pooled_connections():
+    async def run(base_url):
+        async with AsyncBrave(api_key="test_key", base_url=base_url) as client:
+            return await client.awarm(4), await client.search("Blue tack")
+
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        warmed, response = asyncio.run(run(server.base_url))
+    assert warmed == 4 and isinstance(response, WebSearchApiResponse)
+
+
+def test_idle_connections_are_pinged():
+    pings = []
+    transport = RequestsTransport(keepalive=0.02)
+    transport._warm = lambda connections, timeout: pings.append(connections) or connections
+    transport.warm(2)
+    time.sleep(0.15)
+    transport.close()
+    count = len(pings)
+    time.sleep(0.05)
+    assert count >= 3 and pings[-1] == 2
+    assert len(pings) == count  # stopped by close
+
+
+def test_connections_are_replaced_past_their_max_age():
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        transport = HTTPXTransport(base_url=server.base_url, max_age=0)
+        with Brave(api_key="test_key", transport=transport) as client:
+            client.search("Blue tack")
+            first = transport.client
+            client.search("Blue tack")
+            assert transport.client is not first and first.is_closed and transport._retired == []
+
+
+def test_retired_clients_are_closed_once_their_requests_are_done():
+    with FakeBraveServer(fixtures=FIXTURES, latency=0.3) as server:
+        transport = HTTPXTransport(base_url=server.base_url)
+        with Brave(api_key="test_key", transport=transport) as client:
+            client.warm()
+            first = transport.client
+            with ThreadPoolExecutor(1) as pool:
+                search = pool.submit(client.search, "Blue tack")
+                time.sleep(0.1)
+                transport.recycle()
+                assert transport._retired == [first] and not first.is_closed
+                assert isinstance(search.result(), WebSearchApiResponse)
+            assert first.is_closed and transport._retired == []
+
+
+class FlakySession(requests.Session):
+    def __init__(self):
+        super().__init__()
+        self.calls = itertools.count()
+
+    def head(self, *args, **kwargs):
+        if next(self.calls) == 0:
+            raise requests.ConnectionError("refused")
+        return super().head(*args, **kwargs)
+
+
+def test_warm_counts_the_connections_that_answered():
+    with FakeBraveServer(fixtures=FIXTURES) as server:
+        with Brave(api_key="test_key", transport=RequestsTransport(server.base_url, FlakySession())) as client:
+            assert client.warm(3) == 2
+
+    calls = itertools.count()
+
+    def handler(request):
+        if next(calls) == 0:
+            raise httpx.ConnectError("refused")
+        return httpx.Response(200)
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncBrave(api_key="test_key", transport=AsyncHTTPXTransport(client=client)) as brave:
+            return await brave.awarm(3)
+
+    assert asyncio.run(run()) == 2
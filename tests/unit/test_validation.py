@@ -0,0 +1,90 @@
+import pytest
+
+from brave.exceptions import BraveError
+from brave.sync import Brave
+from brave.validation import IMAGE_SEARCH_PARAMS
+from brave.validation import normalize_params
+
+
+def test_normalize_params_canonicalises_values():
+    params = normalize_params(
+        {
+            "q": "  blue   tack ",
+            "country": "gb",
+            "search_lang": "EN_GB",
+            "ui_lang": "en_us",
+            "count": 50,
+            "offset": 3,
+            "safesearch": "Strict",
+            "freshness": "PW",
+            "result_filter": "web, news,web",
+            "units": "Metric",
+            "text_decorations": True,
+            "extra_snippets": False,
+            "goggles_id": None,
+        }
+    )
+    assert params == {
+        "q": "blue tack",
+        "country": "GB",
+        "search_lang": "en-gb",
+        "ui_lang": "en-US",
+        "count": 20,
+        "offset": 3,
+        "safesearch": "strict",
+        "freshness": "pw",
+        "result_filter": "news,web",
+        "units": "metric",
+        "text_decorations": "true",
+        "extra_snippets": "false",
+    }
+
+
+def test_equivalent_params_normalise_identically():
+    a = normalize_params({"q": "Blue tack", "country": "us", "result_filter": "news,web"})
+    b = normalize_params({"q": " Blue  tack", "country": "US", "result_filter": "web,news"})
+    assert a == b
+
+
+def test_freshness_accepts_date_range():
+    assert normalize_params({"freshness": "2022-04-01to2022-07-30"}) == {"freshness": "2022-04-01to2022-07-30"}
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"q": ""},
+        {"q": "x" * 401},
+        {"q": " ".join(["word"] * 51)},
+        {"country": "XX"},
+        {"search_lang": "klingon"},
+        {"ui_lang": "en"},
+        {"safesearch": "none"},
+        {"freshness": "yesterday"},
+        {"result_filter": "web,images"},
+        {"units": "furlongs"},
+        {"count": 0},
+        {"offset": -1},
+        {"spellcheck": "maybe"},
+        {"unknown": "value"},
+    ],
+)
+def test_invalid_params_raise(params):
+    with pytest.raises(BraveError):
+        normalize_params(params)
+
+
+def test_validation_error_is_value_error():
+    with pytest.raises(ValueError):
+        normalize_params({"q": ""})
+
+
+def test_image_safesearch_maps_moderate_to_strict():
+    assert normalize_params({"safesearch": "moderate"}, IMAGE_SEARCH_PARAMS) == {"safesearch": "strict"}
+
+
+def test_search_fails_before_network_io(monkeypatch):
+    client = Brave(api_key="test_key")
+    monkeypatch.setattr(client, "_get", lambda *args, **kwargs: pytest.fail("request should not be sent"))
+    with pytest.raises(ValueError):
+        client.search("Blue tack", country="Atlantis")
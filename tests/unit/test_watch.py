@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+import pytest
+
+from brave.async_brave import AsyncBrave
+from brave.exceptions import BraveValidationError
+from brave.testing import FakeBraveServer
+from brave.watch import CHANGED
+from brave.watch import NEW
+from brave.watch import Watcher
+from brave.watch import canonical_url
+
+
+def response(*results, kind="news"):
+    return {"type": "search", kind: {"results": list(results)}}
+
+
+def article(url, title="Title", age="1 hour ago"):
+    return {"url": url, "title": title, "description": "Description", "age": age}
+
+
+class Client:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def search(self, **params):
+        self.calls.append(params)
+        return self.responses.pop(0)
+
+
+def test_urls_are_canonicalised():
+    assert (
+        canonical_url("HTTPS://WWW.Example.com/news/?utm_source=x&b=2&a=1#top") == "https://example.com/news?a=1&b=2"
+    )
+    assert canonical_url("https://example.com") == "https://example.com/"
+
+
+def test_only_new_and_changed_results_are_emitted():
+    client = Client(
+        [
+            response(article("https://example.com/a"), article("https://example.com/b")),
+            response(
+                article("https://www.example.com/a/", age="2 hours ago"), article("https://example.com/b", "New")
+            ),
+            response(article("https://example.com/c"), kind="web"),
+        ]
+    )
+    watcher = Watcher(client, ["blue tack"], freshness="pd")
+    first = watcher.poll_due()
+    assert [(change.change, change.url) for change in first] == [
+        (NEW, "https://example.com/a"),
+        (NEW, "https://example.com/b"),
+    ]
+    watcher.states["blue tack"].due = 0
+    second = watcher.poll_due()
+    assert [(change.change, change.url, change.result["title"]) for change in second] == [
+        (CHANGED, "https://example.com/b", "New")
+    ]
+    watcher.states["blue tack"].due = 0
+    assert [(change.kind, change.url) for change in watcher.poll_due()] == [("web", "https://example.com/c")]
+    assert client.calls[0] == {"freshness": "pd", "q": "blue tack", "raw": True}
+
+
+def test_intervals_adapt_to_changes():
+    watcher = Watcher(Client([]), ["q"], interval=100, min_interval=60, max_interval=200)
+    watcher.diff("q", response(article("https://example.com/a")), now=0)
+    assert watcher.states["q"].interval == 60 and watcher.states["q"].due == 60
+    for _ in range(3):
+        watcher.diff("q", response(article("https://example.com/a")), now=0)
+    assert watcher.states["q"].interval == 200
+
+
+def test_results_are_forgotten_after_memory_polls():
+    watcher = Watcher(Client([]), ["q"], memory=2)
+    assert len(watcher.diff("q", response(article("https://example.com/a")))) == 1
+    watcher.diff("q", response())
+    watcher.diff("q", response())
+    assert len(watcher.diff("q", response(article("https://example.com/a")))) == 1
+
+
+def test_state_survives_restarts(tmp_path):
+    path = str(tmp_path / "watch.json")
+    first = Watcher(Client([response(article("https://example.com/a"))]), ["q"], path=path)
+    assert len(first.poll_due()) == 1
+    assert json.load(open(path))["q"]["polls"] == 1
+    second = Watcher(Client([response(article("https://example.com/a"))]), ["q"], path=path)
+    assert second.due() == []
+    second.states["q"].due = 0
+    assert second.poll_due() == []
+
+
+def test_async_clients_poll_due_queries_at_once():
+    body = response(article("https://example.com/a"))
+
+    async def run(base_url):
+        async with AsyncBrave(api_key="test_key", base_url=base_url) as client:
+            watcher = Watcher(client, ["blue tack", "red tack"])
+            return await watcher.apoll_due()
+
+    with FakeBraveServer(default=body) as server:
+        changes = asyncio.run(run(server.base_url))
+    assert sorted(change.query for change in changes) == ["blue tack", "red tack"]
+
+
+def test_a_url_in_news_and_web_results_is_tracked_once_as_each():
+    body = {
+        "news": {"results": [article("https://example.com/a", "News title")]},
+        "web": {"results": [article("https://example.com/a", "Web title")]},
+    }
+    watcher = Watcher(Client([]), ["q"], interval=100, min_interval=60, max_interval=200)
+    assert [(change.change, change.kind) for change in watcher.diff("q", body, now=0)] == [
+        (NEW, "news"),
+        (NEW, "web"),
+    ]
+    for _ in range(2):
+        assert watcher.diff("q", body, now=0) == []
+    assert watcher.states["q"].interval == 135
+
+
+def test_query_parameters_cannot_override_the_query():
+    watcher = Watcher(Client([]), {"q": {"count": 5}}, count=10)
+    assert watcher._search_params("q") == {"count": 5, "q": "q", "raw": True}
+    with pytest.raises(BraveValidationError):
+        Watcher(Client([]), {"q": {"q": "other"}})
+
+
+def test_async_polls_are_bounded():
+    running = []
+    peak = []
+
+    class AsyncClient:
+        async def search(self, **params):
+            running.append(params["q"])
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(params["q"])
+            if params["q"] == "cancelled":
+                raise asyncio.CancelledError
+            return response()
+
+    watcher = Watcher(AsyncClient(), [str(index) for index in range(6)] + ["cancelled"], concurrency=2)
+    assert asyncio.run(watcher.apoll_due()) == []
+    assert max(peak) == 2
+    assert watcher.states["cancelled"].polls == 0 and watcher.states["0"].polls == 1